@@ -18,6 +18,8 @@ Version: 1.0.0
 Last Updated: December 2024
 """
 
+from __future__ import annotations
+
 import argparse
 import json
 import sys
@@ -25,10 +27,9 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import pandas as pd
-from loguru import logger
-
+# Heavy libraries load on first use, so --help stays fast
 try:
+    from src.lazy_imports import lazy_import
     from src.utils import (
         load_config,
         setup_logging,
@@ -41,6 +42,14 @@ except ImportError as e:
     print("Make sure you're running from the project root directory")
     sys.exit(1)
 
+pd = lazy_import('pandas')
+logger = lazy_import('loguru', 'logger')
+cache_from_config = lazy_import('src.cache', 'cache_from_config')
+top_n = lazy_import('src.cache', 'top_n')
+value_distribution = lazy_import('src.cache', 'value_distribution')
+overall_totals = lazy_import('src.cache', 'overall_totals')
+load_cleaned_data = lazy_import('src.columnar_cache', 'load_cleaned_data')
+
 
 class ResultsExporter:
     """Export analysis results to various formats"""
@@ -58,7 +67,8 @@ class ResultsExporter:
         log_config = self.config.get("logging", {})
         setup_logging(
             log_file=log_config.get("file", "logs/export.log"),
-            level=log_config.get("level", "INFO")
+            level=log_config.get("level", "INFO"),
+            enqueue=log_config.get("enqueue", False)
         )
         
         logger.info("=" * 80)
@@ -66,6 +76,9 @@ class ResultsExporter:
         logger.info("=" * 80)
         logger.info(f"Export started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
+        # Aggregates shared by the JSON, Excel and text exports are computed once
+        self.cache = cache_from_config(self.config)
+        
         # Load all datasets
         self._load_datasets()
     
@@ -76,13 +89,18 @@ class ResultsExporter:
         processed_dir = Path(self.config['file_paths']['processed_dir'])
         
         try:
-            self.cleaned_data = load_data(str(processed_dir / "cleaned_data.csv"))
+            # Memory-mapped from the columnar cache unless the CSV changed since it was written
+            self.cleaned_data = load_cleaned_data(
+                str(processed_dir / "cleaned_data.csv"),
+                self.config['paths']['data'].get('columnar_cache')
+            )
             self.customer_metrics = load_data(str(processed_dir / "customer_metrics.csv"))
             self.customer_segments = load_data(str(processed_dir / "customer_segments.csv"))
             self.product_metrics = load_data(str(processed_dir / "product_metrics.csv"))
             self.monthly_revenue = load_data(str(processed_dir / "monthly_revenue.csv"))
             self.country_metrics = load_data(str(processed_dir / "country_metrics.csv"))
             self.invoice_metrics = load_data(str(processed_dir / "invoice_metrics.csv"))
+            self.temporal_patterns = load_data(str(processed_dir / "temporal_patterns.csv"))
             
             logger.info("✓ All datasets loaded successfully")
             
@@ -184,15 +202,15 @@ class ResultsExporter:
         logger.info(f"  ✓ Exported summary.json")
         
         # Customer segments
-        segments = self.customer_segments['CustomerSegment'].value_counts().to_dict()
+        segments = self.cache.call(value_distribution, self.customer_segments, 'CustomerSegment').to_dict()
         with open(output_path / "customer_segments.json", 'w') as f:
             json.dump(segments, f, indent=2)
         logger.info(f"  ✓ Exported customer_segments.json")
         
         # Top products
         top_products = (
-            self.product_metrics
-            .nlargest(20, 'TotalRevenue')[['StockCode', 'Description', 'TotalRevenue', 'UnitsSold']]
+            self.cache.call(top_n, self.product_metrics, 'TotalRevenue', 20)
+            [['StockCode', 'Description', 'TotalRevenue', 'UnitsSold']]
             .to_dict('records')
         )
         with open(output_path / "top_products.json", 'w') as f:
@@ -210,15 +228,28 @@ class ResultsExporter:
         
         # Country performance
         country_performance = (
-            self.country_metrics
-            .nlargest(10, 'TotalRevenue')[['Country', 'TotalRevenue', 'TotalCustomers', 'TotalOrders']]
+            self.cache.call(top_n, self.country_metrics, 'TotalRevenue', 10)
+            [['Country', 'TotalRevenue', 'TotalCustomers', 'TotalOrders']]
             .to_dict('records')
         )
         with open(output_path / "country_performance.json", 'w') as f:
             json.dump(country_performance, f, indent=2, default=str)
         logger.info(f"  ✓ Exported country_performance.json")
         
-        logger.info(f"✓ JSON export complete - 5 files created")
+        # Weekday × hour heatmap (7 rows of 24 hourly values)
+        temporal = self.temporal_patterns.sort_values(['DayOfWeek', 'Hour'])
+        temporal_heatmap = {
+            'days': temporal['DayName'].unique().tolist(),
+            'hours': list(range(24)),
+            'revenue': temporal['Revenue'].round(2).values.reshape(7, 24).tolist(),
+            'orders': temporal['Orders'].values.reshape(7, 24).tolist(),
+            'customers': temporal['Customers'].values.reshape(7, 24).tolist()
+        }
+        with open(output_path / "temporal_patterns.json", 'w') as f:
+            json.dump(temporal_heatmap, f, indent=2)
+        logger.info(f"  ✓ Exported temporal_patterns.json")
+        
+        logger.info(f"✓ JSON export complete - 6 files created")
     
     def export_summary_report(self, output_file: str = "exports/summary_report.txt"):
         """
@@ -234,20 +265,21 @@ class ResultsExporter:
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
         # Calculate metrics
-        total_revenue = self.cleaned_data['TotalPrice'].sum()
-        total_orders = self.cleaned_data['InvoiceNo'].nunique()
-        total_customers = self.cleaned_data['CustomerID'].nunique()
-        total_products = self.cleaned_data['StockCode'].nunique()
+        totals = self.cache.call(overall_totals, self.cleaned_data)
+        total_revenue = totals['total_revenue']
+        total_orders = totals['total_orders']
+        total_customers = totals['total_customers']
+        total_products = totals['total_products']
         avg_order_value = total_revenue / total_orders
         
         # Segment distribution
-        segment_counts = self.customer_segments['CustomerSegment'].value_counts()
+        segment_counts = self.cache.call(value_distribution, self.customer_segments, 'CustomerSegment')
         
-        # Top products
-        top_5_products = self.product_metrics.nlargest(5, 'TotalRevenue')
+        # Top products (head of the cached JSON top 20)
+        top_5_products = self.cache.call(top_n, self.product_metrics, 'TotalRevenue', 20).head(5)
         
         # Top countries
-        top_5_countries = self.country_metrics.nlargest(5, 'TotalRevenue')
+        top_5_countries = self.cache.call(top_n, self.country_metrics, 'TotalRevenue', 10).head(5)
         
         # Create report
         report = f"""
@@ -319,10 +351,11 @@ CUSTOMER SEGMENTS
     
     def _create_summary_dataframe(self) -> pd.DataFrame:
         """Create a summary dataframe with key metrics"""
-        total_revenue = self.cleaned_data['TotalPrice'].sum()
-        total_orders = self.cleaned_data['InvoiceNo'].nunique()
-        total_customers = self.cleaned_data['CustomerID'].nunique()
-        total_products = self.cleaned_data['StockCode'].nunique()
+        totals = self.cache.call(overall_totals, self.cleaned_data)
+        total_revenue = totals['total_revenue']
+        total_orders = totals['total_orders']
+        total_customers = totals['total_customers']
+        total_products = totals['total_products']
         avg_order_value = total_revenue / total_orders
         
         summary_data = {
@@ -347,9 +380,9 @@ CUSTOMER SEGMENTS
                 format_percentage(
                     (self.customer_metrics['TotalOrders'] > 1).sum() / len(self.customer_metrics)
                 ),
-                f"{self.cleaned_data['Country'].nunique():,}",
-                self.cleaned_data['InvoiceDate'].min().strftime('%Y-%m-%d'),
-                self.cleaned_data['InvoiceDate'].max().strftime('%Y-%m-%d'),
+                f"{totals['total_countries']:,}",
+                totals['start_date'].strftime('%Y-%m-%d'),
+                totals['end_date'].strftime('%Y-%m-%d'),
                 f"{len(self.cleaned_data):,}"
             ]
         }
@@ -358,16 +391,18 @@ CUSTOMER SEGMENTS
     
     def _create_summary_dict(self) -> Dict:
         """Create a summary dictionary with key metrics"""
-        total_revenue = float(self.cleaned_data['TotalPrice'].sum())
-        total_orders = int(self.cleaned_data['InvoiceNo'].nunique())
-        total_customers = int(self.cleaned_data['CustomerID'].nunique())
-        total_products = int(self.cleaned_data['StockCode'].nunique())
+        totals = self.cache.call(overall_totals, self.cleaned_data)
+        total_revenue = totals['total_revenue']
+        total_orders = totals['total_orders']
+        total_customers = totals['total_customers']
+        total_products = totals['total_products']
+        top_country = self.cache.call(top_n, self.country_metrics, 'TotalRevenue', 10).iloc[0]
         
         summary = {
             'generated_at': datetime.now().isoformat(),
             'data_period': {
-                'start': self.cleaned_data['InvoiceDate'].min().strftime('%Y-%m-%d'),
-                'end': self.cleaned_data['InvoiceDate'].max().strftime('%Y-%m-%d')
+                'start': totals['start_date'].strftime('%Y-%m-%d'),
+                'end': totals['end_date'].strftime('%Y-%m-%d')
             },
             'overall_metrics': {
                 'total_revenue': round(total_revenue, 2),
@@ -385,13 +420,13 @@ CUSTOMER SEGMENTS
                 'average_orders_per_customer': round(self.customer_metrics['TotalOrders'].mean(), 2)
             },
             'geographic_metrics': {
-                'total_countries': int(self.cleaned_data['Country'].nunique()),
-                'top_country': self.country_metrics.nlargest(1, 'TotalRevenue')['Country'].iloc[0],
-                'top_country_revenue': round(
-                    float(self.country_metrics.nlargest(1, 'TotalRevenue')['TotalRevenue'].iloc[0]), 2
-                )
+                'total_countries': totals['total_countries'],
+                'top_country': top_country['Country'],
+                'top_country_revenue': round(float(top_country['TotalRevenue']), 2)
             },
-            'segment_distribution': self.customer_segments['CustomerSegment'].value_counts().to_dict()
+            'segment_distribution': self.cache.call(
+                value_distribution, self.customer_segments, 'CustomerSegment'
+            ).to_dict()
         }
         
         return summary
@@ -419,6 +454,7 @@ CUSTOMER SEGMENTS
         logger.info("ALL EXPORTS COMPLETED SUCCESSFULLY")
         logger.info("=" * 80)
         logger.info(f"Output location: {base_path}")
+        logger.info(f"Query cache: {self.cache.stats()}")
 
 
 def parse_arguments():
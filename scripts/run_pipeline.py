@@ -7,8 +7,9 @@ This script orchestrates the complete end-to-end data analytics workflow:
 2. Read raw data
 3. Clean and validate data
 4. Engineer features and create derived datasets
-5. Save all outputs
-6. Generate summary report
+5. Score customers with the predictive models
+6. Save all outputs
+7. Generate summary report
 
 Usage:
     python run_pipeline.py --config config/config.yaml
@@ -20,6 +21,8 @@ Version: 1.0.0
 Last Updated: December 2024
 """
 
+from __future__ import annotations
+
 import argparse
 import sys
 import time
@@ -27,29 +30,48 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional
 
-import pandas as pd
-from loguru import logger
-from tqdm import tqdm
+import yaml
 
-# Import custom modules
+# Import custom modules (heavy libraries and analysis modules load on first use,
+# so --help and --dry-run stay fast)
 try:
+    from src.lazy_imports import lazy_import
     from src.utils import (
         load_config,
+        check_config,
         setup_logging,
         load_data,
         save_data,
         print_dataframe_info,
+        profile_dataframe,
         get_data_quality_metrics,
         format_currency,
         format_percentage
     )
-    from src.data_cleaning import clean_ecommerce_data
-    from src.feature_engineering import engineer_all_features
 except ImportError as e:
     print(f"Error importing modules: {e}")
     print("Make sure you're running from the project root directory")
     sys.exit(1)
 
+pd = lazy_import('pandas')
+logger = lazy_import('loguru', 'logger')
+tqdm = lazy_import('tqdm', 'tqdm')
+clean_ecommerce_data = lazy_import('src.data_cleaning', 'clean_ecommerce_data')
+engineer_all_features = lazy_import('src.feature_engineering', 'engineer_all_features')
+create_product_pairs = lazy_import('src.basket_analysis', 'create_product_pairs')
+create_revenue_concentration = lazy_import('src.concentration', 'create_revenue_concentration')
+create_rfm_snapshots = lazy_import('src.snapshots', 'create_rfm_snapshots')
+snapshot_dates = lazy_import('src.snapshots', 'snapshot_dates')
+create_segment_transitions = lazy_import('src.segment_migration', 'create_segment_transitions')
+create_product_seasonality = lazy_import('src.seasonality', 'create_product_seasonality')
+churn_from_config = lazy_import('src.churn', 'churn_from_config')
+clv_from_config = lazy_import('src.clv', 'clv_from_config')
+validate_data = lazy_import('src.validation', 'validate_data')
+cache_from_config = lazy_import('src.cache', 'cache_from_config')
+value_distribution = lazy_import('src.cache', 'value_distribution')
+CustomerIndex = lazy_import('src.customer_index', 'CustomerIndex')
+save_columnar = lazy_import('src.columnar_cache', 'save_columnar')
+
 
 class PipelineRunner:
     """Orchestrates the complete data analytics pipeline"""
@@ -64,12 +86,14 @@ class PipelineRunner:
         self.config = load_config(config_path)
         self.start_time = time.time()
         self.metrics = {}
+        self.cache = cache_from_config(self.config)
         
         # Setup logging
         log_config = self.config.get("logging", {})
         setup_logging(
             log_file=log_config.get("file", "logs/pipeline.log"),
-            level=log_config.get("level", "INFO")
+            level=log_config.get("level", "INFO"),
+            enqueue=log_config.get("enqueue", False)
         )
         
         logger.info("=" * 80)
@@ -84,13 +108,13 @@ class PipelineRunner:
         
         Args:
             steps: List of steps to run (None = all steps)
-                   Options: ['load', 'clean', 'features', 'save', 'report']
+                   Options: ['load', 'clean', 'features', 'models', 'save', 'report']
             verbose: Enable verbose output
             
         Returns:
             Dictionary with pipeline execution metrics
         """
-        all_steps = ['load', 'clean', 'features', 'save', 'report']
+        all_steps = ['load', 'clean', 'features', 'models', 'save', 'report']
         steps_to_run = steps if steps else all_steps
         
         logger.info(f"Steps to execute: {', '.join(steps_to_run)}")
@@ -108,11 +132,15 @@ class PipelineRunner:
         if 'features' in steps_to_run:
             self.feature_datasets = self._feature_engineering_step(verbose)
         
-        # Step 4: Save Results
+        # Step 4: Score Models
+        if 'models' in steps_to_run:
+            self._models_step(verbose)
+        
+        # Step 5: Save Results
         if 'save' in steps_to_run:
             self._save_results_step(verbose)
         
-        # Step 5: Generate Report
+        # Step 6: Generate Report
         if 'report' in steps_to_run:
             self._generate_report_step(verbose)
         
@@ -153,8 +181,7 @@ class PipelineRunner:
         logger.info("\nSTEP 2: Cleaning Data")
         logger.info("-" * 80)
         
-        # Get cleaning parameters from config
-        cleaning_params = self.config.get('data_cleaning', {})
+        # Get business rules from config
         business_rules = self.config.get('business_rules', {})
         
         logger.info("Applying data cleaning pipeline...")
@@ -164,13 +191,9 @@ class PipelineRunner:
         
         with tqdm(total=1, desc="Cleaning data", disable=not verbose) as pbar:
             df_cleaned = clean_ecommerce_data(
-                df=self.raw_data,
-                cancelled_prefix=business_rules.get('cancelled_invoice_prefix', 'C'),
-                min_quantity=business_rules.get('min_quantity', 1),
-                min_unit_price=business_rules.get('min_unit_price', 0.01),
-                required_columns=cleaning_params.get('required_columns', []),
-                date_column=cleaning_params.get('date_column', 'InvoiceDate'),
-                handle_outliers_method=cleaning_params.get('outlier_method', 'keep')
+                self.raw_data,
+                config=self.config,
+                quarantine_path=self.config['paths']['data']['quarantine']
             )
             pbar.update(1)
         
@@ -181,17 +204,36 @@ class PipelineRunner:
         logger.info(f"  Records removed: {records_removed:,} ({100 - retention_rate:.2f}%)")
         logger.info(f"  Records retained: {len(df_cleaned):,} ({retention_rate:.2f}%)")
         
-        # Data quality metrics
-        quality_metrics = get_data_quality_metrics(df_cleaned)
+        # Validate against the configured quality thresholds and business rules
+        validation_config = self.config.get('data_params', {}).get('validation', {})
+        validation_report = validate_data(
+            df_cleaned,
+            self.config,
+            raw_rows=len(self.raw_data),
+            chunk_size=validation_config.get('chunk_size', 250000)
+        )
+        logger.info(f"  Validation: {validation_report['rules_checked']} rules passed "
+                    f"in {validation_report['elapsed_seconds']:.2f}s")
+        
+        # Data quality metrics (one profile shared with the verbose report)
+        quality_config = self.config.get('data_params', {}).get('quality', {})
+        profile = profile_dataframe(
+            df_cleaned,
+            sample_threshold=quality_config.get('profile_sample_threshold'),
+            sample_size=quality_config.get('profile_sample_size', 100000)
+        )
+        quality_metrics = get_data_quality_metrics(df_cleaned, profile=profile)
         logger.info(f"  Data quality score: {quality_metrics['completeness_score']:.2f}%")
         
         if verbose:
-            print_dataframe_info(df_cleaned, "Cleaned Data")
+            print_dataframe_info(df_cleaned, "Cleaned Data", profile=profile)
         
         self.metrics['cleaned_records'] = len(df_cleaned)
         self.metrics['records_removed'] = records_removed
         self.metrics['retention_rate'] = retention_rate
         self.metrics['data_quality_score'] = quality_metrics['completeness_score']
+        self.metrics['validation_rules'] = validation_report['rules_checked']
+        self.metrics['validation_time'] = validation_report['elapsed_seconds']
         
         return df_cleaned
     
@@ -200,9 +242,6 @@ class PipelineRunner:
         logger.info("\nSTEP 3: Engineering Features")
         logger.info("-" * 80)
         
-        # Get feature engineering parameters
-        rfm_config = self.config.get('rfm', {})
-        
         logger.info("Creating derived datasets:")
         logger.info("  1. Customer Metrics (CLV, Recency, Frequency)")
         logger.info("  2. Customer Segments (RFM Analysis)")
@@ -210,26 +249,56 @@ class PipelineRunner:
         logger.info("  4. Monthly Revenue (Time Series)")
         logger.info("  5. Country Metrics (Geographic Analysis)")
         logger.info("  6. Invoice Metrics (Order-level Data)")
+        logger.info("  7. Cohort Retention (Monthly Cohorts)")
+        logger.info("  8. Daily Revenue (Moving Averages)")
+        logger.info("  9. Temporal Patterns (Weekday × Hour)")
+        logger.info("  10. Product Pairs (Basket Analysis)")
+        logger.info("  11. Revenue Concentration (Pareto Analysis)")
+        logger.info("  12. RFM Snapshots (Point-in-Time Segments)")
+        logger.info("  13. Segment Transitions (Segment Migration)")
+        logger.info("  14. Product Seasonality (Product × Month Indices)")
         
         with tqdm(total=1, desc="Feature engineering", disable=not verbose) as pbar:
-            datasets = engineer_all_features(
-                df=self.cleaned_data,
-                customer_col='CustomerID',
-                invoice_col='InvoiceNo',
-                date_col='InvoiceDate',
-                product_col='StockCode',
-                quantity_col='Quantity',
-                price_col='UnitPrice',
-                country_col='Country',
-                description_col='Description',
-                rfm_bins=rfm_config.get('r_bins', [0, 0.2, 0.4, 0.6, 0.8, 1.0]),
-                segment_rules=rfm_config.get('segments', {})
-            )
+            datasets = engineer_all_features(self.cleaned_data, self.config)
             pbar.update(1)
         
-        # Unpack datasets
-        (customer_df, customer_segments_df, product_df, 
-         monthly_df, country_df, invoice_df) = datasets
+        # Unpack datasets, in the order engineer_all_features returns them
+        (_, customer_df, product_df, monthly_df, country_df, invoice_df,
+         cohort_df, daily_df, temporal_df) = datasets
+        
+        # Customer metrics carry the RFM scores and segments
+        customer_segments_df = customer_df
+        
+        # Frequently-bought-together pairs
+        basket_config = self.config.get('feature_params', {}).get('basket', {})
+        product_pairs_df = create_product_pairs(
+            self.cleaned_data,
+            product_metrics=product_df,
+            min_count=basket_config.get('min_pair_count', 20),
+            min_support=basket_config.get('min_support', 0.0)
+        )
+        
+        # 80/20 analysis over customers and products
+        concentration_df = create_revenue_concentration(customer_segments_df, product_df)
+        
+        # Customer metrics and segments as of each month start, in one sweep
+        snapshot_config = self.config.get('feature_params', {}).get('snapshots', {})
+        rfm_snapshots = create_rfm_snapshots(
+            self.cleaned_data,
+            snapshot_dates(self.cleaned_data, snapshot_config.get('freq', 'MS'))
+        )
+        rfm_snapshots_df = rfm_snapshots.snapshots
+        
+        # Segment-to-segment movement between consecutive snapshots
+        transitions_df = create_segment_transitions(rfm_snapshots)
+        
+        # Product × month seasonality indices (query 3.2)
+        seasonality_config = self.config.get('feature_params', {}).get('seasonality', {})
+        seasonality_df = create_product_seasonality(
+            self.cleaned_data,
+            product_metrics=product_df,
+            sparse=seasonality_config.get('sparse', False)
+        )
         
         logger.info(f"✓ Feature engineering complete")
         logger.info(f"  Customer records: {len(customer_df):,}")
@@ -237,6 +306,14 @@ class PipelineRunner:
         logger.info(f"  Monthly records: {len(monthly_df):,}")
         logger.info(f"  Country records: {len(country_df):,}")
         logger.info(f"  Invoice records: {len(invoice_df):,}")
+        logger.info(f"  Cohorts: {len(cohort_df):,}")
+        logger.info(f"  Daily records: {len(daily_df):,}")
+        logger.info(f"  Temporal cells: {len(temporal_df):,}")
+        logger.info(f"  Product pairs: {len(product_pairs_df):,}")
+        logger.info(f"  Concentration records: {len(concentration_df):,}")
+        logger.info(f"  RFM snapshot records: {len(rfm_snapshots_df):,}")
+        logger.info(f"  Segment transition records: {len(transitions_df):,}")
+        logger.info(f"  Seasonality records: {len(seasonality_df):,}")
         
         # Segment distribution
         if 'CustomerSegment' in customer_segments_df.columns:
@@ -256,7 +333,15 @@ class PipelineRunner:
                 ("Product Metrics", product_df),
                 ("Monthly Revenue", monthly_df),
                 ("Country Metrics", country_df),
-                ("Invoice Metrics", invoice_df)
+                ("Invoice Metrics", invoice_df),
+                ("Cohort Retention", cohort_df),
+                ("Daily Revenue", daily_df),
+                ("Temporal Patterns", temporal_df),
+                ("Product Pairs", product_pairs_df),
+                ("Revenue Concentration", concentration_df),
+                ("RFM Snapshots", rfm_snapshots_df),
+                ("Segment Transitions", transitions_df),
+                ("Product Seasonality", seasonality_df)
             ]:
                 print(f"\n{name}:")
                 print(f"  Shape: {df.shape}")
@@ -273,12 +358,50 @@ class PipelineRunner:
             'product_metrics': product_df,
             'monthly_revenue': monthly_df,
             'country_metrics': country_df,
-            'invoice_metrics': invoice_df
+            'invoice_metrics': invoice_df,
+            'cohort_retention': cohort_df,
+            'daily_revenue': daily_df,
+            'temporal_patterns': temporal_df,
+            'product_pairs': product_pairs_df,
+            'revenue_concentration': concentration_df,
+            'rfm_snapshots': rfm_snapshots_df,
+            'segment_transitions': transitions_df,
+            'product_seasonality': seasonality_df
         }
     
+    def _models_step(self, verbose: bool):
+        """Score customers with the churn and CLV models"""
+        logger.info("\nSTEP 4: Scoring Models")
+        logger.info("-" * 80)
+        
+        churn_scores_df, churn_metrics = churn_from_config(
+            self.cleaned_data,
+            self.feature_datasets['customer_metrics'],
+            self.config
+        )
+        self.feature_datasets['churn_scores'] = churn_scores_df
+        
+        clv_scores_df, clv_metrics = clv_from_config(
+            self.cleaned_data,
+            self.feature_datasets['customer_metrics'],
+            self.config
+        )
+        self.feature_datasets['clv_scores'] = clv_scores_df
+        
+        logger.info(f"✓ Model scoring complete")
+        logger.info("\n  Churn Risk Distribution:")
+        for risk, count in churn_scores_df['ChurnRisk'].value_counts(sort=False).items():
+            logger.info(f"    {risk}: {count:,} ({count / len(churn_scores_df) * 100:.1f}%)")
+        logger.info(f"  Predicted CLV (next period): {format_currency(clv_scores_df['PredictedRevenue'].sum())}")
+        
+        self.metrics['churn_at_risk'] = int((churn_scores_df['ChurnRisk'] != 'Active').sum())
+        self.metrics.update({f"churn_{key}": value for key, value in churn_metrics.items()})
+        self.metrics['clv_predicted_revenue'] = float(clv_scores_df['PredictedRevenue'].sum())
+        self.metrics.update({f"clv_{key}": value for key, value in clv_metrics.items()})
+    
     def _save_results_step(self, verbose: bool):
         """Save all processed datasets"""
-        logger.info("\nSTEP 4: Saving Results")
+        logger.info("\nSTEP 5: Saving Results")
         logger.info("-" * 80)
         
         output_dir = Path(self.config['file_paths']['processed_dir'])
@@ -291,9 +414,22 @@ class PipelineRunner:
             (self.feature_datasets['product_metrics'], 'product_metrics'),
             (self.feature_datasets['monthly_revenue'], 'monthly_revenue'),
             (self.feature_datasets['country_metrics'], 'country_metrics'),
-            (self.feature_datasets['invoice_metrics'], 'invoice_metrics')
+            (self.feature_datasets['invoice_metrics'], 'invoice_metrics'),
+            (self.feature_datasets['cohort_retention'], 'cohort_retention'),
+            (self.feature_datasets['daily_revenue'], 'daily_revenue'),
+            (self.feature_datasets['temporal_patterns'], 'temporal_patterns'),
+            (self.feature_datasets['product_pairs'], 'product_pairs'),
+            (self.feature_datasets['revenue_concentration'], 'revenue_concentration'),
+            (self.feature_datasets['rfm_snapshots'], 'rfm_snapshots'),
+            (self.feature_datasets['segment_transitions'], 'segment_transitions'),
+            (self.feature_datasets['product_seasonality'], 'product_seasonality')
         ]
         
+        # Model outputs, when the models step ran
+        for name in ['churn_scores', 'clv_scores']:
+            if name in self.feature_datasets:
+                datasets_to_save.append((self.feature_datasets[name], name))
+        
         logger.info(f"Saving {len(datasets_to_save)} datasets to: {output_dir}")
         
         with tqdm(total=len(datasets_to_save), desc="Saving files", disable=not verbose) as pbar:
@@ -305,12 +441,25 @@ class PipelineRunner:
         
         logger.info(f"✓ All datasets saved successfully")
         
+        # Memory-mappable copy of the cleaned data for the exporter and notebooks
+        columnar_dir = self.config['paths']['data'].get('columnar_cache', str(output_dir / 'cleaned_columnar'))
+        save_columnar(self.cleaned_data, columnar_dir, source_path=str(output_dir / "cleaned_data.csv"))
+        logger.info(f"  ✓ Saved columnar cache to {columnar_dir}")
+        
+        # Customer 360 lookups (positions refer to the rows just saved)
+        index_dir = self.config['paths']['data'].get('customer_index', str(output_dir / 'customer_index'))
+        CustomerIndex.build(
+            self.feature_datasets['invoice_metrics'],
+            self.feature_datasets['customer_metrics']
+        ).save(index_dir)
+        logger.info(f"  ✓ Saved customer index to {index_dir}")
+        
         self.metrics['files_saved'] = len(datasets_to_save)
         self.metrics['output_directory'] = str(output_dir)
     
     def _generate_report_step(self, verbose: bool):
         """Generate pipeline execution summary report"""
-        logger.info("\nSTEP 5: Generating Summary Report")
+        logger.info("\nSTEP 6: Generating Summary Report")
         logger.info("-" * 80)
         
         # Calculate business metrics
@@ -355,7 +504,8 @@ Unique Products:          {self.cleaned_data['StockCode'].nunique():>15,}
 {'─' * 80}
 4. PERFORMANCE METRICS
 {'─' * 80}
-Total Execution Time:     {self.metrics['total_execution_time']:>14.2f}s
+Total Execution Time:     {time.time() - self.start_time:>14.2f}s
+Validation Time:          {self.metrics.get('validation_time', 0.0):>14.2f}s
 Output Directory:         {self.metrics['output_directory']}
 
 {'─' * 80}
@@ -365,7 +515,9 @@ Output Directory:         {self.metrics['output_directory']}
         
         # Add segment distribution
         if 'CustomerSegment' in self.feature_datasets['customer_segments'].columns:
-            segment_counts = self.feature_datasets['customer_segments']['CustomerSegment'].value_counts()
+            segment_counts = self.cache.call(
+                value_distribution, self.feature_datasets['customer_segments'], 'CustomerSegment'
+            )
             for segment, count in segment_counts.items():
                 pct = count / len(self.feature_datasets['customer_segments']) * 100
                 report += f"{segment:<25} {count:>10,} ({pct:>5.1f}%)\n"
@@ -424,7 +576,7 @@ Examples:
     parser.add_argument(
         '--steps',
         type=str,
-        help='Comma-separated list of steps to run (load,clean,features,save,report). Default: all'
+        help='Comma-separated list of steps to run (load,clean,features,models,save,report). Default: all'
     )
     
     parser.add_argument(
@@ -442,23 +594,48 @@ Examples:
     return parser.parse_args()
 
 
+def dry_run(config_path: str, steps: Optional[str] = None) -> int:
+    """
+    Validate the configuration without loading data or analysis libraries
+    
+    Args:
+        config_path: Path to configuration file
+        steps: Comma-separated steps that would run (None = all)
+        
+    Returns:
+        Exit code (0 = configuration is valid)
+    """
+    try:
+        with open(config_path, 'r') as file:
+            config = yaml.safe_load(file)
+    except (OSError, yaml.YAMLError) as e:
+        print(f"Configuration error: {e}")
+        return 1
+    
+    missing = check_config(config or {})
+    if missing:
+        print(f"Configuration error - missing keys: {', '.join(missing)}")
+        return 1
+    
+    print("DRY RUN MODE - Configuration validated successfully")
+    print("Pipeline would execute the following steps:")
+    for step in (steps.split(',') if steps else ['all']):
+        print(f"  - {step}")
+    return 0
+
+
 def main():
     """Main entry point for pipeline execution"""
     args = parse_arguments()
     
+    # Dry run - just validate config
+    if args.dry_run:
+        return dry_run(args.config, args.steps)
+    
     try:
         # Initialize pipeline
         pipeline = PipelineRunner(config_path=args.config)
         
-        # Dry run - just validate config
-        if args.dry_run:
-            logger.info("DRY RUN MODE - Configuration validated successfully")
-            logger.info("Pipeline would execute the following steps:")
-            steps = args.steps.split(',') if args.steps else ['all']
-            for step in steps:
-                logger.info(f"  - {step}")
-            return 0
-        
         # Parse steps
         steps = args.steps.split(',') if args.steps else None
         
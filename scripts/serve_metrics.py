@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Metrics Query Service for E-commerce Analytics
+
+Serves the metric tables written by the pipeline (customer, product,
+country, monthly and invoice metrics) over HTTP from in-memory indexes,
+reloading them when the pipeline writes new outputs.
+
+Usage:
+    python serve_metrics.py
+    python serve_metrics.py --port 9000 --reload-interval 30
+    curl http://127.0.0.1:8050/customer_metrics/17850
+    curl "http://127.0.0.1:8050/product_metrics/top?by=TotalRevenue&n=10"
+    curl "http://127.0.0.1:8050/monthly_revenue/range?column=YearMonth&min=2010-01&max=2010-06"
+
+Author: Data Analytics Team
+Version: 1.0.0
+Last Updated: December 2024
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+
+try:
+    from src.lazy_imports import lazy_import
+    from src.utils import load_config, setup_logging
+except ImportError as e:
+    print(f"Error importing modules: {e}")
+    print("Make sure you're running from the project root directory")
+    sys.exit(1)
+
+logger = lazy_import('loguru', 'logger')
+MetricsService = lazy_import('src.metrics_service', 'MetricsService')
+MetricsStore = lazy_import('src.metrics_service', 'MetricsStore')
+
+
+def parse_arguments():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="E-commerce Metrics Query Service",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Routes:
+  /health                                   service status
+  /datasets                                 served datasets and their key columns
+  /<dataset>/<key>                          point lookup on the key column
+  /<dataset>/top?by=<column>&n=10           top-N rows (order=asc for bottom-N)
+  /<dataset>/range?column=<c>&min=&max=     rows in a value range
+        """
+    )
+    
+    parser.add_argument(
+        '--config',
+        type=str,
+        default='config/config.yaml',
+        help='Path to configuration file (default: config/config.yaml)'
+    )
+    
+    parser.add_argument(
+        '--host',
+        type=str,
+        help='Interface to bind (default: service.host from config)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        help='Port to bind (default: service.port from config)'
+    )
+    
+    parser.add_argument(
+        '--reload-interval',
+        type=float,
+        help='Seconds between checks for new pipeline outputs, 0 to disable (default: from config)'
+    )
+    
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point for the metrics service"""
+    args = parse_arguments()
+    
+    config = load_config(args.config)
+    service_config = config.get("service", {})
+    log_config = config.get("logging", {})
+    setup_logging(
+        log_file=log_config.get("file", "logs/service.log"),
+        level=log_config.get("level", "INFO"),
+        enqueue=log_config.get("enqueue", False)
+    )
+    
+    host = args.host or service_config.get("host", "127.0.0.1")
+    port = args.port if args.port is not None else service_config.get("port", 8050)
+    reload_interval = (args.reload_interval if args.reload_interval is not None
+                       else service_config.get("reload_interval", 5))
+    
+    try:
+        service = MetricsService(
+            lambda: MetricsStore.from_config(config),
+            reload_interval=reload_interval,
+            max_results=service_config.get("max_results", 1000)
+        )
+        asyncio.run(service.serve(host, port))
+        return 0
+    
+    except KeyboardInterrupt:
+        logger.info("Metrics service stopped")
+        return 0
+    
+    except KeyError as e:
+        logger.error(f"Configuration error - missing key: {e}")
+        logger.error("Please check your config.yaml file")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -237,10 +237,10 @@ customer_activity AS (
         f.customer_id,
         f.cohort_month,
         DATE_TRUNC('month', e.invoice_date) AS activity_month,
-        EXTRACT(MONTH FROM AGE(
-            DATE_TRUNC('month', e.invoice_date), 
-            f.cohort_month
-        )) AS months_since_first_purchase
+        -- Whole months between cohort and activity (AGE's MONTH part wraps every year)
+        (EXTRACT(YEAR FROM e.invoice_date) - EXTRACT(YEAR FROM f.cohort_month)) * 12 +
+        (EXTRACT(MONTH FROM e.invoice_date) - EXTRACT(MONTH FROM f.cohort_month))
+            AS months_since_first_purchase
     FROM first_purchase f
     JOIN ecommerce_data e ON f.customer_id = e.customer_id
     WHERE e.invoice_no NOT LIKE 'C%'
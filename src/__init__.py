@@ -2,14 +2,62 @@
 E-Commerce Sales Performance & Customer Behavior Analysis
 Source package for reusable functions and utilities
 
+Submodules are imported on first access (PEP 562), so importing one module,
+e.g. src.utils for the configuration, does not load pandas, scipy and every
+analysis module.
+
 Author: Hamza Khan
 Date: December 18, 2024
 Version: 1.0.0
 """
 
+import importlib
+
 __version__ = "1.0.0"
 __author__ = "Hamza Khan"
 
-from .utils import *
-from .data_cleaning import *
-from .feature_engineering import *
+# Later modules take precedence, as with the former star imports
+_SUBMODULES = [
+    'utils',
+    'data_cleaning',
+    'feature_engineering',
+    'basket_analysis',
+    'concentration',
+    'time_index',
+    'streaming_stats',
+    'deduplication',
+    'validation',
+    'metrics_service',
+    'cache',
+    'customer_index',
+    'columnar_cache',
+    'snapshots',
+    'segment_migration',
+    'churn',
+    'clv',
+    'heavy_hitters',
+    'seasonality',
+]
+
+# `from src import *` binds the submodules; their functions stay reachable as src.<name>
+__all__ = list(_SUBMODULES)
+
+
+def __getattr__(name):
+    """Resolve package-level names from the submodules on first use"""
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    
+    for submodule in reversed(_SUBMODULES):
+        module = importlib.import_module(f'.{submodule}', __name__)
+        if not name.startswith('_') and hasattr(module, name):
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List the loaded names plus every submodule"""
+    return sorted(set(globals()) | set(__all__))
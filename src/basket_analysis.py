@@ -0,0 +1,160 @@
+"""
+Market Basket Analysis for E-Commerce Data
+Frequently-bought-together product pairs using sparse co-occurrence matrices
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from scipy import sparse
+from loguru import logger
+from typing import Tuple
+
+
+def build_incidence_matrix(df: pd.DataFrame, invoice_col: str = 'InvoiceNo',
+                           product_col: str = 'StockCode') -> Tuple[sparse.csr_matrix, pd.Index, pd.Index]:
+    """
+    Build a binary invoice × product incidence matrix
+    
+    Each cell is 1 if the product appears at least once on the invoice.
+    Repeated lines of the same product on one invoice are collapsed.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    invoice_col : str
+        Invoice column name
+    product_col : str
+        Product column name
+    
+    Returns:
+    --------
+    tuple : (incidence matrix as CSR, invoice labels, product labels)
+    
+    Example:
+    --------
+    >>> matrix, invoices, products = build_incidence_matrix(df)
+    """
+    invoice_codes, invoices = pd.factorize(df[invoice_col])
+    product_codes, products = pd.factorize(df[product_col], sort=True)
+    
+    # Factorize marks missing keys with -1
+    valid = (invoice_codes >= 0) & (product_codes >= 0)
+    rows = invoice_codes[valid]
+    cols = product_codes[valid]
+    
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+        shape=(len(invoices), len(products))
+    )
+    # Conversion to CSR sums duplicate entries; clamp back to binary
+    matrix.data[:] = 1
+    
+    return matrix, invoices, products
+
+
+def create_product_pairs(df: pd.DataFrame, product_metrics: pd.DataFrame = None,
+                         min_count: int = 20, min_support: float = 0.0,
+                         invoice_col: str = 'InvoiceNo',
+                         product_col: str = 'StockCode') -> pd.DataFrame:
+    """
+    Find frequently-bought-together product pairs with support, confidence and lift
+    
+    Products whose own invoice count is below the threshold are pruned before
+    the co-occurrence product is taken, since a pair can never be more frequent
+    than either of its items.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    product_metrics : pd.DataFrame
+        Product metrics used to attach descriptions (optional)
+    min_count : int
+        Minimum number of invoices containing the pair
+    min_support : float
+        Minimum fraction of invoices containing the pair
+    invoice_col : str
+        Invoice column name
+    product_col : str
+        Product column name
+    
+    Returns:
+    --------
+    pd.DataFrame : Product pairs sorted by co-occurrence count
+    
+    Example:
+    --------
+    >>> product_pairs = create_product_pairs(df, product_metrics, min_count=20)
+    """
+    logger.info("📊 Creating product pair (basket) metrics...")
+    
+    matrix, invoices, products = build_incidence_matrix(df, invoice_col, product_col)
+    n_invoices = matrix.shape[0]
+    threshold = max(min_count, int(np.ceil(min_support * n_invoices)), 1)
+    
+    # Prune infrequent products, then invoices left with fewer than two products
+    item_counts = np.asarray(matrix.sum(axis=0)).ravel()
+    frequent = np.flatnonzero(item_counts >= threshold)
+    pruned = matrix.tocsc()[:, frequent].tocsr()
+    pruned = pruned[np.diff(pruned.indptr) >= 2]
+    
+    # Upper triangle of the product × product co-occurrence matrix
+    co_occurrence = sparse.triu(pruned.T @ pruned, k=1).tocoo()
+    keep = co_occurrence.data >= threshold
+    first = frequent[co_occurrence.row[keep]]
+    second = frequent[co_occurrence.col[keep]]
+    counts = co_occurrence.data[keep].astype(np.int64)
+    
+    support = counts / n_invoices
+    support_1 = item_counts[first] / n_invoices
+    support_2 = item_counts[second] / n_invoices
+    
+    pairs = pd.DataFrame({
+        'Product_1': products[first],
+        'Product_2': products[second],
+        'CoOccurrenceCount': counts,
+        'Support': support,
+        'Confidence_1_to_2': counts / item_counts[first],
+        'Confidence_2_to_1': counts / item_counts[second],
+        'Lift': support / (support_1 * support_2)
+    })
+    
+    # Attach descriptions
+    lookup = product_metrics if product_metrics is not None else df
+    if 'Description' in lookup.columns:
+        descriptions = lookup.drop_duplicates(product_col).set_index(product_col)['Description']
+        pairs.insert(1, 'Description_1', pairs['Product_1'].map(descriptions))
+        pairs.insert(3, 'Description_2', pairs['Product_2'].map(descriptions))
+    
+    pairs = pairs.sort_values(['CoOccurrenceCount', 'Lift'], ascending=False).reset_index(drop=True)
+    
+    logger.info(f"✅ Found {len(pairs):,} product pairs in ≥ {threshold:,} invoices "
+                f"({len(frequent):,} of {len(products):,} products frequent enough)")
+    
+    return pairs
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging, load_data, save_data
+    
+    setup_logging()
+    config = load_config()
+    basket_config = config['feature_params'].get('basket', {})
+    
+    # Load cleaned data and product metrics
+    df_clean = load_data(config['paths']['data']['cleaned'])
+    product_metrics = load_data(config['paths']['data']['product_metrics'])
+    
+    # Frequently-bought-together pairs
+    product_pairs = create_product_pairs(
+        df_clean,
+        product_metrics,
+        min_count=basket_config.get('min_pair_count', 20),
+        min_support=basket_config.get('min_support', 0.0)
+    )
+    save_data(product_pairs, config['paths']['data']['product_pairs'])
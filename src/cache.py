@@ -0,0 +1,422 @@
+"""
+Query Result Cache for E-Commerce Analysis
+LRU/TTL memoization of aggregate queries keyed by function, arguments and
+dataset fingerprint, with optional persistence to disk
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import time
+import pandas as pd
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from loguru import logger
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from .utils import ensure_datetime, dataset_version
+except ImportError:
+    from utils import ensure_datetime, dataset_version
+
+
+def dataset_fingerprint(data) -> str:
+    """
+    Content fingerprint of a dataframe or series
+    
+    Hashes shape, column names, dtypes and every value (with the index).
+    This reads the whole frame, so QueryCache only uses it for frames
+    without a recorded version when built with hash_content=True.
+    
+    Parameters:
+    -----------
+    data : pd.DataFrame or pd.Series
+        Dataset to fingerprint
+    
+    Returns:
+    --------
+    str : 32-character hex digest
+    
+    Example:
+    --------
+    >>> dataset_fingerprint(df_clean)
+    '9b1f0c...'
+    """
+    columns = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+    dtypes = [str(dtype) for dtype in (data.dtypes if isinstance(data, pd.DataFrame) else [data.dtype])]
+    
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((data.shape, columns, dtypes)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class _Unversioned(Exception):
+    """Raised for a dataset argument that has no version and may not be hashed"""
+
+
+def _argument_key(value: Any, hash_content: bool = True) -> str:
+    """Stable text for one argument; datasets are represented by their version or fingerprint"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        version = dataset_version(value)
+        if version is not None:
+            return f"<data {version} {value.shape}>"
+        if not hash_content:
+            raise _Unversioned()
+        return f"<data {dataset_fingerprint(value)}>"
+    if isinstance(value, np.ndarray):
+        return f"<array {hashlib.blake2b(value.tobytes(), digest_size=16).hexdigest()} {value.dtype}>"
+    return repr(value)
+
+
+def _copy_value(value: Any) -> Any:
+    """Copy mutable results so callers cannot change what is cached"""
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray, dict, list)):
+        return value.copy()
+    return value
+
+
+class QueryCache:
+    """
+    Size-bounded LRU cache of query results with optional expiry and disk copy
+    
+    Results are keyed by the function's qualified name and its arguments.
+    Dataframe arguments contribute their version (set by load_data from the
+    source file's path, size and modification time), so a hit costs a
+    dictionary lookup and a reloaded or rewritten file misses. Frames
+    without a version are hashed in full with hash_content=True, and are
+    otherwise computed without caching. With cache_dir set, results are
+    also pickled to disk and survive between runs (only point cache_dir at
+    a trusted location).
+    
+    Example:
+    --------
+    >>> cache = QueryCache(max_entries=256, ttl=3600)
+    >>> product_metrics = load_data('data/product_metrics.csv')
+    >>> top = cache.call(top_n, product_metrics, 'TotalRevenue', 20)
+    >>> cache.stats()
+    {'entries': 1, 'hits': 0, 'misses': 1, 'evictions': 0}
+    """
+    
+    def __init__(self, max_entries: int = 128, ttl: float = None, cache_dir: str = None,
+                 hash_content: bool = False):
+        """
+        Initialize the cache
+        
+        Parameters:
+        -----------
+        max_entries : int
+            Results kept in memory; the least recently used is evicted first
+        ttl : float
+            Seconds a result stays valid (None = until evicted)
+        cache_dir : str
+            Directory for on-disk copies of results (None = memory only)
+        hash_content : bool
+            Key frames without a version by a hash of all their values
+            (costs a full pass over the frame on every call)
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.hash_content = hash_content
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    @staticmethod
+    def make_key(func: Callable, args: tuple = (), kwargs: Dict[str, Any] = None,
+                 hash_content: bool = True) -> Optional[str]:
+        """
+        Cache key for a call
+        
+        Parameters:
+        -----------
+        func : callable
+            Query function
+        args : tuple
+            Positional arguments
+        kwargs : dict
+            Keyword arguments
+        hash_content : bool
+            Hash the values of frames that have no version
+        
+        Returns:
+        --------
+        str or None : Key made of the function name and argument versions or
+                      fingerprints (None if a frame has no version and
+                      hash_content is False)
+        """
+        try:
+            parts = [f"{func.__module__}.{func.__qualname__}"]
+            parts += [_argument_key(arg, hash_content) for arg in args]
+            parts += [f"{name}={_argument_key(value, hash_content)}"
+                      for name, value in sorted((kwargs or {}).items())]
+        except _Unversioned:
+            return None
+        return "|".join(parts)
+    
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / f"{hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()}.pkl"
+    
+    def _load_from_disk(self, key: str):
+        """(expires_at, value) from the disk copy, or None if missing, stale or unreadable"""
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                stored_key, expires_at, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️  Ignoring unreadable cache file {path}: {e}")
+            return None
+        
+        if stored_key != key or (expires_at is not None and expires_at < time.time()):
+            return None
+        return expires_at, value
+    
+    def _save_to_disk(self, key: str, expires_at: Optional[float], value: Any) -> None:
+        """Pickle a result next to its final path and rename it into place"""
+        path = self._disk_path(key)
+        temp_path = path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'wb') as f:
+                pickle.dump((key, expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not persist cached result: {e}")
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Cached result for a key
+        
+        Parameters:
+        -----------
+        key : str
+            Key from make_key()
+        default : any
+            Returned when the key is missing or expired
+        
+        Returns:
+        --------
+        any : A copy of the cached result, or default
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and entry[0] < time.time():
+            del self._entries[key]
+            entry = None
+        
+        if entry is None and self.cache_dir is not None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self._store(key, entry)
+        
+        if entry is None:
+            self.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _copy_value(entry[1])
+    
+    def _store(self, key: str, entry: tuple) -> None:
+        """Insert into memory, evicting least recently used entries"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def put(self, key: str, value: Any) -> None:
+        """
+        Cache a result
+        
+        Parameters:
+        -----------
+        key : str
+            Key from make_key()
+        value : any
+            Result to cache (pickled to disk when cache_dir is set)
+        """
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        entry = (expires_at, _copy_value(value))
+        self._store(key, entry)
+        if self.cache_dir is not None:
+            self._save_to_disk(key, *entry)
+    
+    def call(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call a query function through the cache
+        
+        Parameters:
+        -----------
+        func : callable
+            Query function; must be deterministic in its arguments
+        *args, **kwargs : Arguments for func
+        
+        Returns:
+        --------
+        any : Cached or freshly computed result (always computed when a
+              frame argument has no version and hash_content is off)
+        """
+        key = self.make_key(func, args, kwargs, self.hash_content)
+        if key is None:
+            self.misses += 1
+            return func(*args, **kwargs)
+        
+        missing = object()
+        result = self.get(key, missing)
+        if result is missing:
+            result = func(*args, **kwargs)
+            self.put(key, result)
+        return result
+    
+    def memoize(self, func: Callable) -> Callable:
+        """
+        Decorator routing every call of func through the cache
+        
+        Example:
+        --------
+        >>> @cache.memoize
+        ... def revenue_by_country(df):
+        ...     return df.groupby('Country')['TotalPrice'].sum()
+        """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
+    
+    def clear(self) -> None:
+        """Drop all cached results, in memory and on disk"""
+        self._entries.clear()
+        if self.cache_dir is not None:
+            for path in self.cache_dir.glob('*.pkl'):
+                path.unlink()
+    
+    def stats(self) -> Dict[str, int]:
+        """Entries in memory and hit, miss and eviction counts"""
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def cache_from_config(config: Dict[str, Any]) -> QueryCache:
+    """
+    Build a QueryCache from the 'cache' section of the configuration
+    
+    Parameters:
+    -----------
+    config : dict
+        Configuration dictionary
+    
+    Returns:
+    --------
+    QueryCache : Cache with the configured size, expiry, directory and hashing
+    """
+    cache_config = config.get('cache', {})
+    return QueryCache(
+        max_entries=cache_config.get('max_entries', 128),
+        ttl=cache_config.get('ttl_seconds'),
+        cache_dir=cache_config.get('dir') if cache_config.get('persist', False) else None,
+        hash_content=cache_config.get('hash_content', False)
+    )
+
+
+# ============================================================================
+# SHARED QUERIES
+# ============================================================================
+
+def top_n(df: pd.DataFrame, column: str, n: int = 10) -> pd.DataFrame:
+    """
+    Rows with the n largest values of a column
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Metric table (e.g. product or country metrics)
+    column : str
+        Column to rank by
+    n : int
+        Number of rows
+    
+    Returns:
+    --------
+    pd.DataFrame : Top n rows in descending order
+    """
+    return df.nlargest(n, column)
+
+
+def value_distribution(df: pd.DataFrame, column: str) -> pd.Series:
+    """
+    Counts per value of a column, most frequent first
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataframe (e.g. customer segments)
+    column : str
+        Column to count
+    
+    Returns:
+    --------
+    pd.Series : Count per value
+    """
+    return df[column].value_counts()
+
+
+def overall_totals(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Headline totals over cleaned transactions
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned transactions with TotalPrice
+    
+    Returns:
+    --------
+    dict : total_revenue, total_orders, total_customers, total_products,
+           total_countries and the first and last InvoiceDate
+    """
+    # Parse a copy of the column: the caller's frame is part of the cache key
+    dates = ensure_datetime(df[['InvoiceDate']].copy(), 'InvoiceDate')['InvoiceDate']
+    return {
+        'total_revenue': float(df['TotalPrice'].sum()),
+        'total_orders': int(df['InvoiceNo'].nunique()),
+        'total_customers': int(df['CustomerID'].nunique()),
+        'total_products': int(df['StockCode'].nunique()),
+        'total_countries': int(df['Country'].nunique()),
+        'start_date': dates.min(),
+        'end_date': dates.max(),
+    }
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging, load_data
+    
+    setup_logging()
+    config = load_config()
+    cache = cache_from_config(config)
+    
+    product_metrics = load_data(config['paths']['data']['product_metrics'])
+    for _ in range(3):
+        top_products = cache.call(top_n, product_metrics, 'TotalRevenue', 20)
+    
+    logger.info(f"Cache stats: {cache.stats()}")
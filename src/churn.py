@@ -0,0 +1,356 @@
+"""
+Churn Risk Scoring for E-Commerce Customers
+Rule-based churn risk buckets (as in SQL query 5.1) and an optional
+logistic regression model, scored in batches over a float32 feature matrix
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from loguru import logger
+from typing import Dict, Any, Sequence, Tuple
+
+try:
+    from .feature_engineering import create_total_price, create_customer_metrics
+except ImportError:
+    from feature_engineering import create_total_price, create_customer_metrics
+
+# Feature columns from model_params.churn in config.yaml
+DEFAULT_CHURN_FEATURES = ['Recency_Days', 'TotalOrders', 'CustomerLifetimeValue',
+                          'AvgBasketValue', 'PurchaseFrequency']
+
+# Days since last purchase above which each risk bucket starts (query 5.1)
+DEFAULT_RISK_THRESHOLDS = [60, 90, 180]
+CHURN_RISK_LABELS = ['Active', 'Low Risk', 'Medium Risk', 'High Risk']
+
+
+def build_feature_matrix(customer_metrics: pd.DataFrame, features: Sequence[str] = None) -> np.ndarray:
+    """
+    Customer features as one contiguous float32 matrix
+    
+    Parameters:
+    -----------
+    customer_metrics : pd.DataFrame
+        Customer metrics from create_customer_metrics()
+    features : list
+        Feature columns (default: DEFAULT_CHURN_FEATURES)
+    
+    Returns:
+    --------
+    np.ndarray : C-contiguous float32 array of shape (customers, features),
+                 missing and infinite values set to 0
+    """
+    features = list(features or DEFAULT_CHURN_FEATURES)
+    missing = [column for column in features if column not in customer_metrics.columns]
+    if missing:
+        raise KeyError(f"Features not in customer metrics: {missing}")
+    
+    matrix = np.empty((len(customer_metrics), len(features)), dtype=np.float32)
+    for j, column in enumerate(features):
+        matrix[:, j] = customer_metrics[column].values
+    np.nan_to_num(matrix, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    return matrix
+
+
+def churn_risk_codes(recency_days: np.ndarray, thresholds: Sequence[int] = None) -> np.ndarray:
+    """
+    Churn risk bucket per customer from days since last purchase
+    
+    Parameters:
+    -----------
+    recency_days : np.ndarray
+        Days since last purchase
+    thresholds : list
+        Ascending bucket start days (default: 60, 90, 180)
+    
+    Returns:
+    --------
+    np.ndarray : int8 index into CHURN_RISK_LABELS (0 = Active, 3 = High Risk)
+    
+    Example:
+    --------
+    >>> churn_risk_codes(np.array([10, 75, 120, 200]))
+    array([0, 1, 2, 3], dtype=int8)
+    """
+    thresholds = np.asarray(thresholds or DEFAULT_RISK_THRESHOLDS)
+    # side='left': exactly 60 days is still Active, as with "> 60" in query 5.1
+    return np.searchsorted(thresholds, recency_days, side='left').astype(np.int8)
+
+
+class ChurnModel:
+    """
+    Logistic regression churn model fitted with Newton's method in NumPy
+    
+    Features are standardized with the training mean and standard deviation
+    and a small L2 penalty keeps the fit stable when features are collinear
+    (e.g. CustomerLifetimeValue and TotalOrders).
+    
+    Example:
+    --------
+    >>> X, y = churn_training_set(df_clean, '2010-09-01', horizon_days=90)
+    >>> model = ChurnModel().fit(X, y)
+    >>> probabilities = model.predict_proba(build_feature_matrix(customer_metrics))
+    """
+    
+    def __init__(self, features: Sequence[str] = None, l2: float = 1.0, max_iter: int = 25, tol: float = 1e-6):
+        """
+        Initialize an unfitted model
+        
+        Parameters:
+        -----------
+        features : list
+            Feature names, in matrix column order
+        l2 : float
+            L2 penalty on the (standardized) coefficients
+        max_iter : int
+            Maximum Newton iterations
+        tol : float
+            Stop when the largest coefficient update is below this
+        """
+        self.features = list(features or DEFAULT_CHURN_FEATURES)
+        self.l2 = l2
+        self.max_iter = max_iter
+        self.tol = tol
+        self.mean = None
+        self.scale = None
+        self.coef = None
+        self.intercept = 0.0
+    
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'ChurnModel':
+        """
+        Fit the model
+        
+        Parameters:
+        -----------
+        X : np.ndarray
+            Feature matrix from build_feature_matrix()
+        y : np.ndarray
+            1 = churned, 0 = retained
+        
+        Returns:
+        --------
+        ChurnModel : self
+        """
+        self.mean = X.mean(axis=0, dtype=np.float64)
+        self.scale = X.std(axis=0, dtype=np.float64)
+        self.scale[self.scale == 0] = 1.0
+        Z = np.hstack([np.ones((len(X), 1)), (X - self.mean) / self.scale])
+        y = np.asarray(y, dtype=np.float64)
+        
+        penalty = np.full(Z.shape[1], self.l2)
+        penalty[0] = 0.0
+        weights = np.zeros(Z.shape[1])
+        for iteration in range(self.max_iter):
+            p = _sigmoid(Z @ weights)
+            gradient = Z.T @ (p - y) + penalty * weights
+            hessian = (Z * (p * (1 - p))[:, None]).T @ Z + np.diag(penalty)
+            step = np.linalg.solve(hessian, gradient)
+            weights -= step
+            if np.abs(step).max() < self.tol:
+                break
+        
+        self.intercept, self.coef = float(weights[0]), weights[1:]
+        logger.info(f"✅ Churn model fitted on {len(X):,} customers ({iteration + 1} iterations)")
+        return self
+    
+    def predict_proba(self, X: np.ndarray, batch_size: int = 100_000) -> np.ndarray:
+        """
+        Churn probability per row, computed in batches
+        
+        Parameters:
+        -----------
+        X : np.ndarray
+            Feature matrix with the training feature columns
+        batch_size : int
+            Rows per batch (bounds the temporary memory)
+        
+        Returns:
+        --------
+        np.ndarray : float32 probabilities
+        """
+        if self.coef is None:
+            raise ValueError("Churn model is not fitted")
+        # Fold the standardization into the weights: one matrix-vector product per batch
+        coef = (self.coef / self.scale).astype(np.float32)
+        intercept = np.float32(self.intercept - self.mean @ (self.coef / self.scale))
+        
+        probabilities = np.empty(len(X), dtype=np.float32)
+        for start in range(0, len(X), batch_size):
+            batch = X[start:start + batch_size]
+            probabilities[start:start + batch_size] = _sigmoid(batch @ coef + intercept)
+        return probabilities
+    
+    def save(self, file_path: str) -> None:
+        """Save coefficients and standardization to an .npz file"""
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(file_path, features=np.array(self.features), mean=self.mean, scale=self.scale,
+                 coef=self.coef, intercept=self.intercept, l2=self.l2)
+        logger.info(f"✅ Churn model saved: {file_path}")
+    
+    @classmethod
+    def load(cls, file_path: str) -> 'ChurnModel':
+        """Load a model saved with save()"""
+        with np.load(file_path) as data:
+            model = cls(features=data['features'].tolist(), l2=float(data['l2']))
+            model.mean, model.scale, model.coef = data['mean'], data['scale'], data['coef']
+            model.intercept = float(data['intercept'])
+        return model
+
+
+def _sigmoid(values: np.ndarray) -> np.ndarray:
+    """Logistic function, clipped so exp() cannot overflow"""
+    return 1.0 / (1.0 + np.exp(-np.clip(values, -30, 30)))
+
+
+def churn_training_set(df: pd.DataFrame, cutoff, horizon_days: int = 90,
+                       features: Sequence[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Features as of a past cutoff date and whether each customer churned after it
+    
+    A customer counts as churned when they made no purchase within
+    horizon_days after the cutoff.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned transactions
+    cutoff : str or Timestamp
+        Date the features are computed at; needs horizon_days of data after it
+    horizon_days : int
+        Days after the cutoff in which a purchase means "retained"
+    features : list
+        Feature columns (default: DEFAULT_CHURN_FEATURES)
+    
+    Returns:
+    --------
+    tuple : (float32 feature matrix, int8 labels)
+    
+    Example:
+    --------
+    >>> X, y = churn_training_set(df_clean, '2010-09-01', horizon_days=90)
+    """
+    cutoff = pd.Timestamp(cutoff)
+    if 'TotalPrice' not in df.columns:
+        df = create_total_price(df.copy())
+    history = df[df['InvoiceDate'] < cutoff]
+    customer_metrics = create_customer_metrics(history, analysis_date=str(cutoff))
+    
+    window = df[(df['InvoiceDate'] >= cutoff) & (df['InvoiceDate'] < cutoff + pd.Timedelta(days=horizon_days))]
+    retained = customer_metrics['CustomerID'].isin(window['CustomerID'].unique()).values
+    
+    labels = (~retained).astype(np.int8)
+    logger.info(f"📊 Churn training set: {len(labels):,} customers, {labels.mean():.1%} churned")
+    return build_feature_matrix(customer_metrics, features), labels
+
+
+def score_churn(customer_metrics: pd.DataFrame, model: ChurnModel = None, thresholds: Sequence[int] = None,
+                batch_size: int = 100_000) -> pd.DataFrame:
+    """
+    Churn risk bucket (and model probability) for every customer
+    
+    Parameters:
+    -----------
+    customer_metrics : pd.DataFrame
+        Customer metrics from create_customer_metrics()
+    model : ChurnModel
+        Fitted model (optional); adds a ChurnProbability column
+    thresholds : list
+        Risk bucket start days (default: 60, 90, 180)
+    batch_size : int
+        Rows per scoring batch
+    
+    Returns:
+    --------
+    pd.DataFrame : CustomerID, Recency_Days, CustomerLifetimeValue, ChurnRisk
+                   (categorical) and optionally ChurnProbability
+    
+    Example:
+    --------
+    >>> churn_scores = score_churn(customer_metrics, model)
+    >>> churn_scores['ChurnRisk'].value_counts()
+    """
+    codes = churn_risk_codes(customer_metrics['Recency_Days'].values, thresholds)
+    scores = pd.DataFrame({
+        'CustomerID': customer_metrics['CustomerID'].values,
+        'Recency_Days': customer_metrics['Recency_Days'].values,
+        'CustomerLifetimeValue': customer_metrics['CustomerLifetimeValue'].values,
+        'ChurnRisk': pd.Categorical.from_codes(codes, categories=CHURN_RISK_LABELS, ordered=True)
+    })
+    
+    if model is not None:
+        X = build_feature_matrix(customer_metrics, model.features)
+        scores['ChurnProbability'] = model.predict_proba(X, batch_size=batch_size)
+    
+    at_risk = (codes > 0).sum()
+    logger.info(f"✅ Churn risk scored for {len(scores):,} customers ({at_risk:,} at risk)")
+    return scores
+
+
+def _holdout_split(n: int, test_size: float, random_state: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Shuffled train/test row positions"""
+    order = np.random.default_rng(random_state).permutation(n)
+    n_test = int(round(n * test_size))
+    return order[n_test:], order[:n_test]
+
+
+def churn_from_config(df: pd.DataFrame, customer_metrics: pd.DataFrame,
+                      config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Score churn risk with the settings in config['model_params']['churn']
+    
+    When 'logistic' is enabled, the model is trained on features as of
+    horizon_days before the last transaction, evaluated on a test_size
+    holdout, and saved under paths.output.models.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned transactions
+    customer_metrics : pd.DataFrame
+        Current customer metrics
+    config : dict
+        Configuration dictionary
+    
+    Returns:
+    --------
+    tuple : (churn scores dataframe, model metrics dictionary)
+    """
+    churn_config = config.get('model_params', {}).get('churn', {})
+    features = churn_config.get('features', DEFAULT_CHURN_FEATURES)
+    horizon_days = churn_config.get('horizon_days', 90)
+    model, model_metrics = None, {}
+    
+    if churn_config.get('logistic', False):
+        cutoff = df['InvoiceDate'].max().normalize() - pd.Timedelta(days=horizon_days)
+        X, y = churn_training_set(df, cutoff, horizon_days, features)
+        train, test = _holdout_split(len(y), churn_config.get('test_size', 0.2),
+                                     churn_config.get('random_state', 42))
+        model = ChurnModel(features).fit(X[train], y[train])
+        
+        predicted = model.predict_proba(X[test]) >= 0.5
+        model_metrics['holdout_accuracy'] = float((predicted == y[test]).mean()) if len(test) else float('nan')
+        logger.info(f"  Churn model holdout accuracy: {model_metrics['holdout_accuracy']:.1%}")
+        
+        models_dir = config.get('paths', {}).get('output', {}).get('models', 'models/')
+        model.save(str(Path(models_dir) / 'churn_model.npz'))
+    
+    scores = score_churn(customer_metrics, model, churn_config.get('risk_thresholds'),
+                         churn_config.get('batch_size', 100_000))
+    return scores, model_metrics
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, load_data, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    df_clean = load_data(config['paths']['data']['cleaned'], parse_dates=['InvoiceDate'])
+    customer_metrics = load_data(config['paths']['data']['customer_metrics'])
+    
+    churn_scores, model_metrics = churn_from_config(df_clean, customer_metrics, config)
+    logger.info(f"Churn risk distribution:\n{churn_scores['ChurnRisk'].value_counts()}")
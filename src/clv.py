@@ -0,0 +1,240 @@
+"""
+CLV Forecasting for E-Commerce Customers
+Linear regression of future customer revenue, fitted in closed form with
+NumPy least squares and scored for all customers in one matrix multiply
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from loguru import logger
+from typing import Dict, Any, Sequence, Tuple
+
+try:
+    from .feature_engineering import create_total_price, create_customer_metrics
+    from .churn import build_feature_matrix
+except ImportError:
+    from feature_engineering import create_total_price, create_customer_metrics
+    from churn import build_feature_matrix
+
+# Feature columns from model_params.clv in config.yaml
+DEFAULT_CLV_FEATURES = ['TotalOrders', 'AvgBasketValue', 'CustomerTenure_Days']
+
+
+class CLVModel:
+    """
+    Linear CLV model: future revenue = intercept + features @ coef
+    
+    Fitted with np.linalg.lstsq (no iterations, no extra dependency), so
+    refitting on the whole customer base takes milliseconds.
+    
+    Example:
+    --------
+    >>> X, y = clv_training_set(df_clean, '2010-09-01', horizon_days=90)
+    >>> model = CLVModel().fit(X, y)
+    >>> predicted = model.predict(build_feature_matrix(customer_metrics, model.features))
+    """
+    
+    def __init__(self, features: Sequence[str] = None, horizon_days: int = 90):
+        """
+        Initialize an unfitted model
+        
+        Parameters:
+        -----------
+        features : list
+            Feature names, in matrix column order
+        horizon_days : int
+            Days of future revenue the model predicts (recorded with the model)
+        """
+        self.features = list(features or DEFAULT_CLV_FEATURES)
+        self.horizon_days = horizon_days
+        self.coef = None
+        self.intercept = 0.0
+        self.r_squared = None
+    
+    def fit(self, X: np.ndarray, y: np.ndarray) -> 'CLVModel':
+        """
+        Fit coefficients by ordinary least squares
+        
+        Parameters:
+        -----------
+        X : np.ndarray
+            Feature matrix from build_feature_matrix()
+        y : np.ndarray
+            Revenue in the horizon after the feature date
+        
+        Returns:
+        --------
+        CLVModel : self
+        """
+        y = np.asarray(y, dtype=np.float64)
+        design = np.hstack([np.ones((len(X), 1)), X.astype(np.float64)])
+        weights, _, _, _ = np.linalg.lstsq(design, y, rcond=None)
+        self.intercept, self.coef = float(weights[0]), weights[1:]
+        
+        residuals = y - design @ weights
+        total = ((y - y.mean()) ** 2).sum()
+        self.r_squared = float(1 - (residuals ** 2).sum() / total) if total > 0 else 0.0
+        logger.info(f"✅ CLV model fitted on {len(X):,} customers (R² = {self.r_squared:.3f})")
+        return self
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predicted revenue for every row in one matrix multiply
+        
+        Parameters:
+        -----------
+        X : np.ndarray
+            float32 feature matrix with the training feature columns
+        
+        Returns:
+        --------
+        np.ndarray : float32 predictions, floored at 0 (revenue cannot be negative)
+        """
+        if self.coef is None:
+            raise ValueError("CLV model is not fitted")
+        predicted = X @ self.coef.astype(X.dtype)
+        predicted += X.dtype.type(self.intercept)
+        return np.maximum(predicted, 0, out=predicted)
+    
+    def save(self, file_path: str) -> None:
+        """Save coefficients to an .npz file"""
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        np.savez(file_path, features=np.array(self.features), coef=self.coef, intercept=self.intercept,
+                 horizon_days=self.horizon_days, r_squared=self.r_squared)
+        logger.info(f"✅ CLV model saved: {file_path}")
+    
+    @classmethod
+    def load(cls, file_path: str) -> 'CLVModel':
+        """Load a model saved with save()"""
+        with np.load(file_path) as data:
+            model = cls(features=data['features'].tolist(), horizon_days=int(data['horizon_days']))
+            model.coef = data['coef']
+            model.intercept = float(data['intercept'])
+            model.r_squared = float(data['r_squared'])
+        return model
+
+
+def clv_training_set(df: pd.DataFrame, cutoff, horizon_days: int = 90,
+                     features: Sequence[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Features as of a past cutoff date and each customer's revenue after it
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned transactions
+    cutoff : str or Timestamp
+        Date the features are computed at; needs horizon_days of data after it
+    horizon_days : int
+        Days after the cutoff whose revenue is the target (0 if no purchase)
+    features : list
+        Feature columns (default: DEFAULT_CLV_FEATURES)
+    
+    Returns:
+    --------
+    tuple : (float32 feature matrix, float64 future revenue)
+    
+    Example:
+    --------
+    >>> X, y = clv_training_set(df_clean, '2010-09-01', horizon_days=90)
+    """
+    cutoff = pd.Timestamp(cutoff)
+    if 'TotalPrice' not in df.columns:
+        df = create_total_price(df.copy())
+    customer_metrics = create_customer_metrics(df[df['InvoiceDate'] < cutoff], analysis_date=str(cutoff))
+    
+    window = df[(df['InvoiceDate'] >= cutoff) & (df['InvoiceDate'] < cutoff + pd.Timedelta(days=horizon_days))]
+    future_revenue = window.groupby('CustomerID')['TotalPrice'].sum()
+    target = customer_metrics['CustomerID'].map(future_revenue).fillna(0.0).values
+    
+    logger.info(f"📊 CLV training set: {len(target):,} customers, "
+                f"mean {horizon_days}-day revenue {target.mean():,.2f}")
+    return build_feature_matrix(customer_metrics, features or DEFAULT_CLV_FEATURES), target
+
+
+def score_clv(customer_metrics: pd.DataFrame, model: CLVModel) -> pd.DataFrame:
+    """
+    Predicted future revenue for every customer
+    
+    Parameters:
+    -----------
+    customer_metrics : pd.DataFrame
+        Customer metrics from create_customer_metrics()
+    model : CLVModel
+        Fitted model
+    
+    Returns:
+    --------
+    pd.DataFrame : CustomerID, CustomerLifetimeValue (to date) and
+                   PredictedRevenue (next horizon_days)
+    
+    Example:
+    --------
+    >>> clv_scores = score_clv(customer_metrics, CLVModel.load('models/clv_model.npz'))
+    """
+    X = build_feature_matrix(customer_metrics, model.features)
+    scores = pd.DataFrame({
+        'CustomerID': customer_metrics['CustomerID'].values,
+        'CustomerLifetimeValue': customer_metrics['CustomerLifetimeValue'].values,
+        'PredictedRevenue': model.predict(X)
+    })
+    logger.info(f"✅ CLV forecast for {len(scores):,} customers "
+                f"(total {model.horizon_days}-day revenue {scores['PredictedRevenue'].sum():,.2f})")
+    return scores
+
+
+def clv_from_config(df: pd.DataFrame, customer_metrics: pd.DataFrame,
+                    config: Dict[str, Any]) -> Tuple[pd.DataFrame, Dict[str, float]]:
+    """
+    Fit, save and score the CLV model with config['model_params']['clv']
+    
+    The model is trained on features as of horizon_days before the last
+    transaction and saved as clv_model.npz under paths.output.models.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned transactions
+    customer_metrics : pd.DataFrame
+        Current customer metrics
+    config : dict
+        Configuration dictionary
+    
+    Returns:
+    --------
+    tuple : (CLV scores dataframe, model metrics dictionary)
+    """
+    clv_config = config.get('model_params', {}).get('clv', {})
+    algorithm = clv_config.get('algorithm', 'linear_regression')
+    if algorithm != 'linear_regression':
+        raise ValueError(f"Unsupported CLV algorithm: {algorithm}")
+    
+    features = clv_config.get('features', DEFAULT_CLV_FEATURES)
+    horizon_days = clv_config.get('horizon_days', 90)
+    cutoff = df['InvoiceDate'].max().normalize() - pd.Timedelta(days=horizon_days)
+    
+    X, y = clv_training_set(df, cutoff, horizon_days, features)
+    model = CLVModel(features, horizon_days).fit(X, y)
+    
+    models_dir = config.get('paths', {}).get('output', {}).get('models', 'models/')
+    model.save(str(Path(models_dir) / 'clv_model.npz'))
+    
+    return score_clv(customer_metrics, model), {'r_squared': model.r_squared}
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, load_data, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    df_clean = load_data(config['paths']['data']['cleaned'], parse_dates=['InvoiceDate'])
+    customer_metrics = load_data(config['paths']['data']['customer_metrics'])
+    
+    clv_scores, model_metrics = clv_from_config(df_clean, customer_metrics, config)
+    logger.info(f"Top predicted customers:\n{clv_scores.nlargest(10, 'PredictedRevenue')}")
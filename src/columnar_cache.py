@@ -0,0 +1,265 @@
+"""
+Columnar Cache for E-Commerce Data
+Stores a dataframe as one .npy file per column (strings dictionary-encoded)
+so it can be reopened with memory mapping instead of re-parsing the CSV
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import json
+import shutil
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from loguru import logger
+from typing import Dict, Any, List, Optional
+
+try:
+    from .utils import load_data, replace_directory, set_dataset_version, source_version
+except ImportError:
+    from utils import load_data, replace_directory, set_dataset_version, source_version
+
+MANIFEST_FILE = "manifest.json"
+CACHE_FORMAT_VERSION = 1
+
+
+def _source_signature(source_path: Optional[str]) -> Optional[Dict[str, int]]:
+    """Size and modification time of the source file, None if there is none"""
+    if source_path is None or not Path(source_path).exists():
+        return None
+    stat = Path(source_path).stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _column_file(index: int) -> str:
+    """File name for a column (by position, so any column name is safe)"""
+    return f"col_{index:03d}.npy"
+
+
+def save_columnar(df: pd.DataFrame, directory: str, source_path: str = None) -> None:
+    """
+    Write a dataframe as a columnar cache
+    
+    Numeric and boolean columns are stored as they are, datetimes as int64
+    nanoseconds, and all other columns (strings, categoricals) as int32
+    codes plus a JSON dictionary of their distinct values as text. The
+    directory is written next to its final location and swapped in, so
+    readers never see a partial cache.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataframe to cache (e.g. cleaned transactions)
+    directory : str
+        Cache directory (replaced if it exists)
+    source_path : str
+        File the data was read from; a cache is only reused while that file
+        is unchanged (optional)
+    
+    Example:
+    --------
+    >>> save_columnar(df_clean, 'data/cleaned_columnar', source_path='data/cleaned_data.csv')
+    """
+    directory = Path(directory)
+    temp_dir = directory.with_name(directory.name + '.tmp')
+    if temp_dir.exists():
+        shutil.rmtree(temp_dir)
+    temp_dir.mkdir(parents=True)
+    
+    columns = []
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        entry = {'name': column, 'file': _column_file(i)}
+        
+        if pd.api.types.is_datetime64_any_dtype(values) and getattr(values.dt, 'tz', None) is None:
+            array = values.values.astype('datetime64[ns]').view(np.int64)
+            entry['kind'] = 'datetime'
+        elif pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_extension_array_dtype(values):
+            array = values.values
+            entry['kind'] = 'numeric'
+        else:
+            # Dictionary-encode: int32 codes (-1 = missing) and the distinct values
+            categorical = isinstance(values.dtype, pd.CategoricalDtype)
+            if categorical:
+                codes, uniques = values.cat.codes.values, values.cat.categories
+            else:
+                try:
+                    codes, uniques = pd.factorize(values, sort=True)
+                except TypeError:
+                    # Mixed types cannot be sorted; dictionary order does not matter
+                    codes, uniques = pd.factorize(values)
+            array = codes.astype(np.int32)
+            entry['kind'] = 'dictionary'
+            entry['categorical'] = categorical
+            entry['ordered'] = bool(categorical and values.cat.ordered)
+            entry['dictionary'] = f"dict_{i:03d}.json"
+            with open(temp_dir / entry['dictionary'], 'w', encoding='utf-8') as f:
+                json.dump(pd.Index(uniques).astype(str).tolist(), f)
+        
+        entry['dtype'] = str(values.dtype)
+        np.save(temp_dir / entry['file'], np.ascontiguousarray(array))
+        columns.append(entry)
+    
+    manifest = {
+        'version': CACHE_FORMAT_VERSION,
+        'rows': len(df),
+        'columns': columns,
+        'source': _source_signature(source_path),
+    }
+    with open(temp_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    
+    replace_directory(temp_dir, directory)
+    
+    logger.info(f"✅ Columnar cache saved: {directory} ({len(df):,} rows × {len(columns)} columns)")
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """Manifest of a columnar cache, None if there is no valid cache"""
+    path = Path(directory) / MANIFEST_FILE
+    if not path.exists():
+        return None
+    with open(path, encoding='utf-8') as f:
+        manifest = json.load(f)
+    return manifest if manifest.get('version') == CACHE_FORMAT_VERSION else None
+
+
+def is_cache_fresh(directory: str, source_path: str) -> bool:
+    """
+    Check whether a cache was built from the current version of its source file
+    
+    Parameters:
+    -----------
+    directory : str
+        Cache directory
+    source_path : str
+        Source file the cache should mirror
+    
+    Returns:
+    --------
+    bool : True if the cache exists and the source size and mtime still match
+    """
+    manifest = read_manifest(directory)
+    signature = _source_signature(source_path)
+    return manifest is not None and signature is not None and manifest.get('source') == signature
+
+
+def load_columnar(directory: str, columns: List[str] = None, mmap: bool = True,
+                  categorical: bool = False) -> pd.DataFrame:
+    """
+    Open a columnar cache as a dataframe
+    
+    With mmap=True numeric columns are read-only views of the files: loading
+    costs almost nothing, pages are read on first access, and concurrent
+    processes share them through the page cache. Assigning new columns works
+    as usual; to modify values in place, load with mmap=False.
+    
+    Parameters:
+    -----------
+    directory : str
+        Cache directory written by save_columnar()
+    columns : list
+        Columns to load (None = all); other columns are never read
+    mmap : bool
+        Memory-map the column files instead of reading them into memory
+    categorical : bool
+        Return dictionary-encoded string columns as categoricals (no decoding
+        cost) instead of object columns as read from CSV
+    
+    Returns:
+    --------
+    pd.DataFrame : Cached data
+    
+    Example:
+    --------
+    >>> df = load_columnar('data/cleaned_columnar', columns=['InvoiceNo', 'TotalPrice'])
+    """
+    directory = Path(directory)
+    manifest = read_manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No columnar cache in {directory}")
+    
+    entries = manifest['columns']
+    if columns is not None:
+        by_name = {entry['name']: entry for entry in entries}
+        missing = [column for column in columns if column not in by_name]
+        if missing:
+            raise KeyError(f"Columns not in cache: {missing}")
+        entries = [by_name[column] for column in columns]
+    
+    data = {}
+    for entry in entries:
+        array = np.load(directory / entry['file'], mmap_mode='r' if mmap else None)
+        
+        if entry['kind'] == 'datetime':
+            data[entry['name']] = array.view('datetime64[ns]')
+        elif entry['kind'] == 'numeric':
+            data[entry['name']] = array
+        else:
+            with open(directory / entry['dictionary'], encoding='utf-8') as f:
+                dictionary = json.load(f)
+            codes = np.asarray(array)
+            if categorical or entry.get('categorical'):
+                data[entry['name']] = pd.Categorical.from_codes(
+                    codes, categories=dictionary, ordered=entry.get('ordered', False))
+            else:
+                # Missing values (code -1) map to the appended NaN slot
+                values = np.array(dictionary + [np.nan], dtype=object)
+                data[entry['name']] = values[codes]
+    
+    df = pd.DataFrame(data, copy=False)
+    logger.info(f"✅ Columnar cache loaded: {directory} ({len(df):,} rows × {len(df.columns)} columns)")
+    return df
+
+
+def load_cleaned_data(csv_path: str, cache_dir: str = None, **kwargs) -> pd.DataFrame:
+    """
+    Load cleaned transactions from the columnar cache, or from CSV if it is stale
+    
+    Reading the CSV refreshes the cache, so only the first load after the
+    pipeline writes new data pays the parsing cost.
+    
+    Parameters:
+    -----------
+    csv_path : str
+        Path of the cleaned data CSV
+    cache_dir : str
+        Columnar cache directory (None = next to the CSV, '<name>_columnar')
+    **kwargs : Additional arguments for load_columnar (columns, mmap, categorical)
+    
+    Returns:
+    --------
+    pd.DataFrame : Cleaned transactions with InvoiceDate parsed
+    
+    Example:
+    --------
+    >>> df_clean = load_cleaned_data(config['paths']['data']['cleaned'],
+    ...                              config['paths']['data']['columnar_cache'])
+    """
+    cache_dir = cache_dir or str(Path(csv_path).with_name(Path(csv_path).stem + '_columnar'))
+    
+    # Same version whichever way the data is read, for query caches
+    version = f"{source_version(csv_path)}|cleaned|{sorted(kwargs.items())!r}"
+    
+    if not is_cache_fresh(cache_dir, csv_path):
+        df = load_data(csv_path, parse_dates=['InvoiceDate'])
+        save_columnar(df, cache_dir, source_path=csv_path)
+        if not kwargs:
+            return set_dataset_version(df, version)
+    
+    return set_dataset_version(load_columnar(cache_dir, **kwargs), version)
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    # First call parses the CSV and writes the cache; later calls map the files
+    df_clean = load_cleaned_data(config['paths']['data']['cleaned'],
+                                 config['paths']['data']['columnar_cache'])
+    df_clean = load_cleaned_data(config['paths']['data']['cleaned'],
+                                 config['paths']['data']['columnar_cache'])
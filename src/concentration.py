@@ -0,0 +1,228 @@
+"""
+Revenue Concentration Analysis for E-Commerce Data
+Lorenz curves, Gini coefficients and Pareto (top-k%) revenue shares
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from loguru import logger
+from typing import Dict, Sequence
+
+# Above this many cut-points a full sort is cheaper than partitioning
+TOP_SHARE_FAST_PATH_MAX_CUTS = 4
+
+
+def _cut_sizes(n: int, fractions: Sequence[float]) -> np.ndarray:
+    """Number of top entities for each fraction (at least one when n > 0)"""
+    sizes = np.ceil(np.asarray(fractions, dtype=float) * n).astype(np.int64)
+    return np.clip(sizes, min(n, 1), n)
+
+
+def lorenz_curve(values: Sequence[float], points: int = None) -> pd.DataFrame:
+    """
+    Compute the Lorenz curve of a revenue distribution
+    
+    Parameters:
+    -----------
+    values : array-like
+        Revenue per entity (customer or product)
+    points : int
+        Resample the curve to this many evenly spaced points (None = one per entity)
+    
+    Returns:
+    --------
+    pd.DataFrame : EntityShare and RevenueShare columns, from poorest to richest
+    
+    Example:
+    --------
+    >>> curve = lorenz_curve(customer_metrics['CustomerLifetimeValue'], points=101)
+    """
+    values = np.sort(np.asarray(values, dtype=float))
+    n = len(values)
+    entity_share = np.arange(n + 1) / max(n, 1)
+    revenue_share = np.concatenate([[0.0], np.cumsum(values)]) / max(values.sum(), np.finfo(float).tiny)
+    
+    if points is not None:
+        grid = np.linspace(0, 1, points)
+        revenue_share = np.interp(grid, entity_share, revenue_share)
+        entity_share = grid
+    
+    return pd.DataFrame({'EntityShare': entity_share, 'RevenueShare': revenue_share})
+
+
+def gini_coefficient(values: Sequence[float]) -> float:
+    """
+    Compute the Gini coefficient of a revenue distribution
+    
+    Parameters:
+    -----------
+    values : array-like
+        Revenue per entity
+    
+    Returns:
+    --------
+    float : Gini coefficient (0 = perfectly equal, 1 = all revenue in one entity)
+    
+    Example:
+    --------
+    >>> gini_coefficient(product_metrics['TotalRevenue'])
+    """
+    values = np.sort(np.asarray(values, dtype=float))
+    return _gini_from_sorted(values)
+
+
+def _gini_from_sorted(values: np.ndarray) -> float:
+    """Gini coefficient from values sorted ascending"""
+    n = len(values)
+    total = values.sum()
+    if n == 0 or total == 0:
+        return 0.0
+    ranks = np.arange(1, n + 1)
+    return float(2 * np.dot(ranks, values) / (n * total) - (n + 1) / n)
+
+
+def top_shares(values: Sequence[float], fractions: Sequence[float] = (0.2,)) -> Dict[float, float]:
+    """
+    Share of total revenue held by the top fraction of entities
+    
+    With only a few cut-points the top entities are selected with
+    np.argpartition in O(n), and only those are sorted.
+    
+    Parameters:
+    -----------
+    values : array-like
+        Revenue per entity
+    fractions : sequence of float
+        Top fractions of entities (0.2 = top 20%)
+    
+    Returns:
+    --------
+    dict : Fraction → share of total revenue
+    
+    Example:
+    --------
+    >>> shares = top_shares(customer_metrics['CustomerLifetimeValue'], [0.01, 0.2])
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    total = values.sum()
+    if n == 0 or total == 0:
+        return {fraction: 0.0 for fraction in fractions}
+    
+    sizes = _cut_sizes(n, fractions)
+    
+    if len(sizes) <= TOP_SHARE_FAST_PATH_MAX_CUTS:
+        k = int(sizes.max())
+        top = values[np.argpartition(values, n - k)[n - k:]]
+        top_desc = np.sort(top)[::-1]
+    else:
+        top_desc = np.sort(values)[::-1]
+    
+    cumulative = np.cumsum(top_desc)
+    return {fraction: float(cumulative[size - 1] / total) for fraction, size in zip(fractions, sizes)}
+
+
+def concentration_metrics(values: Sequence[float], fractions: Sequence[float] = (0.01, 0.05, 0.1, 0.2),
+                          pareto_share: float = 0.8) -> Dict[str, float]:
+    """
+    Compute Gini coefficient, top-k% shares and Pareto point from one sort
+    
+    Parameters:
+    -----------
+    values : array-like
+        Revenue per entity
+    fractions : sequence of float
+        Top fractions of entities to report
+    pareto_share : float
+        Revenue share for the Pareto point (0.8 = the 80 in 80/20)
+    
+    Returns:
+    --------
+    dict : Concentration metrics
+    
+    Example:
+    --------
+    >>> concentration_metrics(product_metrics['TotalRevenue'])
+    """
+    values = np.sort(np.asarray(values, dtype=float))
+    n = len(values)
+    total = values.sum()
+    
+    metrics = {
+        'EntityCount': n,
+        'TotalRevenue': float(total),
+        'GiniCoefficient': _gini_from_sorted(values),
+    }
+    
+    # Descending cumulative revenue share serves every cut-point
+    cumulative_share = np.cumsum(values[::-1]) / total if total else np.zeros(n)
+    for fraction, size in zip(fractions, _cut_sizes(n, fractions)):
+        metrics[f'TopShare_{fraction * 100:g}Pct'] = float(cumulative_share[size - 1]) if n else 0.0
+    
+    # Smallest fraction of entities that reaches the Pareto revenue share
+    reached = np.searchsorted(cumulative_share, pareto_share - 1e-12) + 1
+    metrics[f'EntityShareFor{pareto_share * 100:g}PctRevenue'] = float(min(reached, n) / n) if n else 0.0
+    
+    return metrics
+
+
+def create_revenue_concentration(customer_metrics: pd.DataFrame, product_metrics: pd.DataFrame,
+                                 fractions: Sequence[float] = (0.01, 0.05, 0.1, 0.2),
+                                 pareto_share: float = 0.8) -> pd.DataFrame:
+    """
+    Create revenue concentration summary for customers and products
+    
+    Parameters:
+    -----------
+    customer_metrics : pd.DataFrame
+        Customer metrics with CustomerLifetimeValue
+    product_metrics : pd.DataFrame
+        Product metrics with TotalRevenue
+    fractions : sequence of float
+        Top fractions of entities to report
+    pareto_share : float
+        Revenue share for the Pareto point
+    
+    Returns:
+    --------
+    pd.DataFrame : One row per entity type
+    
+    Example:
+    --------
+    >>> revenue_concentration = create_revenue_concentration(customer_metrics, product_metrics)
+    """
+    logger.info("📊 Creating revenue concentration metrics...")
+    
+    rows = []
+    for entity, values in [
+        ('Customers', customer_metrics['CustomerLifetimeValue']),
+        ('Products', product_metrics['TotalRevenue'])
+    ]:
+        metrics = concentration_metrics(values.values, fractions, pareto_share)
+        rows.append({'Entity': entity, **metrics})
+    
+    concentration = pd.DataFrame(rows)
+    
+    for _, row in concentration.iterrows():
+        logger.info(f"   • {row['Entity']}: Gini {row['GiniCoefficient']:.3f}, "
+                    f"top 20% hold {row.get('TopShare_20Pct', np.nan) * 100:.1f}% of revenue")
+    logger.info("✅ Revenue concentration metrics created")
+    
+    return concentration
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging, load_data, save_data
+    
+    setup_logging()
+    config = load_config()
+    
+    customer_metrics = load_data(config['paths']['data']['customer_metrics'])
+    product_metrics = load_data(config['paths']['data']['product_metrics'])
+    
+    revenue_concentration = create_revenue_concentration(customer_metrics, product_metrics)
+    save_data(revenue_concentration, config['paths']['data']['revenue_concentration'])
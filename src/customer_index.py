@@ -0,0 +1,318 @@
+"""
+Customer 360 Index for E-Commerce Analysis
+CSR-style customer -> invoices index and customer -> metrics row lookup,
+persisted as .npy arrays that can be memory-mapped
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import json
+import shutil
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from loguru import logger
+from typing import Dict, Any, Optional
+
+try:
+    from .utils import replace_directory
+except ImportError:
+    from utils import replace_directory
+
+# Arrays making up a saved index, one .npy file each
+INDEX_ARRAYS = ['customer_ids', 'invoice_offsets', 'invoice_rows', 'metrics_rows']
+
+
+def _customer_ids(values: pd.Series):
+    """Row positions with a CustomerID, and the IDs as int64"""
+    values = pd.to_numeric(values, errors='coerce')
+    positions = np.flatnonzero(values.notna().values)
+    return positions, values.values[positions].astype(np.int64)
+
+
+class CustomerIndex:
+    """
+    Invoices and metrics row of every customer, found by binary search
+    
+    customer_ids holds the sorted distinct CustomerIDs. The invoices of the
+    i-th customer are invoice_rows[invoice_offsets[i]:invoice_offsets[i + 1]]
+    (row positions in invoice_metrics, in file order), and metrics_rows[i] is
+    the customer's row in customer_metrics (-1 if absent). A lookup is one
+    searchsorted plus a slice, independent of the number of invoices.
+    
+    Example:
+    --------
+    >>> index = CustomerIndex.build(invoice_metrics, customer_metrics)
+    >>> index.save('data/customer_index')
+    >>> index = CustomerIndex.load('data/customer_index')   # memory-mapped
+    >>> index.invoices_for(17850, invoice_metrics)
+    """
+    
+    def __init__(self, customer_ids: np.ndarray, invoice_offsets: np.ndarray,
+                 invoice_rows: np.ndarray, metrics_rows: np.ndarray,
+                 source_rows: Dict[str, int] = None):
+        """
+        Initialize the index from its arrays (use build() or load())
+        
+        Parameters:
+        -----------
+        customer_ids : np.ndarray
+            Sorted distinct CustomerIDs (int64)
+        invoice_offsets : np.ndarray
+            Start of each customer's invoices in invoice_rows, plus the end (int64)
+        invoice_rows : np.ndarray
+            invoice_metrics row positions grouped by customer (int64)
+        metrics_rows : np.ndarray
+            customer_metrics row position per customer, -1 if none (int64)
+        source_rows : dict
+            Row counts of the tables the index was built from
+        """
+        self.customer_ids = customer_ids
+        self.invoice_offsets = invoice_offsets
+        self.invoice_rows = invoice_rows
+        self.metrics_rows = metrics_rows
+        self.source_rows = source_rows or {}
+    
+    def __len__(self) -> int:
+        return len(self.customer_ids)
+    
+    @classmethod
+    def build(cls, invoice_metrics: pd.DataFrame, customer_metrics: pd.DataFrame = None,
+              customer_col: str = 'CustomerID') -> 'CustomerIndex':
+        """
+        Build the index with one stable sort of the invoices by customer
+        
+        Parameters:
+        -----------
+        invoice_metrics : pd.DataFrame
+            One row per invoice with a CustomerID column (guest invoices are skipped)
+        customer_metrics : pd.DataFrame
+            One row per customer (optional)
+        customer_col : str
+            Customer ID column name
+        
+        Returns:
+        --------
+        CustomerIndex : Index over both tables
+        """
+        invoice_positions, invoice_ids = _customer_ids(invoice_metrics[customer_col])
+        if customer_metrics is not None:
+            metric_positions, metric_ids = _customer_ids(customer_metrics[customer_col])
+        else:
+            metric_positions, metric_ids = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        
+        customer_ids = np.union1d(invoice_ids, metric_ids)
+        
+        # CSR layout: stable sort keeps each customer's invoices in file order
+        codes = np.searchsorted(customer_ids, invoice_ids)
+        order = np.argsort(codes, kind='stable')
+        invoice_rows = invoice_positions[order].astype(np.int64)
+        invoice_offsets = np.zeros(len(customer_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(customer_ids)), out=invoice_offsets[1:])
+        
+        metrics_rows = np.full(len(customer_ids), -1, dtype=np.int64)
+        metrics_rows[np.searchsorted(customer_ids, metric_ids)] = metric_positions
+        
+        source_rows = {
+            'invoice_metrics': len(invoice_metrics),
+            'customer_metrics': len(customer_metrics) if customer_metrics is not None else 0,
+        }
+        
+        logger.info(f"✅ Customer index built: {len(customer_ids):,} customers, "
+                    f"{len(invoice_rows):,} invoices")
+        
+        return cls(customer_ids, invoice_offsets, invoice_rows, metrics_rows, source_rows)
+    
+    def save(self, directory: str) -> None:
+        """
+        Write the index as one .npy file per array plus a manifest
+        
+        The directory is written next to its final location and swapped in
+        whole, so readers never mix arrays and manifest from different saves.
+        
+        Parameters:
+        -----------
+        directory : str
+            Output directory (replaced if it exists)
+        """
+        directory = Path(directory)
+        temp_dir = directory.with_name(directory.name + '.tmp')
+        if temp_dir.exists():
+            shutil.rmtree(temp_dir)
+        temp_dir.mkdir(parents=True)
+        
+        for name in INDEX_ARRAYS:
+            np.save(temp_dir / f"{name}.npy", getattr(self, name))
+        
+        manifest = {'customers': len(self), 'source_rows': self.source_rows}
+        (temp_dir / "manifest.json").write_text(json.dumps(manifest, indent=2))
+        
+        replace_directory(temp_dir, directory)
+        
+        logger.info(f"✅ Customer index saved: {directory}")
+    
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> 'CustomerIndex':
+        """
+        Load a saved index
+        
+        Parameters:
+        -----------
+        directory : str
+            Directory written by save()
+        mmap : bool
+            Memory-map the arrays (read-only, pages shared between processes)
+            instead of reading them into memory
+        
+        Returns:
+        --------
+        CustomerIndex : Loaded index
+        """
+        directory = Path(directory)
+        manifest = json.loads((directory / "manifest.json").read_text())
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode='r' if mmap else None)
+            for name in INDEX_ARRAYS
+        }
+        return cls(source_rows=manifest.get('source_rows', {}), **arrays)
+    
+    def check_source(self, invoice_metrics: pd.DataFrame = None,
+                     customer_metrics: pd.DataFrame = None) -> None:
+        """
+        Raise ValueError if the tables differ in size from those the index was built on
+        
+        Parameters:
+        -----------
+        invoice_metrics : pd.DataFrame
+            Invoice table the index will be used with (optional)
+        customer_metrics : pd.DataFrame
+            Customer table the index will be used with (optional)
+        """
+        for name, df in (('invoice_metrics', invoice_metrics), ('customer_metrics', customer_metrics)):
+            expected = self.source_rows.get(name)
+            if df is not None and expected is not None and len(df) != expected:
+                raise ValueError(
+                    f"Customer index is stale: built on {expected:,} {name} rows, got {len(df):,}"
+                )
+    
+    def position(self, customer_id) -> int:
+        """
+        Position of a customer in the index
+        
+        Parameters:
+        -----------
+        customer_id : int, float or str
+            Customer ID (17850, 17850.0 and '17850' are equivalent)
+        
+        Returns:
+        --------
+        int : Position, or -1 if the customer is unknown
+        """
+        try:
+            customer_id = int(float(customer_id))
+        except (TypeError, ValueError):
+            return -1
+        i = int(np.searchsorted(self.customer_ids, customer_id))
+        if i < len(self.customer_ids) and self.customer_ids[i] == customer_id:
+            return i
+        return -1
+    
+    def invoice_positions(self, customer_id) -> np.ndarray:
+        """Row positions of the customer's invoices in invoice_metrics"""
+        i = self.position(customer_id)
+        if i < 0:
+            return np.empty(0, dtype=np.int64)
+        return np.asarray(self.invoice_rows[self.invoice_offsets[i]:self.invoice_offsets[i + 1]])
+    
+    def invoices_for(self, customer_id, invoice_metrics: pd.DataFrame) -> pd.DataFrame:
+        """
+        All invoices of a customer
+        
+        Parameters:
+        -----------
+        customer_id : int, float or str
+            Customer ID
+        invoice_metrics : pd.DataFrame
+            Invoice table the index was built on
+        
+        Returns:
+        --------
+        pd.DataFrame : The customer's invoices (empty if unknown)
+        """
+        return invoice_metrics.iloc[self.invoice_positions(customer_id)]
+    
+    def profile(self, customer_id, customer_metrics: pd.DataFrame) -> Optional[pd.Series]:
+        """
+        The customer's row in customer_metrics
+        
+        Parameters:
+        -----------
+        customer_id : int, float or str
+            Customer ID
+        customer_metrics : pd.DataFrame
+            Customer table the index was built on
+        
+        Returns:
+        --------
+        pd.Series : Customer metrics, or None if the customer has no row
+        """
+        i = self.position(customer_id)
+        if i < 0 or self.metrics_rows[i] < 0:
+            return None
+        return customer_metrics.iloc[int(self.metrics_rows[i])]
+    
+    def invoice_counts(self) -> pd.Series:
+        """Number of invoices per customer, indexed by CustomerID"""
+        return pd.Series(np.diff(self.invoice_offsets), index=np.asarray(self.customer_ids),
+                         name='InvoiceCount')
+
+
+def customer_360(customer_id, index: CustomerIndex, customer_metrics: pd.DataFrame,
+                 invoice_metrics: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Profile and invoices of one customer
+    
+    Parameters:
+    -----------
+    customer_id : int, float or str
+        Customer ID
+    index : CustomerIndex
+        Index built on the two tables
+    customer_metrics : pd.DataFrame
+        Customer table
+    invoice_metrics : pd.DataFrame
+        Invoice table
+    
+    Returns:
+    --------
+    dict : 'profile' (Series or None) and 'invoices' (DataFrame)
+    
+    Example:
+    --------
+    >>> view = customer_360(17850, index, customer_metrics, invoice_metrics)
+    >>> view['profile']['CustomerLifetimeValue'], len(view['invoices'])
+    """
+    return {
+        'profile': index.profile(customer_id, customer_metrics),
+        'invoices': index.invoices_for(customer_id, invoice_metrics),
+    }
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging, load_data
+    
+    setup_logging()
+    config = load_config()
+    
+    invoice_metrics = load_data(config['paths']['data']['invoice_metrics'])
+    customer_metrics = load_data(config['paths']['data']['customer_metrics'])
+    
+    index = CustomerIndex.build(invoice_metrics, customer_metrics)
+    index.save(config['paths']['data']['customer_index'])
+    
+    index = CustomerIndex.load(config['paths']['data']['customer_index'])
+    index.check_source(invoice_metrics, customer_metrics)
+    view = customer_360(17850, index, customer_metrics, invoice_metrics)
+    logger.info(f"Customer 17850: {len(view['invoices']):,} invoices")
@@ -8,9 +8,52 @@ Date: December 18, 2024
 
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from loguru import logger
 from typing import Tuple, List, Dict, Any
 
+try:
+    from .utils import ensure_datetime
+    from .time_index import TimeIndexedView, is_sorted_by
+    from .deduplication import FingerprintStore, store_from_config
+except ImportError:
+    from utils import ensure_datetime
+    from time_index import TimeIndexedView, is_sorted_by
+    from deduplication import FingerprintStore, store_from_config
+
+# Rejection rule bits recorded in the quarantine file (one bit per rule)
+REJECT_CANCELLED = 1
+REJECT_MISSING_DESCRIPTION = 2
+REJECT_INVALID_QUANTITY = 4
+REJECT_INVALID_PRICE = 8
+REJECT_DUPLICATE = 16
+REJECT_INVALID_DATE = 32
+
+REJECTION_RULES = {
+    REJECT_CANCELLED: 'Cancelled',
+    REJECT_MISSING_DESCRIPTION: 'MissingDescription',
+    REJECT_INVALID_QUANTITY: 'InvalidQuantity',
+    REJECT_INVALID_PRICE: 'InvalidPrice',
+    REJECT_DUPLICATE: 'Duplicate',
+    REJECT_INVALID_DATE: 'InvalidDate',
+}
+
+
+def _cancelled_mask(df: pd.DataFrame, invoice_column: str, cancelled_prefix: str) -> pd.Series:
+    """Rows whose invoice number marks a cancellation"""
+    return df[invoice_column].astype(str).str.startswith(cancelled_prefix)
+
+
+def _invalid_quantity_mask(df: pd.DataFrame, quantity_column: str, min_quantity: int) -> pd.Series:
+    """Rows below the minimum quantity (missing quantities are invalid)"""
+    return ~(df[quantity_column] >= min_quantity)
+
+
+def _invalid_price_mask(df: pd.DataFrame, price_column: str,
+                        min_price: float, max_price: float) -> pd.Series:
+    """Rows outside the valid price range (missing prices are invalid)"""
+    return ~((df[price_column] >= min_price) & (df[price_column] <= max_price))
+
 
 def remove_cancelled_orders(df: pd.DataFrame, invoice_column: str = 'InvoiceNo',
                              cancelled_prefix: str = 'C') -> pd.DataFrame:
@@ -35,13 +78,14 @@ def remove_cancelled_orders(df: pd.DataFrame, invoice_column: str = 'InvoiceNo',
     >>> df_clean = remove_cancelled_orders(df)
     """
     original_rows = len(df)
-    cancelled_mask = df[invoice_column].astype(str).str.startswith(cancelled_prefix)
+    cancelled_mask = _cancelled_mask(df, invoice_column, cancelled_prefix)
     cancelled_count = cancelled_mask.sum()
     
     df_clean = df[~cancelled_mask].copy()
     
-    logger.info(f"🔍 Cancelled orders removed: {cancelled_count:,} ({cancelled_count/original_rows*100:.2f}%)")
-    logger.info(f"✅ Remaining rows: {len(df_clean):,}")
+    logger.info("🔍 Cancelled orders removed: {:,} ({:.2f}%)", cancelled_count,
+                cancelled_count / max(original_rows, 1) * 100)
+    logger.info("✅ Remaining rows: {:,}", len(df_clean))
     
     return df_clean
 
@@ -73,8 +117,9 @@ def remove_missing_values(df: pd.DataFrame, columns: List[str],
     df_clean = df.dropna(subset=columns, how=how).copy()
     
     removed = original_rows - len(df_clean)
-    logger.info(f"🔍 Rows with missing values removed: {removed:,} ({removed/original_rows*100:.2f}%)")
-    logger.info(f"✅ Remaining rows: {len(df_clean):,}")
+    logger.info("🔍 Rows with missing values removed: {:,} ({:.2f}%)", removed,
+                removed / max(original_rows, 1) * 100)
+    logger.info("✅ Remaining rows: {:,}", len(df_clean))
     
     return df_clean
 
@@ -103,16 +148,14 @@ def remove_invalid_quantities(df: pd.DataFrame, quantity_column: str = 'Quantity
     """
     original_rows = len(df)
     
-    negative = (df[quantity_column] < 0).sum()
-    zero = (df[quantity_column] == 0).sum()
-    
-    df_clean = df[df[quantity_column] >= min_quantity].copy()
+    df_clean = df[~_invalid_quantity_mask(df, quantity_column, min_quantity)].copy()
     
+    # Breakdown counts are only computed when INFO is enabled
     removed = original_rows - len(df_clean)
-    logger.info(f"🔍 Invalid quantities removed: {removed:,}")
-    logger.info(f"   • Negative: {negative:,}")
-    logger.info(f"   • Zero: {zero:,}")
-    logger.info(f"✅ Remaining rows: {len(df_clean):,}")
+    logger.info("🔍 Invalid quantities removed: {:,}", removed)
+    logger.opt(lazy=True).info("   • Negative: {:,}", lambda: (df[quantity_column] < 0).sum())
+    logger.opt(lazy=True).info("   • Zero: {:,}", lambda: (df[quantity_column] == 0).sum())
+    logger.info("✅ Remaining rows: {:,}", len(df_clean))
     
     return df_clean
 
@@ -143,26 +186,22 @@ def remove_invalid_prices(df: pd.DataFrame, price_column: str = 'UnitPrice',
     """
     original_rows = len(df)
     
-    negative = (df[price_column] < 0).sum()
-    zero = (df[price_column] == 0).sum()
-    too_high = (df[price_column] > max_price).sum()
-    
-    df_clean = df[
-        (df[price_column] >= min_price) & 
-        (df[price_column] <= max_price)
-    ].copy()
+    df_clean = df[~_invalid_price_mask(df, price_column, min_price, max_price)].copy()
     
+    # Breakdown counts are only computed when INFO is enabled
     removed = original_rows - len(df_clean)
-    logger.info(f"🔍 Invalid prices removed: {removed:,}")
-    logger.info(f"   • Negative: {negative:,}")
-    logger.info(f"   • Zero: {zero:,}")
-    logger.info(f"   • Too high (>${max_price}): {too_high:,}")
-    logger.info(f"✅ Remaining rows: {len(df_clean):,}")
+    logger.info("🔍 Invalid prices removed: {:,}", removed)
+    logger.opt(lazy=True).info("   • Negative: {:,}", lambda: (df[price_column] < 0).sum())
+    logger.opt(lazy=True).info("   • Zero: {:,}", lambda: (df[price_column] == 0).sum())
+    logger.opt(lazy=True).info("   • Too high (>${}): {:,}", lambda: max_price,
+                               lambda: (df[price_column] > max_price).sum())
+    logger.info("✅ Remaining rows: {:,}", len(df_clean))
     
     return df_clean
 
 
-def remove_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFrame:
+def remove_duplicates(df: pd.DataFrame, subset: List[str] = None,
+                      store: FingerprintStore = None) -> pd.DataFrame:
     """
     Remove duplicate rows
     
@@ -172,6 +211,9 @@ def remove_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFram
         Input dataframe
     subset : list
         List of columns to check for duplicates (None = all columns)
+    store : FingerprintStore
+        Fingerprints of rows loaded earlier (optional); rows already in the
+        store are removed too, and the new rows are added to it
     
     Returns:
     --------
@@ -182,12 +224,17 @@ def remove_duplicates(df: pd.DataFrame, subset: List[str] = None) -> pd.DataFram
     >>> df_clean = remove_duplicates(df)
     """
     original_rows = len(df)
-    duplicates = df.duplicated(subset=subset).sum()
     
-    df_clean = df.drop_duplicates(subset=subset).copy()
+    if store is not None:
+        df_clean = store.filter(df, subset).copy()
+        duplicates = original_rows - len(df_clean)
+    else:
+        duplicates = df.duplicated(subset=subset).sum()
+        df_clean = df.drop_duplicates(subset=subset).copy()
     
-    logger.info(f"🔍 Duplicate rows removed: {duplicates:,} ({duplicates/original_rows*100:.2f}%)")
-    logger.info(f"✅ Remaining rows: {len(df_clean):,}")
+    logger.info("🔍 Duplicate rows removed: {:,} ({:.2f}%)", duplicates,
+                duplicates / max(original_rows, 1) * 100)
+    logger.info("✅ Remaining rows: {:,}", len(df_clean))
     
     return df_clean
 
@@ -217,15 +264,15 @@ def convert_data_types(df: pd.DataFrame, type_mappings: Dict[str, str]) -> pd.Da
     for column, dtype in type_mappings.items():
         if column in df_clean.columns:
             try:
-                if dtype == 'datetime64':
-                    df_clean[column] = pd.to_datetime(df_clean[column])
+                if str(dtype).startswith('datetime64'):
+                    ensure_datetime(df_clean, column)
                 else:
                     df_clean[column] = df_clean[column].astype(dtype)
-                logger.info(f"✅ {column} converted to {dtype}")
+                logger.info("✅ {} converted to {}", column, dtype)
             except Exception as e:
-                logger.error(f"❌ Error converting {column} to {dtype}: {e}")
+                logger.error("❌ Error converting {} to {}: {}", column, dtype, e)
         else:
-            logger.warning(f"⚠️  Column not found: {column}")
+            logger.warning("⚠️  Column not found: {}", column)
     
     return df_clean
 
@@ -259,16 +306,25 @@ def standardize_column_names(df: pd.DataFrame, style: str = 'snake_case') -> pd.
     elif style == 'PascalCase':
         df_clean.columns = df_clean.columns.str.replace(' ', '')
     
-    logger.info(f"✅ Column names standardized to {style}")
+    logger.info("✅ Column names standardized to {}", style)
     
     return df_clean
 
 
 def filter_by_date_range(df: pd.DataFrame, date_column: str,
-                          start_date: str, end_date: str) -> pd.DataFrame:
+                          start_date: str, end_date: str,
+                          view: TimeIndexedView = None) -> pd.DataFrame:
     """
     Filter dataframe by date range
     
+    Frames already sorted by date are sliced with a binary search, which
+    still costs one O(n) pass to confirm the order. For repeated windows
+    over the same data, build a TimeIndexedView once and pass it as view:
+    the slice is then O(log n) plus the copy of the matching rows.
+    
+    The result is always a copy, never a view of df, so callers may modify
+    it freely.
+    
     Parameters:
     -----------
     df : pd.DataFrame
@@ -279,33 +335,46 @@ def filter_by_date_range(df: pd.DataFrame, date_column: str,
         Start date (YYYY-MM-DD)
     end_date : str
         End date (YYYY-MM-DD)
+    view : TimeIndexedView
+        Prebuilt view of df on date_column (None = check the order here)
     
     Returns:
     --------
-    pd.DataFrame : Filtered dataframe
+    pd.DataFrame : Filtered copy of the rows in range
     
     Example:
     --------
     >>> df_filtered = filter_by_date_range(df, 'InvoiceDate', '2009-12-01', '2010-12-09')
+    >>> view = TimeIndexedView(df, 'InvoiceDate')
+    >>> december = filter_by_date_range(view.df, 'InvoiceDate', '2010-12-01', '2010-12-31', view=view)
     """
     original_rows = len(df)
     
-    df[date_column] = pd.to_datetime(df[date_column])
-    df_filtered = df[
-        (df[date_column] >= start_date) & 
-        (df[date_column] <= end_date)
-    ].copy()
+    if view is not None:
+        if view.date_col != date_column or len(view) != original_rows:
+            raise ValueError(f"view is not an index of this frame on {date_column}")
+        df_filtered = view.slice(start_date, end_date).copy()
+    elif is_sorted_by(ensure_datetime(df, date_column), date_column):
+        # Monotonic implies no NaT, so the view skips counting missing dates
+        view = TimeIndexedView(df, date_column, assume_sorted=True)
+        df_filtered = view.slice(start_date, end_date).copy()
+    else:
+        df_filtered = df[
+            (df[date_column] >= start_date) & 
+            (df[date_column] <= end_date)
+        ].copy()
     
     removed = original_rows - len(df_filtered)
-    logger.info(f"🔍 Rows outside date range removed: {removed:,}")
-    logger.info(f"✅ Date range: {start_date} to {end_date}")
-    logger.info(f"✅ Remaining rows: {len(df_filtered):,}")
+    logger.info("🔍 Rows outside date range removed: {:,}", removed)
+    logger.info("✅ Date range: {} to {}", start_date, end_date)
+    logger.info("✅ Remaining rows: {:,}", len(df_filtered))
     
     return df_filtered
 
 
 def handle_outliers(df: pd.DataFrame, column: str, method: str = 'iqr',
-                     threshold: float = 1.5, action: str = 'keep') -> pd.DataFrame:
+                     threshold: float = 1.5, action: str = 'keep',
+                     bounds: Tuple[float, float] = None) -> pd.DataFrame:
     """
     Handle outliers in numeric column
     
@@ -321,6 +390,9 @@ def handle_outliers(df: pd.DataFrame, column: str, method: str = 'iqr',
         Threshold for outlier detection (1.5 for IQR, 3 for Z-score)
     action : str
         'keep', 'remove', or 'cap' (cap to threshold)
+    bounds : tuple
+        Precomputed (lower, upper) bounds, e.g. from compute_outlier_bounds()
+        over all chunks; when given, method and threshold are not used
     
     Returns:
     --------
@@ -333,59 +405,116 @@ def handle_outliers(df: pd.DataFrame, column: str, method: str = 'iqr',
     original_rows = len(df)
     df_clean = df.copy()
     
-    if method == 'iqr':
+    if bounds is not None:
+        lower_bound, upper_bound = bounds
+    elif method == 'iqr':
         Q1 = df_clean[column].quantile(0.25)
         Q3 = df_clean[column].quantile(0.75)
         IQR = Q3 - Q1
         lower_bound = Q1 - threshold * IQR
         upper_bound = Q3 + threshold * IQR
-        
-        outliers = ((df_clean[column] < lower_bound) | (df_clean[column] > upper_bound)).sum()
-        
-        if action == 'remove':
-            df_clean = df_clean[
-                (df_clean[column] >= lower_bound) & 
-                (df_clean[column] <= upper_bound)
-            ]
-        elif action == 'cap':
-            df_clean[column] = df_clean[column].clip(lower_bound, upper_bound)
-    
     elif method == 'zscore':
-        from scipy import stats
-        z_scores = np.abs(stats.zscore(df_clean[column].dropna()))
-        outliers = (z_scores > threshold).sum()
-        
-        if action == 'remove':
-            df_clean = df_clean[z_scores <= threshold]
-        elif action == 'cap':
-            # Cap at threshold z-score
-            mean = df_clean[column].mean()
-            std = df_clean[column].std()
-            lower_bound = mean - threshold * std
-            upper_bound = mean + threshold * std
-            df_clean[column] = df_clean[column].clip(lower_bound, upper_bound)
+        # Population std, as in scipy.stats.zscore
+        mean = df_clean[column].mean()
+        std = df_clean[column].std(ddof=0)
+        lower_bound = mean - threshold * std
+        upper_bound = mean + threshold * std
+    else:
+        raise ValueError(f"Unknown outlier method: {method}")
+    
+    within = df_clean[column].between(lower_bound, upper_bound)
+    outliers = (df_clean[column].notna() & ~within).sum()
+    
+    if action == 'remove':
+        df_clean = df_clean[within]
+    elif action == 'cap':
+        df_clean[column] = df_clean[column].clip(lower_bound, upper_bound)
     
     removed = original_rows - len(df_clean)
     
-    logger.info(f"🔍 Outliers detected in {column}: {outliers:,}")
-    logger.info(f"   Action: {action}")
+    logger.info("🔍 Outliers detected in {}: {:,}", column, outliers)
+    logger.info("   Action: {}", action)
     if action == 'remove':
-        logger.info(f"   Rows removed: {removed:,}")
-    logger.info(f"✅ Remaining rows: {len(df_clean):,}")
+        logger.info("   Rows removed: {:,}", removed)
+    logger.info("✅ Remaining rows: {:,}", len(df_clean))
     
     return df_clean
 
 
-def clean_ecommerce_data(df: pd.DataFrame, config: Dict[str, Any] = None) -> pd.DataFrame:
+def save_quarantine(file_path: str, row_index: np.ndarray, rule_mask: np.ndarray) -> None:
+    """
+    Save rejected rows as a compressed columnar .npz file
+    
+    Parameters:
+    -----------
+    file_path : str
+        Output file path (.npz)
+    row_index : np.ndarray
+        Position of each rejected row in the raw data
+    rule_mask : np.ndarray
+        Bitmask of the REJECT_* rules each row failed
+    
+    Example:
+    --------
+    >>> save_quarantine('data/quarantine.npz', row_index, rule_mask)
+    """
+    Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(
+        file_path,
+        row_index=np.asarray(row_index, dtype=np.int64),
+        rule_mask=np.asarray(rule_mask, dtype=np.uint8),
+        rule_bits=np.array(list(REJECTION_RULES), dtype=np.uint8),
+        rule_names=np.array(list(REJECTION_RULES.values()))
+    )
+    logger.info("✅ Quarantine saved: {} ({:,} rejected rows)", file_path, len(row_index))
+
+
+def load_quarantine(file_path: str) -> pd.DataFrame:
+    """
+    Load a quarantine file with one boolean column per rejection rule
+    
+    Parameters:
+    -----------
+    file_path : str
+        Quarantine file written by clean_ecommerce_data
+    
+    Returns:
+    --------
+    pd.DataFrame : RowIndex, RuleMask and one column per rule
+    
+    Example:
+    --------
+    >>> quarantine = load_quarantine('data/quarantine.npz')
+    >>> df_raw.iloc[quarantine.loc[quarantine['InvalidPrice'], 'RowIndex']]
+    """
+    with np.load(file_path) as data:
+        quarantine = pd.DataFrame({'RowIndex': data['row_index'], 'RuleMask': data['rule_mask']})
+        for bit, name in zip(data['rule_bits'], data['rule_names']):
+            quarantine[str(name)] = (quarantine['RuleMask'] & bit) > 0
+    
+    return quarantine
+
+
+def clean_ecommerce_data(df: pd.DataFrame, config: Dict[str, Any] = None,
+                         quarantine_path: str = None) -> pd.DataFrame:
     """
     Complete data cleaning pipeline for e-commerce data
     
+    Row-level rules are evaluated once against the raw data and combined
+    into a per-row bitmask, so every rule that rejects a row is known and
+    the frame is filtered in a single step.
+    
     Parameters:
     -----------
     df : pd.DataFrame
         Raw e-commerce dataframe
     config : dict
-        Configuration dictionary (optional)
+        Configuration dictionary (optional); with
+        data_params.deduplication.incremental set, rows loaded by earlier
+        runs are rejected as duplicates (see store_from_config)
+    quarantine_path : str
+        Where to save the raw position and rule bitmask of every rejected
+        row (optional, see load_quarantine)
     
     Returns:
     --------
@@ -393,32 +522,51 @@ def clean_ecommerce_data(df: pd.DataFrame, config: Dict[str, Any] = None) -> pd.
     
     Example:
     --------
-    >>> df_clean = clean_ecommerce_data(df_raw)
+    >>> df_clean = clean_ecommerce_data(df_raw, quarantine_path='data/quarantine.npz')
     """
     logger.info("\n" + "="*80)
     logger.info("STARTING DATA CLEANING PIPELINE")
     logger.info("="*80)
-    logger.info(f"Initial dataset: {len(df):,} rows × {len(df.columns)} columns\n")
-    
-    df_clean = df.copy()
-    
-    # Step 1: Remove cancelled orders
-    df_clean = remove_cancelled_orders(df_clean)
-    
-    # Step 2: Convert data types
-    df_clean = convert_data_types(df_clean, {'InvoiceDate': 'datetime64'})
-    
-    # Step 3: Remove missing descriptions
-    df_clean = remove_missing_values(df_clean, ['Description'])
-    
-    # Step 4: Remove invalid quantities
-    df_clean = remove_invalid_quantities(df_clean)
-    
-    # Step 5: Remove invalid prices
-    df_clean = remove_invalid_prices(df_clean)
-    
-    # Step 6: Remove duplicates
-    df_clean = remove_duplicates(df_clean)
+    logger.info("Initial dataset: {:,} rows × {} columns\n", len(df), len(df.columns))
+    
+    rule_mask = np.zeros(len(df), dtype=np.uint8)
+    
+    # Dates are parsed once up front so rows that fail to parse are rejected
+    dates = ensure_datetime(df[['InvoiceDate']].copy(), 'InvoiceDate')
+    
+    # Steps 1-4: Cancelled orders, missing descriptions, invalid quantities, prices and dates
+    row_rules = [
+        (REJECT_CANCELLED, _cancelled_mask(df, 'InvoiceNo', 'C')),
+        (REJECT_MISSING_DESCRIPTION, df['Description'].isna()),
+        (REJECT_INVALID_QUANTITY, _invalid_quantity_mask(df, 'Quantity', 1)),
+        (REJECT_INVALID_PRICE, _invalid_price_mask(df, 'UnitPrice', 0.01, 100000)),
+        (REJECT_INVALID_DATE, dates['InvoiceDate'].isna()),
+    ]
+    for bit, mask in row_rules:
+        mask = mask.values
+        rule_mask[mask] |= bit
+        logger.opt(lazy=True).info("🔍 {}: {:,} rows", lambda: REJECTION_RULES[bit], mask.sum)
+    
+    df_clean = df[rule_mask == 0].copy()
+    
+    # Step 5: Convert data types
+    df_clean['InvoiceDate'] = dates['InvoiceDate'].values[rule_mask == 0]
+    df_clean.attrs.update(dates.attrs)
+    
+    # Step 6: Remove duplicates among the remaining rows, and with incremental
+    # loads rows already loaded by earlier runs
+    store = store_from_config(config or {})
+    duplicated = df_clean.duplicated().values if store is None else ~store.new_rows(df_clean)
+    rule_mask[np.flatnonzero(rule_mask == 0)[duplicated]] |= REJECT_DUPLICATE
+    logger.opt(lazy=True).info("🔍 {}: {:,} rows", lambda: REJECTION_RULES[REJECT_DUPLICATE], duplicated.sum)
+    df_clean = df_clean[~duplicated]
+    
+    if store is not None:
+        store.save()
+    
+    if quarantine_path is not None:
+        rejected = np.flatnonzero(rule_mask)
+        save_quarantine(quarantine_path, rejected, rule_mask[rejected])
     
     # Summary
     original_rows = len(df)
@@ -429,10 +577,10 @@ def clean_ecommerce_data(df: pd.DataFrame, config: Dict[str, Any] = None) -> pd.
     logger.info("\n" + "="*80)
     logger.info("DATA CLEANING SUMMARY")
     logger.info("="*80)
-    logger.info(f"📊 Original dataset: {original_rows:,} rows")
-    logger.info(f"📊 Cleaned dataset: {final_rows:,} rows")
-    logger.info(f"📊 Rows removed: {removed:,} ({(removed/original_rows)*100:.2f}%)")
-    logger.info(f"📊 Data retention rate: {retention_rate:.2f}%")
+    logger.info("📊 Original dataset: {:,} rows", original_rows)
+    logger.info("📊 Cleaned dataset: {:,} rows", final_rows)
+    logger.info("📊 Rows removed: {:,} ({:.2f}%)", removed, removed / original_rows * 100)
+    logger.info("📊 Data retention rate: {:.2f}%", retention_rate)
     logger.info("="*80 + "\n")
     
     return df_clean
@@ -448,8 +596,8 @@ if __name__ == "__main__":
     # Load raw data
     df_raw = load_data(config['paths']['data']['raw'], encoding='latin1')
     
-    # Clean data
-    df_clean = clean_ecommerce_data(df_raw, config)
+    # Clean data, keeping a record of every rejected row
+    df_clean = clean_ecommerce_data(df_raw, config, quarantine_path=config['paths']['data']['quarantine'])
     
     # Save cleaned data
     from utils import save_data
@@ -0,0 +1,288 @@
+"""
+Streaming Deduplication for E-Commerce Data
+64-bit row fingerprints and a persistent set of seen rows across chunks and runs
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import os
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from loguru import logger
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from .utils import LogSummary
+except ImportError:
+    from utils import LogSummary
+
+# Unmerged sorted runs kept in memory before they are merged into one array
+MAX_PENDING_RUNS = 8
+
+
+def row_fingerprints(df: pd.DataFrame, columns: List[str] = None) -> np.ndarray:
+    """
+    Hash each row's key columns to a 64-bit fingerprint
+    
+    Key columns are first written as text in one canonical form (integral
+    numbers without a decimal part, other numbers by their shortest repr,
+    datetimes in ISO format), so a row hashes the same whatever dtype
+    read_csv inferred for its chunk: CustomerID 17850 as int64 or 17850.0
+    as float64, and InvoiceNo 536365 as int64 in a chunk without
+    cancellations or '536365' as text in one with them. With 64-bit hashes
+    the chance of any collision among 100 million rows is below 0.03%.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Input dataframe
+    columns : list
+        Key columns to hash (None = all columns)
+    
+    Returns:
+    --------
+    np.ndarray : uint64 fingerprint per row
+    
+    Example:
+    --------
+    >>> fingerprints = row_fingerprints(df, ['InvoiceNo', 'StockCode', 'Quantity'])
+    """
+    keys = df if columns is None else df[columns]
+    canonical = pd.DataFrame({column: _canonical_column(keys[column]) for column in keys.columns})
+    return pd.util.hash_pandas_object(canonical, index=False).values
+
+
+def _canonical_column(values: pd.Series) -> pd.Series:
+    """Column as text in a dtype-independent form for hashing (missing values stay missing)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        text = np.datetime_as_string(values.values.astype('datetime64[ns]'))
+    elif pd.api.types.is_float_dtype(values):
+        numbers = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        integral = np.isfinite(numbers) & (numbers == np.trunc(numbers)) & (np.abs(numbers) < 2 ** 63)
+        text = values.to_numpy().astype(str).astype(object)
+        text[integral] = numbers[integral].astype(np.int64).astype(str)
+    else:
+        text = values.astype(str).values
+    return pd.Series(text, index=values.index, dtype=object).mask(values.isna().values)
+
+
+class FingerprintStore:
+    """
+    Persistent set of seen row fingerprints
+    
+    Fingerprints are kept as sorted uint64 arrays and looked up with binary
+    search. New fingerprints go into small sorted runs that are merged once
+    there are more than MAX_PENDING_RUNS of them, so adding a chunk does not
+    rewrite the whole set. On disk the set is a single sorted .npy file.
+    
+    Example:
+    --------
+    >>> store = FingerprintStore('data/fingerprints.npy')
+    >>> for chunk in pd.read_csv(path, chunksize=100_000):
+    ...     new_rows = store.filter(chunk)
+    >>> store.save()
+    """
+    
+    def __init__(self, file_path: str = None):
+        """
+        Initialize the store, loading previously seen fingerprints if the file exists
+        
+        Parameters:
+        -----------
+        file_path : str
+            Path of the .npy file (None = in-memory only)
+        """
+        self.file_path = file_path
+        self._runs = []
+        
+        if file_path is not None and Path(file_path).exists():
+            self._runs.append(np.load(file_path))
+            logger.info(f"✅ Fingerprints loaded: {file_path} ({len(self):,} rows seen)")
+    
+    def __len__(self) -> int:
+        return sum(len(run) for run in self._runs)
+    
+    def _compact(self) -> np.ndarray:
+        """Merge all runs into one sorted array"""
+        if len(self._runs) > 1:
+            self._runs = [np.sort(np.concatenate(self._runs))]
+        return self._runs[0] if self._runs else np.empty(0, dtype=np.uint64)
+    
+    def contains(self, fingerprints: np.ndarray) -> np.ndarray:
+        """
+        Check which fingerprints have been seen
+        
+        Parameters:
+        -----------
+        fingerprints : np.ndarray
+            uint64 fingerprints
+        
+        Returns:
+        --------
+        np.ndarray : Boolean array, True where the fingerprint is in the store
+        """
+        seen = np.zeros(len(fingerprints), dtype=bool)
+        for run in self._runs:
+            positions = np.searchsorted(run, fingerprints)
+            found = positions < len(run)
+            found[found] = run[positions[found]] == fingerprints[found]
+            seen |= found
+        return seen
+    
+    def add(self, fingerprints: np.ndarray) -> None:
+        """
+        Add fingerprints that are not yet in the store
+        
+        Parameters:
+        -----------
+        fingerprints : np.ndarray
+            uint64 fingerprints, unique and not already seen
+        """
+        if len(fingerprints) == 0:
+            return
+        self._runs.append(np.sort(np.asarray(fingerprints, dtype=np.uint64)))
+        if len(self._runs) > MAX_PENDING_RUNS:
+            self._compact()
+    
+    def new_rows(self, df: pd.DataFrame, columns: List[str] = None) -> np.ndarray:
+        """
+        Mark rows not seen before and add their fingerprints to the store
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Chunk of data
+        columns : list
+            Key columns to hash (None = all columns)
+        
+        Returns:
+        --------
+        np.ndarray : Boolean array, True for the first occurrence of each
+                     row not seen in earlier chunks or runs
+        """
+        fingerprints = row_fingerprints(df, columns)
+        
+        # First occurrence within the chunk, then check against the store
+        _, first = np.unique(fingerprints, return_index=True)
+        keep = np.zeros(len(df), dtype=bool)
+        keep[first] = True
+        keep[keep] = ~self.contains(fingerprints[keep])
+        
+        self.add(fingerprints[keep])
+        return keep
+    
+    def filter(self, df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Drop rows seen before (in this chunk, earlier chunks or earlier runs)
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Chunk of data
+        columns : list
+            Key columns to hash (None = all columns)
+        
+        Returns:
+        --------
+        pd.DataFrame : Rows not seen before; their fingerprints are added to the store
+        """
+        return df[self.new_rows(df, columns)]
+    
+    def save(self, file_path: str = None) -> None:
+        """
+        Write the store as one sorted .npy file
+        
+        The file is written next to the target and renamed into place, so an
+        interrupted run never leaves a truncated store behind.
+        
+        Parameters:
+        -----------
+        file_path : str
+            Output path (None = the path the store was opened with)
+        """
+        file_path = file_path or self.file_path
+        if file_path is None:
+            raise ValueError("No file path given for the fingerprint store")
+        
+        fingerprints = self._compact()
+        Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+        temp_path = f"{file_path}.tmp.npy"
+        np.save(temp_path, fingerprints)
+        os.replace(temp_path, file_path)
+        
+        logger.info(f"✅ Fingerprints saved: {file_path} ({len(fingerprints):,} rows seen)")
+
+
+def store_from_config(config: Dict[str, Any]) -> Optional[FingerprintStore]:
+    """
+    Fingerprint store for incremental loads, from the configuration
+    
+    Enabled by data_params.deduplication.incremental; the store lives at
+    paths.data.fingerprints. Leave it off when rebuilding from the full raw
+    file, since every row of a reloaded file was seen by the previous run.
+    
+    Parameters:
+    -----------
+    config : dict
+        Configuration dictionary
+    
+    Returns:
+    --------
+    FingerprintStore or None : Store loaded from disk, or None when disabled
+    """
+    dedup_config = config.get('data_params', {}).get('deduplication', {})
+    if not dedup_config.get('incremental', False):
+        return None
+    return FingerprintStore(config['paths']['data']['fingerprints'])
+
+
+def deduplicate_chunks(chunks: Iterable[pd.DataFrame], store: FingerprintStore = None,
+                       columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Remove duplicate rows from a stream of chunks
+    
+    Parameters:
+    -----------
+    chunks : iterable of pd.DataFrame
+        Chunks of data, e.g. pd.read_csv(..., chunksize=100_000)
+    store : FingerprintStore
+        Store of rows already seen, e.g. loaded from a previous run (None = new in-memory store)
+    columns : list
+        Key columns to hash (None = all columns)
+    
+    Returns:
+    --------
+    iterator : Chunks with duplicates removed
+    
+    Example:
+    --------
+    >>> store = FingerprintStore('data/fingerprints.npy')
+    >>> df_new = pd.concat(deduplicate_chunks(chunks, store))
+    >>> store.save()
+    """
+    store = store if store is not None else FingerprintStore()
+    
+    # One summary line for the whole stream instead of one per chunk
+    with LogSummary("Deduplicated chunks") as summary:
+        for chunk in chunks:
+            deduplicated = store.filter(chunk, columns)
+            summary.add(rows=len(chunk), removed=len(chunk) - len(deduplicated))
+            yield deduplicated
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    # Only rows not loaded by an earlier run are kept
+    store = FingerprintStore(config['paths']['data']['fingerprints'])
+    chunks = pd.read_csv(config['paths']['data']['raw'], encoding='latin1', chunksize=100_000)
+    df_new = pd.concat(deduplicate_chunks(chunks, store))
+    
+    logger.info(f"New rows in this load: {len(df_new):,}")
+    store.save()
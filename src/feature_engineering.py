@@ -9,7 +9,16 @@ Date: December 18, 2024
 import pandas as pd
 import numpy as np
 from loguru import logger
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, List, Tuple
+
+try:
+    from .utils import ensure_datetime
+except ImportError:
+    from utils import ensure_datetime
+
+# Customer segments, best first, and the minimum R + F + M score for each
+CUSTOMER_SEGMENTS = ['Champions', 'Loyal Customers', 'Potential Loyalists', 'At Risk', 'Lost Customers']
+SEGMENT_MIN_SCORES = [13, 10, 7, 5, 0]
 
 
 def create_total_price(df: pd.DataFrame, quantity_col: str = 'Quantity',
@@ -35,14 +44,86 @@ def create_total_price(df: pd.DataFrame, quantity_col: str = 'Quantity',
     >>> df = create_total_price(df)
     """
     df['TotalPrice'] = df[quantity_col] * df[price_col]
-    logger.info(f"✅ Created TotalPrice column")
+    logger.info("✅ Created TotalPrice column")
     return df
 
 
+NS_PER_HOUR = 3_600_000_000_000
+NS_PER_DAY = 24 * NS_PER_HOUR
+
+
+def compute_date_parts(dates: pd.Series) -> Dict[str, np.ndarray]:
+    """
+    Derive calendar components from datetime64 values with integer arithmetic
+    
+    Works directly on the int64 nanosecond epoch values in one vectorized
+    pass (days-to-civil conversion), avoiding per-component ``.dt`` accessors
+    and Period objects. Missing timestamps yield NaN in every component.
+    
+    Parameters:
+    -----------
+    dates : pd.Series
+        Datetime64 series (timezone-naive)
+    
+    Returns:
+    --------
+    dict : 'year', 'month', 'day', 'dayofweek' (Monday=0), 'hour', 'quarter'
+           and 'month_index' (year * 12 + month - 1, int32)
+    
+    Example:
+    --------
+    >>> parts = compute_date_parts(df['InvoiceDate'])
+    >>> parts['month_index'][:3]
+    """
+    nanos = dates.values.astype('datetime64[ns]').view(np.int64)
+    missing = dates.isna().values
+    
+    days = nanos // NS_PER_DAY
+    hour = (nanos // NS_PER_HOUR) % 24
+    dayofweek = (days + 3) % 7  # 1970-01-01 was a Thursday
+    
+    # Civil date from day count (proleptic Gregorian, eras of 400 years)
+    shifted = days + 719468
+    era = shifted // 146097
+    day_of_era = shifted - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_from_march = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_from_march + 2) // 5 + 1
+    month = np.where(month_from_march < 10, month_from_march + 3, month_from_march - 9)
+    year = year_of_era + era * 400 + (month <= 2)
+    
+    parts = {
+        'year': year.astype(np.int32),
+        'month': month.astype(np.int32),
+        'day': day.astype(np.int32),
+        'dayofweek': dayofweek.astype(np.int32),
+        'hour': hour.astype(np.int32),
+        'quarter': ((month - 1) // 3 + 1).astype(np.int32),
+        'month_index': (year * 12 + month - 1).astype(np.int32),
+    }
+    
+    if missing.any():
+        for name, values in parts.items():
+            values = values.astype(float)
+            values[missing] = np.nan
+            parts[name] = values
+    
+    return parts
+
+
+def month_labels(month_index: np.ndarray) -> List[str]:
+    """Format integer month indices (year * 12 + month - 1) as 'YYYY-MM' labels"""
+    return [f"{m // 12:04d}-{m % 12 + 1:02d}" for m in np.asarray(month_index, dtype=np.int64)]
+
+
 def extract_date_features(df: pd.DataFrame, date_col: str = 'InvoiceDate') -> pd.DataFrame:
     """
     Extract date components from datetime column
     
+    YearMonth is stored as a categorical of 'YYYY-MM' labels and MonthIndex
+    as a compact int32 month number, instead of Period objects.
+    
     Parameters:
     -----------
     df : pd.DataFrame
@@ -58,16 +139,32 @@ def extract_date_features(df: pd.DataFrame, date_col: str = 'InvoiceDate') -> pd
     --------
     >>> df = extract_date_features(df)
     """
-    df[date_col] = pd.to_datetime(df[date_col])
-    
-    df['Year'] = df[date_col].dt.year
-    df['Month'] = df[date_col].dt.month
-    df['Day'] = df[date_col].dt.day
-    df['DayOfWeek'] = df[date_col].dt.dayofweek  # Monday=0, Sunday=6
-    df['Hour'] = df[date_col].dt.hour
-    df['YearMonth'] = df[date_col].dt.to_period('M')
+    ensure_datetime(df, date_col)
+    
+    parts = compute_date_parts(df[date_col])
+    
+    df['Year'] = parts['year']
+    df['Month'] = parts['month']
+    df['Day'] = parts['day']
+    df['DayOfWeek'] = parts['dayofweek']  # Monday=0, Sunday=6
+    df['Hour'] = parts['hour']
+    df['Quarter'] = parts['quarter']
+    df['MonthIndex'] = parts['month_index']
+    
+    # Categorical 'YYYY-MM' labels over the observed month range
+    month_index = parts['month_index']
+    valid = ~np.isnan(month_index) if month_index.dtype.kind == 'f' else np.ones(len(month_index), dtype=bool)
+    if valid.any():
+        first_month = int(month_index[valid].min())
+        last_month = int(month_index[valid].max())
+        codes = np.where(valid, month_index - first_month, -1).astype(np.int32)
+        categories = month_labels(np.arange(first_month, last_month + 1))
+    else:
+        codes = np.full(len(month_index), -1, dtype=np.int32)
+        categories = []
+    df['YearMonth'] = pd.Categorical.from_codes(codes, categories=categories, ordered=True)
     
-    logger.info(f"✅ Extracted date features: Year, Month, Day, DayOfWeek, Hour, YearMonth")
+    logger.info("✅ Extracted date features: Year, Month, Day, DayOfWeek, Hour, Quarter, MonthIndex, YearMonth")
     return df
 
 
@@ -95,7 +192,7 @@ def create_customer_metrics(df: pd.DataFrame, analysis_date: str = None) -> pd.D
     else:
         analysis_date = pd.to_datetime(analysis_date)
     
-    logger.info(f"📊 Creating customer metrics (Analysis date: {analysis_date.date()})")
+    logger.opt(lazy=True).info("📊 Creating customer metrics (Analysis date: {})", lambda: analysis_date.date())
     
     # Aggregate by customer
     customer_agg = df.groupby('CustomerID').agg({
@@ -129,7 +226,7 @@ def create_customer_metrics(df: pd.DataFrame, analysis_date: str = None) -> pd.D
         (customer_agg['CustomerTenure_Days'] + 1) / 30
     )
     
-    logger.info(f"✅ Created customer metrics for {len(customer_agg):,} customers")
+    logger.info("✅ Created customer metrics for {:,} customers", len(customer_agg))
     
     return customer_agg
 
@@ -186,6 +283,25 @@ def create_rfm_scores(customer_metrics: pd.DataFrame) -> pd.DataFrame:
     return customer_metrics
 
 
+def segment_codes(r_score, f_score, m_score) -> np.ndarray:
+    """
+    Segment of each customer as a position in CUSTOMER_SEGMENTS
+    
+    Parameters:
+    -----------
+    r_score, f_score, m_score : array-like
+        RFM scores (1-5)
+    
+    Returns:
+    --------
+    np.ndarray : int8 codes (0 = Champions ... 4 = Lost Customers)
+    """
+    score = np.asarray(r_score) + np.asarray(f_score) + np.asarray(m_score)
+    # Thresholds are descending, so count how many are above the score
+    thresholds = np.asarray(SEGMENT_MIN_SCORES[::-1])
+    return (len(thresholds) - np.searchsorted(thresholds, score, side='right')).astype(np.int8)
+
+
 def create_customer_segments(customer_metrics: pd.DataFrame) -> pd.DataFrame:
     """
     Classify customers into business segments based on RFM scores
@@ -203,25 +319,13 @@ def create_customer_segments(customer_metrics: pd.DataFrame) -> pd.DataFrame:
     --------
     >>> customer_metrics = create_customer_segments(customer_metrics)
     """
-    def classify_rfm(row):
-        score = row['R_Score'] + row['F_Score'] + row['M_Score']
-        if score >= 13:
-            return 'Champions'
-        elif score >= 10:
-            return 'Loyal Customers'
-        elif score >= 7:
-            return 'Potential Loyalists'
-        elif score >= 5:
-            return 'At Risk'
-        else:
-            return 'Lost Customers'
-    
-    customer_metrics['CustomerSegment'] = customer_metrics.apply(classify_rfm, axis=1)
+    codes = segment_codes(customer_metrics['R_Score'], customer_metrics['F_Score'], customer_metrics['M_Score'])
+    customer_metrics['CustomerSegment'] = np.array(CUSTOMER_SEGMENTS, dtype=object)[codes]
     
     segment_counts = customer_metrics['CustomerSegment'].value_counts()
     logger.info("✅ Customer segmentation complete:")
     for segment, count in segment_counts.items():
-        logger.info(f"   • {segment}: {count:,} ({count/len(customer_metrics)*100:.1f}%)")
+        logger.info("   • {}: {:,} ({:.1f}%)", segment, count, count / len(customer_metrics) * 100)
     
     return customer_metrics
 
@@ -263,7 +367,7 @@ def create_product_metrics(df: pd.DataFrame) -> pd.DataFrame:
     # Sort by revenue
     product_agg = product_agg.sort_values('TotalRevenue', ascending=False).reset_index(drop=True)
     
-    logger.info(f"✅ Created metrics for {len(product_agg):,} products")
+    logger.info("✅ Created metrics for {:,} products", len(product_agg))
     
     return product_agg
 
@@ -287,22 +391,162 @@ def create_monthly_revenue(df: pd.DataFrame) -> pd.DataFrame:
     """
     logger.info("📊 Creating monthly revenue metrics...")
     
-    monthly_agg = df.groupby(df['InvoiceDate'].dt.to_period('M')).agg({
+    if 'MonthIndex' in df.columns:
+        month_index = df['MonthIndex']
+    else:
+        month_index = pd.Series(compute_date_parts(df['InvoiceDate'])['month_index'], index=df.index)
+    
+    monthly_agg = df.groupby(month_index.rename('MonthIndex')).agg({
         'TotalPrice': 'sum',
         'InvoiceNo': 'nunique',
         'CustomerID': 'nunique'
     }).reset_index()
     
     monthly_agg.columns = ['YearMonth', 'MonthlyRevenue', 'MonthlyOrders', 'MonthlyCustomers']
+    monthly_agg['YearMonth'] = month_labels(monthly_agg['YearMonth'].values)
     
     # Calculate month-over-month growth
     monthly_agg['RevenueGrowth_Pct'] = monthly_agg['MonthlyRevenue'].pct_change() * 100
     
-    logger.info(f"✅ Created monthly metrics for {len(monthly_agg)} months")
+    logger.info("✅ Created monthly metrics for {} months", len(monthly_agg))
     
     return monthly_agg
 
 
+def _aggregate_daily(df: pd.DataFrame, date_col: str = 'InvoiceDate') -> pd.DataFrame:
+    """Bucket transactions into days and sum revenue / count distinct invoices per day"""
+    days = df[date_col].values.astype('datetime64[D]').astype(np.int64)
+    if len(days) == 0:
+        return pd.DataFrame({
+            'Date': pd.Series(dtype='datetime64[ns]'),
+            'DailyRevenue': pd.Series(dtype=float),
+            'DailyOrders': pd.Series(dtype=np.int64)
+        })
+    
+    first_day = days.min()
+    day_codes = days - first_day
+    n_days = int(day_codes.max()) + 1
+    
+    revenue = np.bincount(day_codes, weights=df['TotalPrice'].values, minlength=n_days)
+    
+    # Each invoice counts once per day it appears on
+    invoice_codes, invoices = pd.factorize(df['InvoiceNo'])
+    invoice_days = np.unique(invoice_codes.astype(np.int64) * n_days + day_codes) % n_days
+    orders = np.bincount(invoice_days, minlength=n_days)
+    
+    # Keep trading days only, matching the SQL daily revenue query
+    active = orders > 0
+    return pd.DataFrame({
+        'Date': (np.flatnonzero(active) + first_day).astype('datetime64[D]').astype('datetime64[ns]'),
+        'DailyRevenue': revenue[active],
+        'DailyOrders': orders[active]
+    })
+
+
+def _add_moving_averages(daily: pd.DataFrame, windows: Tuple[int, ...], start: int = 0) -> pd.DataFrame:
+    """Fill trailing moving averages from row ``start`` onward using cumulative-sum windows"""
+    revenue = daily['DailyRevenue'].values
+    
+    for window in windows:
+        column = f'MovingAvg_{window}Day'
+        if column not in daily.columns:
+            daily[column] = np.nan
+        
+        # Rows before ``start`` are unchanged; only need window - 1 rows of context
+        context = max(start - window + 1, 0)
+        cumulative = np.concatenate([[0.0], np.cumsum(revenue[context:])])
+        positions = np.arange(start, len(revenue)) - context + 1
+        lower = np.maximum(positions - window, 0)
+        
+        # Partial windows at the start of the series average what is available
+        values = (cumulative[positions] - cumulative[lower]) / (positions - lower)
+        daily.iloc[start:, daily.columns.get_loc(column)] = values
+    
+    return daily
+
+
+def create_daily_revenue(df: pd.DataFrame, date_col: str = 'InvoiceDate',
+                         windows: Tuple[int, ...] = (7, 30)) -> pd.DataFrame:
+    """
+    Create daily revenue time series with trailing moving averages
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    date_col : str
+        Date column name
+    windows : tuple
+        Moving average window lengths in trading days
+    
+    Returns:
+    --------
+    pd.DataFrame : Daily revenue dataframe
+    
+    Example:
+    --------
+    >>> daily_revenue = create_daily_revenue(df)
+    """
+    logger.info("📊 Creating daily revenue metrics...")
+    
+    daily_agg = _aggregate_daily(df, date_col)
+    daily_agg = _add_moving_averages(daily_agg, windows)
+    
+    logger.info("✅ Created daily metrics for {} days", len(daily_agg))
+    
+    return daily_agg
+
+
+def update_daily_revenue(daily_revenue: pd.DataFrame, df_new: pd.DataFrame,
+                         date_col: str = 'InvoiceDate',
+                         windows: Tuple[int, ...] = (7, 30)) -> pd.DataFrame:
+    """
+    Append new transactions to an existing daily revenue series
+    
+    Only the new transactions are aggregated, and moving averages are
+    recomputed from the first affected day onward. New transactions are
+    assumed to belong to invoices not already counted.
+    
+    Parameters:
+    -----------
+    daily_revenue : pd.DataFrame
+        Output of create_daily_revenue
+    df_new : pd.DataFrame
+        New transactions (with TotalPrice)
+    date_col : str
+        Date column name
+    windows : tuple
+        Moving average window lengths in trading days
+    
+    Returns:
+    --------
+    pd.DataFrame : Updated daily revenue dataframe
+    
+    Example:
+    --------
+    >>> daily_revenue = update_daily_revenue(daily_revenue, df_today)
+    """
+    new_daily = _aggregate_daily(df_new, date_col)
+    if len(new_daily) == 0:
+        return daily_revenue
+    
+    base = daily_revenue[['Date', 'DailyRevenue', 'DailyOrders']]
+    unchanged = base['Date'] < new_daily['Date'].min()
+    
+    # Merge only the days that overlap with or follow the new data
+    tail = (
+        pd.concat([base[~unchanged], new_daily])
+        .groupby('Date', as_index=False)
+        .sum()
+    )
+    updated = pd.concat([daily_revenue[unchanged], tail], ignore_index=True)
+    updated = _add_moving_averages(updated, windows, start=int(unchanged.sum()))
+    
+    logger.info("✅ Daily revenue updated: {} days from {:,} new transactions", len(new_daily), len(df_new))
+    
+    return updated
+
+
 def create_country_metrics(df: pd.DataFrame) -> pd.DataFrame:
     """
     Create country-level revenue metrics
@@ -337,7 +581,7 @@ def create_country_metrics(df: pd.DataFrame) -> pd.DataFrame:
     # Sort by revenue
     country_agg = country_agg.sort_values('TotalRevenue', ascending=False).reset_index(drop=True)
     
-    logger.info(f"✅ Created metrics for {len(country_agg)} countries")
+    logger.info("✅ Created metrics for {} countries", len(country_agg))
     
     return country_agg
 
@@ -375,11 +619,161 @@ def create_invoice_metrics(df: pd.DataFrame) -> pd.DataFrame:
         'CustomerID', 'Country', 'InvoiceDate'
     ]
     
-    logger.info(f"✅ Created metrics for {len(invoice_agg):,} invoices")
+    logger.info("✅ Created metrics for {:,} invoices", len(invoice_agg))
     
     return invoice_agg
 
 
+def create_cohort_retention(df: pd.DataFrame, customer_col: str = 'CustomerID',
+                            date_col: str = 'InvoiceDate', as_rate: bool = True) -> pd.DataFrame:
+    """
+    Create cohort × month-offset retention matrix
+    
+    Customers are assigned to the cohort of their first purchase month and
+    counted once in every later month they purchase. Month offsets are taken
+    on an absolute month index, so they stay correct across year boundaries.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    customer_col : str
+        Customer ID column name
+    date_col : str
+        Date column name
+    as_rate : bool
+        Return retention as a fraction of cohort size instead of customer counts
+    
+    Returns:
+    --------
+    pd.DataFrame : One row per cohort with CohortSize and Month_0..Month_N columns
+    
+    Example:
+    --------
+    >>> cohort_retention = create_cohort_retention(df)
+    """
+    logger.info("📊 Creating cohort retention matrix...")
+    
+    df = df[df[customer_col].notna()]
+    customer_codes, customers = pd.factorize(df[customer_col])
+    if 'MonthIndex' in df.columns:
+        month_index = df['MonthIndex'].values.astype(np.int64)
+    else:
+        month_index = compute_date_parts(df[date_col])['month_index'].astype(np.int64)
+    
+    # Cohort = first purchase month per customer
+    first_month = pd.Series(month_index).groupby(customer_codes).min().values
+    first_cohort = first_month.min() if len(first_month) else 0
+    cohort_codes = first_month - first_cohort
+    offsets = month_index - first_month[customer_codes]
+    
+    n_cohorts = int(cohort_codes.max()) + 1 if len(cohort_codes) else 0
+    n_offsets = int(offsets.max()) + 1 if len(offsets) else 0
+    
+    # Each customer counts once per active month: dedupe (customer, offset) keys
+    active = np.unique(customer_codes.astype(np.int64) * max(n_offsets, 1) + offsets)
+    active_customers = active // max(n_offsets, 1)
+    active_offsets = active % max(n_offsets, 1)
+    
+    # 2D histogram over (cohort, offset) cells
+    counts = np.bincount(
+        cohort_codes[active_customers] * n_offsets + active_offsets,
+        minlength=n_cohorts * n_offsets
+    ).reshape(n_cohorts, n_offsets)
+    
+    cohort_sizes = counts[:, 0] if n_offsets else np.zeros(n_cohorts, dtype=np.int64)
+    populated = cohort_sizes > 0
+    counts = counts[populated]
+    cohort_sizes = cohort_sizes[populated]
+    cohort_months = np.arange(n_cohorts)[populated] + first_cohort
+    
+    if as_rate:
+        values = counts / cohort_sizes[:, None]
+        # Offsets past the end of the data cannot be observed yet
+        unobserved = (cohort_months[:, None] + np.arange(n_offsets)) > month_index.max()
+        values[unobserved] = np.nan
+    else:
+        values = counts
+    
+    cohort_retention = pd.DataFrame(values, columns=[f'Month_{i}' for i in range(n_offsets)])
+    cohort_retention.insert(0, 'CohortMonth', month_labels(cohort_months))
+    cohort_retention.insert(1, 'CohortSize', cohort_sizes)
+    
+    logger.info("✅ Created retention matrix for {} cohorts × {} months", len(cohort_retention), n_offsets)
+    
+    return cohort_retention
+
+
+DAY_NAMES = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _busiest_cell(temporal_agg: pd.DataFrame) -> str:
+    """Describe the weekday × hour cell with the most orders, for logging"""
+    busiest = temporal_agg.loc[temporal_agg['Orders'].idxmax()]
+    return f"{busiest['DayName']} {busiest['Hour']:02d}:00, {busiest['Orders']:,} orders"
+
+
+def create_temporal_patterns(df: pd.DataFrame, date_col: str = 'InvoiceDate') -> pd.DataFrame:
+    """
+    Create revenue, order and customer aggregates per (weekday, hour) cell
+    
+    Every one of the 7 × 24 cells is returned, including empty ones, so the
+    result can be pivoted straight into a heatmap.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    date_col : str
+        Date column name (used when DayOfWeek/Hour are not present)
+    
+    Returns:
+    --------
+    pd.DataFrame : Temporal pattern dataframe (168 rows)
+    
+    Example:
+    --------
+    >>> temporal_patterns = create_temporal_patterns(df)
+    >>> heatmap = temporal_patterns.pivot(index='DayName', columns='Hour', values='Revenue')
+    """
+    logger.info("📊 Creating temporal (weekday × hour) patterns...")
+    
+    n_cells = 7 * 24
+    day_of_week = df['DayOfWeek'].values if 'DayOfWeek' in df.columns else df[date_col].dt.dayofweek.values
+    hour = df['Hour'].values if 'Hour' in df.columns else df[date_col].dt.hour.values
+    cell_codes = day_of_week.astype(np.int64) * 24 + hour
+    
+    transactions = np.bincount(cell_codes, minlength=n_cells)
+    revenue = np.bincount(cell_codes, weights=df['TotalPrice'].values, minlength=n_cells)
+    
+    # Distinct invoices / customers per cell: dedupe (key, cell) codes first
+    invoice_codes, _ = pd.factorize(df['InvoiceNo'])
+    invoice_cells = np.unique(invoice_codes.astype(np.int64) * n_cells + cell_codes) % n_cells
+    orders = np.bincount(invoice_cells, minlength=n_cells)
+    
+    customer_codes, _ = pd.factorize(df['CustomerID'])
+    known = customer_codes >= 0
+    customer_cells = np.unique(customer_codes[known].astype(np.int64) * n_cells + cell_codes[known]) % n_cells
+    customers = np.bincount(customer_cells, minlength=n_cells)
+    
+    cells = np.arange(n_cells)
+    temporal_agg = pd.DataFrame({
+        'DayOfWeek': cells // 24,
+        'DayName': np.array(DAY_NAMES)[cells // 24],
+        'Hour': cells % 24,
+        'Transactions': transactions,
+        'Revenue': revenue,
+        'Orders': orders,
+        'Customers': customers
+    })
+    temporal_agg['AvgTransactionValue'] = temporal_agg['Revenue'] / temporal_agg['Transactions'].replace(0, np.nan)
+    
+    logger.opt(lazy=True).info("✅ Created temporal patterns (busiest: {})",
+                               lambda: _busiest_cell(temporal_agg))
+    
+    return temporal_agg
+
+
 def engineer_all_features(df: pd.DataFrame, config: Dict[str, Any] = None) -> Tuple:
     """
     Complete feature engineering pipeline
@@ -394,12 +788,14 @@ def engineer_all_features(df: pd.DataFrame, config: Dict[str, Any] = None) -> Tu
     Returns:
     --------
     tuple : (df_clean, customer_metrics, product_metrics, monthly_revenue, 
-             country_metrics, invoice_metrics)
+             country_metrics, invoice_metrics, cohort_retention, daily_revenue,
+             temporal_patterns)
     
     Example:
     --------
     >>> results = engineer_all_features(df_clean)
-    >>> df_clean, customer_metrics, product_metrics, monthly_revenue, country_metrics, invoice_metrics = results
+    >>> (df_clean, customer_metrics, product_metrics, monthly_revenue, country_metrics,
+    ...  invoice_metrics, cohort_retention, daily_revenue, temporal_patterns) = results
     """
     logger.info("\n" + "="*80)
     logger.info("STARTING FEATURE ENGINEERING PIPELINE")
@@ -420,19 +816,27 @@ def engineer_all_features(df: pd.DataFrame, config: Dict[str, Any] = None) -> Tu
     monthly_revenue = create_monthly_revenue(df)
     country_metrics = create_country_metrics(df)
     invoice_metrics = create_invoice_metrics(df)
+    cohort_retention = create_cohort_retention(df)
+    daily_params = (config or {}).get('feature_params', {}).get('daily_revenue', {})
+    daily_revenue = create_daily_revenue(df, windows=tuple(daily_params.get('moving_average_windows', (7, 30))))
+    temporal_patterns = create_temporal_patterns(df)
     
     logger.info("\n" + "="*80)
     logger.info("FEATURE ENGINEERING COMPLETE")
     logger.info("="*80)
-    logger.info(f"📊 Cleaned Data: {len(df):,} rows × {len(df.columns)} columns")
-    logger.info(f"📊 Customer Metrics: {len(customer_metrics):,} customers")
-    logger.info(f"📊 Product Metrics: {len(product_metrics):,} products")
-    logger.info(f"📊 Monthly Revenue: {len(monthly_revenue)} months")
-    logger.info(f"📊 Country Metrics: {len(country_metrics)} countries")
-    logger.info(f"📊 Invoice Metrics: {len(invoice_metrics):,} invoices")
+    logger.info("📊 Cleaned Data: {:,} rows × {} columns", len(df), len(df.columns))
+    logger.info("📊 Customer Metrics: {:,} customers", len(customer_metrics))
+    logger.info("📊 Product Metrics: {:,} products", len(product_metrics))
+    logger.info("📊 Monthly Revenue: {} months", len(monthly_revenue))
+    logger.info("📊 Country Metrics: {} countries", len(country_metrics))
+    logger.info("📊 Invoice Metrics: {:,} invoices", len(invoice_metrics))
+    logger.info("📊 Cohort Retention: {} cohorts", len(cohort_retention))
+    logger.info("📊 Daily Revenue: {} days", len(daily_revenue))
+    logger.info("📊 Temporal Patterns: {} weekday × hour cells", len(temporal_patterns))
     logger.info("="*80 + "\n")
     
-    return df, customer_metrics, product_metrics, monthly_revenue, country_metrics, invoice_metrics
+    return (df, customer_metrics, product_metrics, monthly_revenue, country_metrics,
+            invoice_metrics, cohort_retention, daily_revenue, temporal_patterns)
 
 
 if __name__ == "__main__":
@@ -447,7 +851,8 @@ if __name__ == "__main__":
     
     # Engineer features
     results = engineer_all_features(df_clean, config)
-    df_clean, customer_metrics, product_metrics, monthly_revenue, country_metrics, invoice_metrics = results
+    (df_clean, customer_metrics, product_metrics, monthly_revenue, country_metrics,
+     invoice_metrics, cohort_retention, daily_revenue, temporal_patterns) = results
     
     # Save all datasets
     save_data(df_clean, config['paths']['data']['cleaned'])
@@ -456,3 +861,6 @@ if __name__ == "__main__":
     save_data(monthly_revenue, config['paths']['data']['monthly_revenue'])
     save_data(country_metrics, config['paths']['data']['country_metrics'])
     save_data(invoice_metrics, config['paths']['data']['invoice_metrics'])
+    save_data(cohort_retention, config['paths']['data']['cohort_retention'])
+    save_data(daily_revenue, config['paths']['data']['daily_revenue'])
+    save_data(temporal_patterns, config['paths']['data']['temporal_patterns'])
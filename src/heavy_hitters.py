@@ -0,0 +1,216 @@
+"""
+Heavy Hitters for Streaming E-Commerce Data
+Mergeable weighted Space-Saving summaries that track the top products and
+customers by revenue or units in one pass over chunks, with error bounds
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from loguru import logger
+from typing import Dict, Iterable, Tuple, Union
+
+# (key column, weight column) pairs tracked by track_top_sellers()
+DEFAULT_TRACKED = {
+    'products_by_revenue': ('StockCode', 'TotalPrice'),
+    'products_by_units': ('StockCode', 'Quantity'),
+    'customers_by_revenue': ('CustomerID', 'TotalPrice'),
+    'customers_by_units': ('CustomerID', 'Quantity'),
+}
+
+
+class HeavyHitters:
+    """
+    Weighted Space-Saving summary of the largest keys by total weight
+    
+    At most `capacity` keys are kept, each with an estimated total that
+    never falls short of the true total and exceeds it by at most its error:
+    
+        estimate - error <= true total <= estimate
+    
+    and any key that is not kept has a true total of at most `floor`. The
+    floor grows with the weight spread over keys that are not kept, so on
+    skewed data such as product revenue a capacity of a few times the top-k
+    wanted reports the top-k exactly (see top() for the guarantee flag).
+    
+    Chunks are pre-aggregated with one groupby and merged as summaries, so
+    the cost is per distinct key per chunk rather than per row, and
+    summaries built on separate partitions merge with the same rule.
+    
+    Example:
+    --------
+    >>> top_products = HeavyHitters(capacity=1000)
+    >>> for chunk in pd.read_csv(path, chunksize=100_000):
+    ...     top_products.update(chunk['StockCode'], chunk['Quantity'] * chunk['UnitPrice'])
+    >>> top_products.top(20)
+    """
+    
+    def __init__(self, capacity: int = 1000):
+        """
+        Initialize an empty summary
+        
+        Parameters:
+        -----------
+        capacity : int
+            Number of keys monitored (memory and accuracy knob)
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.estimates = pd.Series(dtype=float)
+        self.errors = pd.Series(dtype=float)
+        self.floor = 0.0
+        self.total_weight = 0.0
+    
+    def __len__(self) -> int:
+        """Number of keys monitored"""
+        return len(self.estimates)
+    
+    def _combine(self, estimates: pd.Series, errors: pd.Series, floor: float) -> None:
+        """
+        Merge another summary's counters and truncate to capacity
+        
+        A key missing from one summary may still have up to that summary's
+        floor there, which is added to both its estimate and its error.
+        """
+        index = self.estimates.index.union(estimates.index)
+        combined = (self.estimates.reindex(index, fill_value=self.floor)
+                    + estimates.reindex(index, fill_value=floor))
+        combined_errors = (self.errors.reindex(index, fill_value=self.floor)
+                           + errors.reindex(index, fill_value=floor))
+        
+        floor = self.floor + floor
+        if len(combined) > self.capacity:
+            kept = combined.nlargest(self.capacity, keep='first')
+            # Dropped keys can have up to their estimate
+            floor = max(floor, float(combined.drop(kept.index).max()))
+            combined, combined_errors = kept, combined_errors[kept.index]
+        
+        self.estimates, self.errors, self.floor = combined, combined_errors, floor
+    
+    def update(self, keys: Union[pd.Series, np.ndarray],
+               weights: Union[pd.Series, np.ndarray] = None) -> 'HeavyHitters':
+        """
+        Add a chunk of keys with their weights (missing keys are ignored)
+        
+        Parameters:
+        -----------
+        keys : array-like
+            Keys, e.g. StockCode or CustomerID per transaction
+        weights : array-like
+            Weight per key, e.g. TotalPrice or Quantity (None = count rows)
+        
+        Returns:
+        --------
+        HeavyHitters : self, for chaining
+        """
+        keys = pd.Series(np.asarray(keys))
+        weights = pd.Series(np.ones(len(keys)) if weights is None else np.asarray(weights, dtype=float))
+        valid = keys.notna() & weights.notna()
+        if not valid.any():
+            return self
+        
+        totals = weights[valid].groupby(keys[valid].values, sort=False).sum()
+        self.total_weight += float(totals.sum())
+        # The chunk totals are exact: no error, nothing unmonitored
+        self._combine(totals, pd.Series(0.0, index=totals.index), 0.0)
+        return self
+    
+    def merge(self, other: 'HeavyHitters') -> 'HeavyHitters':
+        """Merge a summary built on another partition into this one"""
+        self.total_weight += other.total_weight
+        self._combine(other.estimates, other.errors, other.floor)
+        return self
+    
+    def error_bound(self) -> float:
+        """Largest possible overestimate of any reported key (and total of any unreported key)"""
+        return float(max(self.floor, self.errors.max() if len(self.errors) else 0.0))
+    
+    def top(self, n: int = 20) -> pd.DataFrame:
+        """
+        The n keys with the largest estimated totals
+        
+        Parameters:
+        -----------
+        n : int
+            Number of keys
+        
+        Returns:
+        --------
+        pd.DataFrame : Key, Estimate, Error, LowerBound and Guaranteed
+                       (True when the key is certainly among the true top n,
+                       because its lower bound beats every other key's
+                       possible total)
+        """
+        ranked = self.estimates.sort_values(ascending=False, kind='mergesort')
+        top = ranked.iloc[:n]
+        errors = self.errors[top.index].values
+        lower_bounds = top.values - errors
+        
+        # Best possible total of any key outside the reported n
+        challenger = max(self.floor, ranked.iloc[n] if len(ranked) > n else 0.0)
+        return pd.DataFrame({
+            'Key': top.index,
+            'Estimate': top.values,
+            'Error': errors,
+            'LowerBound': lower_bounds,
+            'Guaranteed': lower_bounds >= challenger
+        })
+
+
+def track_top_sellers(chunks: Iterable[pd.DataFrame], capacity: int = 1000,
+                      tracked: Dict[str, Tuple[str, str]] = None) -> Dict[str, HeavyHitters]:
+    """
+    Track top products and customers in one pass over transaction chunks
+    
+    Parameters:
+    -----------
+    chunks : iterable of pd.DataFrame
+        Cleaned transaction chunks, e.g. pd.read_csv(..., chunksize=100_000)
+    capacity : int
+        Keys monitored per summary
+    tracked : dict
+        Name -> (key column, weight column); TotalPrice is derived from
+        Quantity and UnitPrice when absent (default: DEFAULT_TRACKED)
+    
+    Returns:
+    --------
+    dict : Name -> HeavyHitters summary (merge with summaries of other partitions)
+    
+    Example:
+    --------
+    >>> chunks = pd.read_csv('data/cleaned_data.csv', chunksize=100_000)
+    >>> summaries = track_top_sellers(chunks)
+    >>> summaries['products_by_revenue'].top(20)
+    """
+    tracked = tracked or DEFAULT_TRACKED
+    summaries = {name: HeavyHitters(capacity) for name in tracked}
+    
+    n_chunks = 0
+    for chunk in chunks:
+        if 'TotalPrice' not in chunk.columns and {'Quantity', 'UnitPrice'} <= set(chunk.columns):
+            chunk = chunk.assign(TotalPrice=chunk['Quantity'] * chunk['UnitPrice'])
+        for name, (key_col, weight_col) in tracked.items():
+            summaries[name].update(chunk[key_col].values, chunk[weight_col].values)
+        n_chunks += 1
+    
+    for name, summary in summaries.items():
+        share = summary.error_bound() / summary.total_weight if summary.total_weight else 0.0
+        logger.info(f"📊 {name}: {len(summary):,} keys monitored from {n_chunks:,} chunks, "
+                    f"error bound {summary.error_bound():,.2f} ({share:.2%} of total)")
+    return summaries
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    chunks = pd.read_csv(config['paths']['data']['cleaned'], chunksize=100_000)
+    summaries = track_top_sellers(chunks)
+    
+    logger.info(f"Top 20 products by revenue:\n{summaries['products_by_revenue'].top(20)}")
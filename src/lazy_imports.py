@@ -0,0 +1,100 @@
+"""
+Lazy Imports for E-Commerce Analysis
+Defer loading heavy libraries (pandas, loguru, tqdm, ...) until first use
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import importlib
+import sys
+import types
+from typing import Any
+
+
+class LazyModule(types.ModuleType):
+    """
+    Module placeholder that imports the real module on first attribute access
+    
+    Example:
+    --------
+    >>> pd = LazyModule('pandas')   # nothing imported yet
+    >>> pd.DataFrame                # pandas is imported here
+    """
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_lazy_module'] = None
+    
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_module'] = module
+        return module
+    
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+    
+    def __dir__(self):
+        return dir(self._load())
+
+
+class LazyAttribute:
+    """
+    Placeholder for an object inside a module, e.g. loguru's logger
+    
+    Attribute access and calls are forwarded to the real object, which is
+    imported the first time it is used.
+    """
+    
+    def __init__(self, module_name: str, attribute: str):
+        self._module_name = module_name
+        self._attribute = attribute
+        self._target = None
+    
+    def _load(self) -> Any:
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module_name), self._attribute)
+        return self._target
+    
+    def __getattr__(self, attribute: str) -> Any:
+        return getattr(self._load(), attribute)
+    
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._load()(*args, **kwargs)
+    
+    def __repr__(self) -> str:
+        return f"<lazy {self._module_name}.{self._attribute}>"
+
+
+def lazy_import(module_name: str, attribute: str = None) -> Any:
+    """
+    Import a module (or one of its attributes) lazily
+    
+    Already-imported modules are returned as they are, so there is no
+    overhead once a library has been loaded anyway.
+    
+    Parameters:
+    -----------
+    module_name : str
+        Fully qualified module name
+    attribute : str
+        Object to take from the module (optional)
+    
+    Returns:
+    --------
+    module or object : Placeholder that loads on first use
+    
+    Example:
+    --------
+    >>> pd = lazy_import('pandas')
+    >>> logger = lazy_import('loguru', 'logger')
+    >>> tqdm = lazy_import('tqdm', 'tqdm')
+    """
+    module = sys.modules.get(module_name)
+    
+    if attribute is not None:
+        return getattr(module, attribute) if module is not None else LazyAttribute(module_name, attribute)
+    
+    return module if module is not None else LazyModule(module_name)
@@ -0,0 +1,516 @@
+"""
+Metrics Query Service for E-Commerce Analysis
+Serves the pipeline's metric tables over HTTP from in-memory hash indexes
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import asyncio
+import json
+import time
+import pandas as pd
+import numpy as np
+from pathlib import Path
+from urllib.parse import urlsplit, parse_qsl, unquote
+from loguru import logger
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    from .utils import load_data
+except ImportError:
+    from utils import load_data
+
+# Served datasets and the column each one is indexed on
+DATASET_KEYS = {
+    'customer_metrics': 'CustomerID',
+    'product_metrics': 'StockCode',
+    'country_metrics': 'Country',
+    'monthly_revenue': 'YearMonth',
+    'invoice_metrics': 'InvoiceNo',
+}
+
+# Cap on rows returned by top-N and range queries
+DEFAULT_MAX_RESULTS = 1000
+
+HTTP_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+                500: 'Internal Server Error'}
+
+
+def count_param(params: Dict[str, str], name: str, default: int, maximum: int) -> int:
+    """Non-negative integer query parameter, capped at maximum (ValueError if invalid)"""
+    value = int(params.get(name, default))
+    if value < 0:
+        raise ValueError(f"{name} must not be negative, got {value}")
+    return min(value, maximum)
+
+
+def normalize_keys(values: pd.Series) -> pd.Series:
+    """
+    Convert key values to the strings used in lookups
+    
+    IDs read back from CSV are floats when the column has gaps
+    (17850.0), so a trailing '.0' is dropped.
+    
+    Parameters:
+    -----------
+    values : pd.Series
+        Key column
+    
+    Returns:
+    --------
+    pd.Series : String keys
+    """
+    return values.astype(str).str.replace(r'\.0$', '', regex=True)
+
+
+class DatasetIndex:
+    """
+    One metric table held as Python columns with a hash index on its key
+    
+    Rows are stored column-wise as JSON-ready Python values, so a lookup is a
+    dict probe plus one list access per column. Sort orders for top-N and
+    range queries are built on first use of a column and cached.
+    
+    Example:
+    --------
+    >>> index = DatasetIndex('customer_metrics', df, 'CustomerID')
+    >>> index.lookup('17850')
+    >>> index.top('CustomerLifetimeValue', n=10)
+    """
+    
+    def __init__(self, name: str, df: pd.DataFrame, key: str):
+        """
+        Initialize the index
+        
+        Parameters:
+        -----------
+        name : str
+            Dataset name
+        df : pd.DataFrame
+            Metric table
+        key : str
+            Column to index for point lookups
+        """
+        self.name = name
+        self.key = key
+        self.n_rows = len(df)
+        self._frame = df
+        
+        # NaN becomes None so rows serialize as valid JSON
+        self._columns = {
+            column: df[column].astype(object).where(df[column].notna(), None).tolist()
+            for column in df.columns
+        }
+        
+        # Key -> row positions (keys are not unique in every table, e.g. StockCode)
+        keys = normalize_keys(df[key]) if key in df.columns else pd.Series([], dtype=str)
+        self._index = {k: positions.tolist() for k, positions in keys.groupby(keys.values).indices.items()}
+        
+        self._sorted = {}
+    
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+    
+    def rows(self, positions) -> List[Dict[str, Any]]:
+        """Rows at the given positions as dictionaries"""
+        columns = self._columns.items()
+        return [{column: values[position] for column, values in columns} for position in positions]
+    
+    def lookup(self, key: str) -> List[Dict[str, Any]]:
+        """
+        Point lookup on the key column
+        
+        Parameters:
+        -----------
+        key : str
+            Key value (e.g. '17850' or '17850.0' for a CustomerID)
+        
+        Returns:
+        --------
+        list : Matching rows (empty if the key is unknown)
+        """
+        if key.endswith('.0'):
+            key = key[:-2]
+        return self.rows(self._index.get(key, []))
+    
+    def _sort_order(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions of non-missing values in ascending order, and the sorted values"""
+        if column not in self._sorted:
+            if column not in self._columns:
+                raise KeyError(column)
+            values = self._frame[column]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = values.astype(str).where(values.notna())
+            valid = np.flatnonzero(values.notna().values)
+            valid_values = values.values[valid]
+            order = np.argsort(valid_values, kind='stable')
+            self._sorted[column] = (valid[order], valid_values[order])
+        return self._sorted[column]
+    
+    def _coerce(self, column: str, value: Optional[str]):
+        """Parse a query bound to the column's type"""
+        if value is None:
+            return None
+        return float(value) if pd.api.types.is_numeric_dtype(self._frame[column]) else value
+    
+    def top(self, column: str, n: int = 10, ascending: bool = False) -> List[Dict[str, Any]]:
+        """
+        Rows with the largest (or smallest) values of a column
+        
+        Parameters:
+        -----------
+        column : str
+            Column to rank by
+        n : int
+            Number of rows
+        ascending : bool
+            Return the smallest values instead
+        
+        Returns:
+        --------
+        list : Up to n rows, missing values excluded
+        """
+        positions, _ = self._sort_order(column)
+        n = max(n, 0)
+        positions = positions[:n] if ascending else positions[::-1][:n]
+        return self.rows(positions)
+    
+    def range(self, column: str, min_value: str = None, max_value: str = None,
+              limit: int = DEFAULT_MAX_RESULTS) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Rows with min_value <= column <= max_value, in ascending order
+        
+        Parameters:
+        -----------
+        column : str
+            Column to filter on
+        min_value : str
+            Inclusive lower bound (None = unbounded)
+        max_value : str
+            Inclusive upper bound (None = unbounded)
+        limit : int
+            Maximum rows returned
+        
+        Returns:
+        --------
+        tuple : (total matching rows, first `limit` rows)
+        
+        Example:
+        --------
+        >>> total, rows = index.range('MonthlyRevenue', min_value='500000')
+        """
+        positions, values = self._sort_order(column)
+        min_value = self._coerce(column, min_value)
+        max_value = self._coerce(column, max_value)
+        
+        lo = 0 if min_value is None else int(np.searchsorted(values, min_value, side='left'))
+        hi = len(values) if max_value is None else int(np.searchsorted(values, max_value, side='right'))
+        hi = max(lo, hi)
+        
+        return hi - lo, self.rows(positions[lo:min(hi, lo + max(limit, 0))])
+
+
+class MetricsStore:
+    """
+    The set of metric tables behind the service, loaded from the pipeline outputs
+    
+    Example:
+    --------
+    >>> store = MetricsStore.from_config(config)
+    >>> store['country_metrics'].lookup('France')
+    """
+    
+    def __init__(self, paths: Dict[str, str], keys: Dict[str, str] = None):
+        """
+        Load every dataset and build its index
+        
+        Parameters:
+        -----------
+        paths : dict
+            Dataset name -> CSV path
+        keys : dict
+            Dataset name -> key column (default DATASET_KEYS)
+        """
+        keys = keys or DATASET_KEYS
+        self.paths = paths
+        self.signature = self.file_signature(paths)
+        self.loaded_at = time.time()
+        self.datasets = {}
+        
+        for name, path in paths.items():
+            if self.signature[name] is None:
+                logger.warning(f"⚠️  Dataset not found, not served: {path}")
+                continue
+            self.datasets[name] = DatasetIndex(name, load_data(path), keys.get(name))
+        
+        logger.info(f"✅ Metrics store loaded: {len(self.datasets)} datasets")
+    
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> 'MetricsStore':
+        """Store over the dataset paths in config['paths']['data']"""
+        return cls(dataset_paths(config))
+    
+    @staticmethod
+    def file_signature(paths: Dict[str, str]) -> Dict[str, Optional[Tuple[int, int]]]:
+        """(mtime, size) of each dataset file, None when missing"""
+        signature = {}
+        for name, path in paths.items():
+            try:
+                stat = Path(path).stat()
+                signature[name] = (stat.st_mtime_ns, stat.st_size)
+            except FileNotFoundError:
+                signature[name] = None
+        return signature
+    
+    def __getitem__(self, name: str) -> DatasetIndex:
+        return self.datasets[name]
+    
+    def __contains__(self, name: str) -> bool:
+        return name in self.datasets
+    
+    def describe(self) -> Dict[str, Any]:
+        """Datasets with their key column, row count and columns"""
+        return {
+            name: {'key': index.key, 'rows': index.n_rows, 'columns': index.columns}
+            for name, index in self.datasets.items()
+        }
+
+
+def dataset_paths(config: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Paths of the served datasets from the configuration
+    
+    Parameters:
+    -----------
+    config : dict
+        Configuration dictionary
+    
+    Returns:
+    --------
+    dict : Dataset name -> CSV path
+    """
+    data_paths = config['paths']['data']
+    return {name: data_paths[name] for name in DATASET_KEYS if name in data_paths}
+
+
+class MetricsService:
+    """
+    Asyncio HTTP/1.1 service answering queries from a MetricsStore
+    
+    Routes (GET, JSON responses):
+    
+    - /health
+    - /datasets
+    - /<dataset>/<key>                                   point lookup
+    - /<dataset>/top?by=<column>&n=10[&order=asc]        top-N
+    - /<dataset>/range?column=<column>&min=..&max=..&limit=..
+    
+    Queries run on the event loop against the in-memory indexes. The dataset
+    files are polled for changes; a changed set is reloaded in a worker
+    thread once it has stopped changing for one interval, and swapped in
+    atomically, so requests never see a half-loaded store.
+    
+    Example:
+    --------
+    >>> service = MetricsService(lambda: MetricsStore.from_config(config))
+    >>> asyncio.run(service.serve('127.0.0.1', 8050))
+    """
+    
+    def __init__(self, load_store, reload_interval: float = 5.0,
+                 max_results: int = DEFAULT_MAX_RESULTS):
+        """
+        Initialize the service
+        
+        Parameters:
+        -----------
+        load_store : callable
+            Returns a freshly loaded MetricsStore (called at start and on reload)
+        reload_interval : float
+            Seconds between checks for new pipeline outputs (0 = no hot reload)
+        max_results : int
+            Cap on rows returned by top-N and range queries
+        """
+        self._load_store = load_store
+        self.reload_interval = reload_interval
+        self.max_results = max_results
+        self.store = load_store()
+        self.reloads = 0
+    
+    async def check_reload(self, pending: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Reload the store if its files changed and have since settled
+        
+        Parameters:
+        -----------
+        pending : dict
+            Signature seen on the previous check, if it differed from the store's
+        
+        Returns:
+        --------
+        dict : Signature to pass to the next check (None = nothing pending)
+        """
+        current = MetricsStore.file_signature(self.store.paths)
+        if current == self.store.signature:
+            return None
+        if current != pending:
+            # Files are still being written; wait for them to settle
+            return current
+        
+        logger.info("🔄 Pipeline outputs changed, reloading metrics store")
+        self.store = await asyncio.get_running_loop().run_in_executor(None, self._load_store)
+        self.reloads += 1
+        return None
+    
+    async def _watch(self) -> None:
+        """Poll the dataset files for changes"""
+        pending = None
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                pending = await self.check_reload(pending)
+            except Exception as e:
+                logger.error(f"❌ Reload failed, keeping current data: {e}")
+                pending = None
+    
+    def handle_query(self, path: str) -> Tuple[int, Any]:
+        """
+        Answer one request path
+        
+        Parameters:
+        -----------
+        path : str
+            Request target, e.g. '/customer_metrics/top?by=CustomerLifetimeValue&n=5'
+        
+        Returns:
+        --------
+        tuple : (HTTP status, JSON-serializable body)
+        """
+        url = urlsplit(path)
+        parts = [unquote(part) for part in url.path.strip('/').split('/') if part]
+        params = dict(parse_qsl(url.query))
+        store = self.store
+        
+        if parts == ['health']:
+            return 200, {'status': 'ok', 'loaded_at': store.loaded_at, 'reloads': self.reloads}
+        if parts == ['datasets']:
+            return 200, store.describe()
+        if len(parts) != 2 or parts[0] not in store:
+            return 404, {'error': f"Unknown route: {url.path}"}
+        
+        index = store[parts[0]]
+        try:
+            if parts[1] == 'top':
+                n = count_param(params, 'n', 10, self.max_results)
+                rows = index.top(params['by'], n, ascending=params.get('order') == 'asc')
+                return 200, {'rows': rows}
+            if parts[1] == 'range':
+                limit = count_param(params, 'limit', self.max_results, self.max_results)
+                total, rows = index.range(params['column'], params.get('min'), params.get('max'), limit)
+                return 200, {'total': total, 'rows': rows}
+        except KeyError as e:
+            return 400, {'error': f"Missing or unknown column: {e}"}
+        except ValueError as e:
+            return 400, {'error': str(e)}
+        
+        rows = index.lookup(parts[1])
+        if not rows:
+            return 404, {'error': f"{index.key} not found: {parts[1]}"}
+        return 200, {'rows': rows}
+    
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one connection (HTTP/1.1 keep-alive)"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                
+                start_time = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode('latin1').split()
+                except ValueError:
+                    status, body = 400, {'error': 'Malformed request line'}
+                    method, version = 'GET', 'HTTP/1.0'
+                else:
+                    if method != 'GET':
+                        status, body = 405, {'error': f"Method not allowed: {method}"}
+                    else:
+                        try:
+                            status, body = self.handle_query(target)
+                        except Exception as e:
+                            logger.error(f"❌ Query failed: {target}: {e}")
+                            status, body = 500, {'error': 'Internal server error'}
+                
+                payload = json.dumps(body, default=str).encode('utf-8')
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                keep_alive = (version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close')
+                
+                writer.write(
+                    f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"X-Query-Time-Ms: {elapsed_ms:.3f}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode('latin1') + payload
+                )
+                await writer.drain()
+                
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def start(self, host: str = '127.0.0.1', port: int = 8050) -> asyncio.AbstractServer:
+        """
+        Start listening and watching for new outputs
+        
+        Parameters:
+        -----------
+        host : str
+            Interface to bind
+        port : int
+            Port to bind (0 = any free port)
+        
+        Returns:
+        --------
+        asyncio.AbstractServer : The running server
+        """
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        if self.reload_interval:
+            self._watcher = asyncio.create_task(self._watch())
+        
+        bound = server.sockets[0].getsockname()
+        logger.info(f"✅ Metrics service listening on http://{bound[0]}:{bound[1]}")
+        return server
+    
+    async def serve(self, host: str = '127.0.0.1', port: int = 8050) -> None:
+        """Run the service until cancelled"""
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if self.reload_interval:
+                self._watcher.cancel()
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    service = MetricsService(lambda: MetricsStore.from_config(config))
+    asyncio.run(service.serve())
@@ -0,0 +1,288 @@
+"""
+Product Seasonality Analysis for E-Commerce Data
+Product × month revenue and units matrices built with a single scatter-add,
+and per-product seasonality indices (SQL query 3.2 in Python)
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import calendar
+
+import pandas as pd
+import numpy as np
+from scipy import sparse as sp
+from loguru import logger
+from typing import Union
+
+try:
+    from .feature_engineering import compute_date_parts, month_labels
+except ImportError:
+    from feature_engineering import compute_date_parts, month_labels
+
+MONTH_NAMES = list(calendar.month_abbr)[1:]
+
+
+class ProductMonthMatrix:
+    """
+    Revenue and units per product (rows) and month (columns)
+    
+    Values are float32; with sparse=True they are CSR matrices holding only
+    the product-months with sales, so the dense grid is never allocated.
+    
+    Example:
+    --------
+    >>> matrix = build_product_month_matrix(df_clean)
+    >>> matrix.to_frame('revenue').loc['85123A']
+    >>> seasonality = matrix.seasonality_indices()
+    """
+    
+    def __init__(self, products: pd.Index, month_index: np.ndarray,
+                 revenue: Union[np.ndarray, sp.csr_matrix], units: Union[np.ndarray, sp.csr_matrix],
+                 product_col: str = 'StockCode'):
+        """
+        Initialize from built matrices
+        
+        Parameters:
+        -----------
+        products : pd.Index
+            Product label per row
+        month_index : np.ndarray
+            Month index (year * 12 + month - 1) per column, consecutive
+        revenue, units : np.ndarray or csr_matrix
+            float32 matrices of shape (products, months)
+        product_col : str
+            Product column name used in outputs
+        """
+        self.products = products
+        self.month_index = month_index
+        self.revenue = revenue
+        self.units = units
+        self.product_col = product_col
+    
+    @property
+    def shape(self):
+        """(products, months)"""
+        return self.revenue.shape
+    
+    @property
+    def is_sparse(self) -> bool:
+        """Whether the matrices are stored as CSR"""
+        return sp.issparse(self.revenue)
+    
+    def _values(self, value: str):
+        """Revenue or units matrix by name"""
+        if value not in ('revenue', 'units'):
+            raise ValueError(f"value must be 'revenue' or 'units', got {value!r}")
+        return getattr(self, value)
+    
+    def to_frame(self, value: str = 'revenue') -> pd.DataFrame:
+        """
+        Matrix as a wide dataframe (products × 'YYYY-MM' columns)
+        
+        Parameters:
+        -----------
+        value : str
+            'revenue' or 'units'
+        
+        Returns:
+        --------
+        pd.DataFrame : Dense pivot indexed by product
+        """
+        values = self._values(value)
+        values = values.toarray() if self.is_sparse else values
+        return pd.DataFrame(values, index=pd.Index(self.products, name=self.product_col),
+                            columns=month_labels(self.month_index))
+    
+    def seasonality_indices(self, value: str = 'revenue') -> pd.DataFrame:
+        """
+        Seasonality index per product and calendar month
+        
+        The index of a calendar month is the product's average value in that
+        month (across years) divided by its average over all months in the
+        data, so 1.0 = a typical month and 2.0 = twice the usual sales.
+        
+        Parameters:
+        -----------
+        value : str
+            'revenue' or 'units'
+        
+        Returns:
+        --------
+        pd.DataFrame : Product, Total, PeakMonth, PeakIndex (None/NaN for
+                       products without sales), SeasonalityCV
+                       (coefficient of variation of the monthly values) and
+                       one index column per calendar month (Jan..Dec), sorted
+                       by Total descending
+        """
+        values = self._values(value)
+        n_months = self.shape[1]
+        calendar_month = self.month_index % 12
+        
+        # Sum each product's months into calendar months with one matrix product
+        to_calendar = sp.csr_matrix(
+            (np.ones(n_months, dtype=np.float64), (np.arange(n_months), calendar_month)),
+            shape=(n_months, 12)
+        )
+        if self.is_sparse:
+            calendar_sums = (values @ to_calendar).toarray()
+        else:
+            calendar_sums = values.astype(np.float64) @ to_calendar.toarray()
+        months_per_calendar = np.bincount(calendar_month, minlength=12)
+        
+        totals = np.asarray(values.sum(axis=1), dtype=np.float64).ravel()
+        monthly_mean = totals / n_months
+        with np.errstate(divide='ignore', invalid='ignore'):
+            calendar_means = calendar_sums / months_per_calendar
+            indices = calendar_means / monthly_mean[:, None]
+        # Calendar months missing from the data have no index, nor do products
+        # whose sales sum to zero
+        indices[:, months_per_calendar == 0] = np.nan
+        indices[monthly_mean == 0] = np.nan
+        
+        if self.is_sparse:
+            squares = np.asarray(values.multiply(values).sum(axis=1), dtype=np.float64).ravel()
+        else:
+            squares = (values.astype(np.float64) ** 2).sum(axis=1)
+        variance = np.maximum(squares / n_months - monthly_mean ** 2, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cv = np.sqrt(variance) / monthly_mean
+        
+        filled = np.where(np.isnan(indices), -np.inf, indices)
+        peak = filled.argmax(axis=1)
+        # Rows without any index have no peak
+        no_peak = np.isnan(indices).all(axis=1)
+        peak_month = np.array(MONTH_NAMES, dtype=object)[peak]
+        peak_month[no_peak] = None
+        result = pd.DataFrame({
+            self.product_col: self.products,
+            'Total': totals,
+            'PeakMonth': peak_month,
+            'PeakIndex': np.where(no_peak, np.nan, indices[np.arange(len(peak)), peak]),
+            'SeasonalityCV': cv
+        })
+        for month, name in enumerate(MONTH_NAMES):
+            result[name] = indices[:, month].astype(np.float32)
+        
+        return result.sort_values('Total', ascending=False, kind='mergesort').reset_index(drop=True)
+
+
+def build_product_month_matrix(df: pd.DataFrame, product_col: str = 'StockCode', date_col: str = 'InvoiceDate',
+                               sparse: bool = False) -> ProductMonthMatrix:
+    """
+    Build product × month revenue and units matrices in one pass
+    
+    Products are factorized and months mapped to consecutive column numbers,
+    so each line's cell is product_code * n_months + month_code; revenue and
+    units are then scatter-added with bincount over the flattened cells.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe (TotalPrice, or Quantity and UnitPrice)
+    product_col : str
+        Product column name
+    date_col : str
+        Date column name (MonthIndex is used when present)
+    sparse : bool
+        Store CSR matrices of the non-empty cells instead of dense arrays
+    
+    Returns:
+    --------
+    ProductMonthMatrix : Revenue and units matrices
+    
+    Example:
+    --------
+    >>> matrix = build_product_month_matrix(df_clean, sparse=True)
+    """
+    logger.info("📊 Building product × month matrix...")
+    
+    product_codes, products = pd.factorize(df[product_col], sort=True)
+    if 'MonthIndex' in df.columns:
+        month_index = df['MonthIndex'].values.astype(float)
+    else:
+        month_index = compute_date_parts(df[date_col])['month_index'].astype(float)
+    revenue = (df['TotalPrice'] if 'TotalPrice' in df.columns else df['Quantity'] * df['UnitPrice']).values
+    quantity = df['Quantity'].values
+    
+    # Factorize marks missing products with -1; missing dates give NaN months
+    valid = (product_codes >= 0) & ~np.isnan(month_index)
+    product_codes, month_index = product_codes[valid], month_index[valid].astype(np.int64)
+    revenue, quantity = revenue[valid].astype(np.float64), quantity[valid].astype(np.float64)
+    
+    first_month = int(month_index.min()) if len(month_index) else 0
+    n_months = int(month_index.max()) - first_month + 1 if len(month_index) else 0
+    n_products = len(products)
+    cells = product_codes.astype(np.int64) * n_months + (month_index - first_month)
+    
+    if sparse:
+        # Sum only the cells that occur, then place them in CSR
+        occupied, inverse = np.unique(cells, return_inverse=True)
+        rows, cols = occupied // n_months, occupied % n_months
+        shape = (n_products, n_months)
+        revenue_matrix = sp.csr_matrix(
+            (np.bincount(inverse, weights=revenue).astype(np.float32), (rows, cols)), shape=shape)
+        units_matrix = sp.csr_matrix(
+            (np.bincount(inverse, weights=quantity).astype(np.float32), (rows, cols)), shape=shape)
+    else:
+        size = n_products * n_months
+        revenue_matrix = np.bincount(cells, weights=revenue, minlength=size).astype(np.float32)
+        units_matrix = np.bincount(cells, weights=quantity, minlength=size).astype(np.float32)
+        revenue_matrix = revenue_matrix.reshape(n_products, n_months)
+        units_matrix = units_matrix.reshape(n_products, n_months)
+    
+    logger.info("✅ Product × month matrix: {:,} products × {} months{}",
+                n_products, n_months, ' (sparse)' if sparse else '')
+    return ProductMonthMatrix(products, np.arange(first_month, first_month + n_months), revenue_matrix,
+                              units_matrix, product_col)
+
+
+def create_product_seasonality(df: pd.DataFrame, product_metrics: pd.DataFrame = None,
+                               product_col: str = 'StockCode', sparse: bool = False) -> pd.DataFrame:
+    """
+    Revenue seasonality indices for every product
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    product_metrics : pd.DataFrame
+        Product metrics used to attach descriptions (optional)
+    product_col : str
+        Product column name
+    sparse : bool
+        Build the product × month matrix as sparse (see build_product_month_matrix)
+    
+    Returns:
+    --------
+    pd.DataFrame : One row per product with total revenue, peak month,
+                   seasonality CV and Jan..Dec indices
+    
+    Example:
+    --------
+    >>> seasonality = create_product_seasonality(df_clean, product_metrics)
+    >>> seasonality.nlargest(10, 'SeasonalityCV')
+    """
+    seasonality = build_product_month_matrix(df, product_col, sparse=sparse).seasonality_indices('revenue')
+    seasonality = seasonality.rename(columns={'Total': 'TotalRevenue'})
+    
+    if product_metrics is not None and 'Description' in product_metrics.columns:
+        descriptions = product_metrics.drop_duplicates(product_col).set_index(product_col)['Description']
+        seasonality.insert(1, 'Description', seasonality[product_col].map(descriptions))
+    
+    logger.info("✅ Created seasonality indices for {:,} products", len(seasonality))
+    return seasonality
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, load_data, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    df_clean = load_data(config['paths']['data']['cleaned'], parse_dates=['InvoiceDate'])
+    seasonality = create_product_seasonality(df_clean)
+    
+    logger.info(f"Most seasonal of the top 100 products:\n"
+                f"{seasonality.head(100).nlargest(10, 'SeasonalityCV')}")
@@ -0,0 +1,230 @@
+"""
+Segment Migration Analysis for E-Commerce Data
+Transition matrices and per-customer movement between RFM segments across
+point-in-time snapshots
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from loguru import logger
+
+try:
+    from .feature_engineering import CUSTOMER_SEGMENTS
+    from .snapshots import RFMSnapshots
+except ImportError:
+    from feature_engineering import CUSTOMER_SEGMENTS
+    from snapshots import RFMSnapshots
+
+# Label of segment code -1 (no purchase before the snapshot date)
+NO_SEGMENT = 'Not a Customer'
+
+# Matrix row/column labels; state i + 1 is segment code i, state 0 is NO_SEGMENT
+STATES = [NO_SEGMENT] + CUSTOMER_SEGMENTS
+
+
+def transition_counts(from_codes: np.ndarray, to_codes: np.ndarray) -> np.ndarray:
+    """
+    Count customers for every (from, to) segment pair
+    
+    Each pair of codes is packed into one integer and counted with a single
+    bincount, so the cost is one pass over the customers however many
+    segments there are.
+    
+    Parameters:
+    -----------
+    from_codes : np.ndarray
+        Segment codes at the earlier date (-1 = not a customer yet)
+    to_codes : np.ndarray
+        Segment codes at the later date, aligned with from_codes
+    
+    Returns:
+    --------
+    np.ndarray : int64 matrix of shape (len(STATES), len(STATES)),
+                 rows = from state, columns = to state
+    """
+    n_states = len(STATES)
+    pairs = (from_codes.astype(np.int64) + 1) * n_states + (to_codes.astype(np.int64) + 1)
+    return np.bincount(pairs, minlength=n_states * n_states).reshape(n_states, n_states)
+
+
+def _as_frame(counts: np.ndarray, normalize: bool) -> pd.DataFrame:
+    """Label a count matrix, optionally as row shares"""
+    values = counts.astype(float)
+    if normalize:
+        totals = values.sum(axis=1, keepdims=True)
+        values = np.divide(values, totals, out=np.zeros_like(values), where=totals > 0)
+    return pd.DataFrame(values if normalize else counts,
+                        index=pd.Index(STATES, name='FromSegment'),
+                        columns=pd.Index(STATES, name='ToSegment'))
+
+
+def segment_transition_matrix(snapshots: RFMSnapshots, from_date=None, to_date=None,
+                              normalize: bool = False) -> pd.DataFrame:
+    """
+    Segment-to-segment transition matrix between two snapshot dates
+    
+    Parameters:
+    -----------
+    snapshots : RFMSnapshots
+        Snapshots from create_rfm_snapshots() or RFMSnapshots.load()
+    from_date : str or Timestamp
+        Earlier date; the snapshot in effect then is used (default: first snapshot)
+    to_date : str or Timestamp
+        Later date (default: last snapshot)
+    normalize : bool
+        Return the share of each from-segment moving to each to-segment
+        instead of customer counts
+    
+    Returns:
+    --------
+    pd.DataFrame : Matrix with FromSegment rows and ToSegment columns,
+                   including the 'Not a Customer' state for new customers
+    
+    Example:
+    --------
+    >>> matrix = segment_transition_matrix(snapshots, '2011-06-01', '2011-12-01', normalize=True)
+    >>> matrix.loc['Champions', 'At Risk']
+    """
+    start, end = _positions(snapshots, from_date, to_date)
+    counts = transition_counts(snapshots.segment_codes[:, start], snapshots.segment_codes[:, end])
+    return _as_frame(counts, normalize)
+
+
+def create_segment_transitions(snapshots: RFMSnapshots) -> pd.DataFrame:
+    """
+    Transition counts between every pair of consecutive snapshots
+    
+    All periods are counted in one bincount by offsetting each period's
+    packed pairs, and the result is kept in long form for saving and
+    plotting.
+    
+    Parameters:
+    -----------
+    snapshots : RFMSnapshots
+        Snapshots at two or more dates
+    
+    Returns:
+    --------
+    pd.DataFrame : FromDate, ToDate, FromSegment, ToSegment, Customers and
+                   Share (of the from-segment's customers) for every
+                   transition that occurred
+    
+    Example:
+    --------
+    >>> transitions = create_segment_transitions(snapshots)
+    >>> transitions[transitions['FromSegment'] == 'Champions']
+    """
+    codes = snapshots.segment_codes.astype(np.int64) + 1
+    n_states = len(STATES)
+    n_periods = codes.shape[1] - 1
+    if n_periods < 1:
+        logger.warning("⚠️  Segment transitions need at least two snapshots")
+        return pd.DataFrame(columns=['FromDate', 'ToDate', 'FromSegment', 'ToSegment', 'Customers', 'Share'])
+    
+    period_offsets = np.arange(n_periods, dtype=np.int64) * n_states * n_states
+    pairs = codes[:, :-1] * n_states + codes[:, 1:] + period_offsets
+    counts = np.bincount(pairs.ravel(), minlength=n_periods * n_states * n_states)
+    counts = counts.reshape(n_periods, n_states, n_states)
+    
+    period, from_state, to_state = np.nonzero(counts)
+    customers = counts[period, from_state, to_state]
+    from_totals = counts.sum(axis=2)[period, from_state]
+    
+    states = np.array(STATES, dtype=object)
+    transitions = pd.DataFrame({
+        'FromDate': snapshots.as_of_dates[period],
+        'ToDate': snapshots.as_of_dates[period + 1],
+        'FromSegment': states[from_state],
+        'ToSegment': states[to_state],
+        'Customers': customers,
+        'Share': customers / from_totals
+    })
+    
+    moved = transitions.loc[transitions['FromSegment'] != transitions['ToSegment'], 'Customers'].sum()
+    logger.info(f"✅ Segment transitions: {n_periods} periods, {moved:,} segment changes")
+    return transitions
+
+
+def customer_segment_movement(snapshots: RFMSnapshots, from_date=None, to_date=None,
+                              changed_only: bool = False) -> pd.DataFrame:
+    """
+    Each customer's segment at two dates and the direction of the move
+    
+    Segments are ranked from Champions (best) to Lost Customers, so a move
+    towards Champions is an upgrade.
+    
+    Parameters:
+    -----------
+    snapshots : RFMSnapshots
+        Snapshots from create_rfm_snapshots() or RFMSnapshots.load()
+    from_date : str or Timestamp
+        Earlier date (default: first snapshot)
+    to_date : str or Timestamp
+        Later date (default: last snapshot)
+    changed_only : bool
+        Only return customers whose segment changed (including new customers)
+    
+    Returns:
+    --------
+    pd.DataFrame : CustomerID, FromSegment, ToSegment, Movement ('New',
+                   'Upgraded', 'Downgraded', 'Unchanged') and SegmentChange
+                   (positive = steps towards Champions) for customers who
+                   had purchased by the later date
+    
+    Example:
+    --------
+    >>> movement = customer_segment_movement(snapshots, '2011-06-01', '2011-12-01')
+    >>> movement[(movement['FromSegment'] == 'Champions') & (movement['Movement'] == 'Downgraded')]
+    """
+    start, end = _positions(snapshots, from_date, to_date)
+    from_codes = snapshots.segment_codes[:, start]
+    to_codes = snapshots.segment_codes[:, end]
+    
+    keep = to_codes >= 0
+    if changed_only:
+        keep &= from_codes != to_codes
+    from_codes, to_codes = from_codes[keep], to_codes[keep]
+    
+    change = from_codes.astype(np.int16) - to_codes
+    movement = np.select([from_codes < 0, change > 0, change < 0], ['New', 'Upgraded', 'Downgraded'],
+                         default='Unchanged')
+    
+    states = np.array(STATES, dtype=object)
+    return pd.DataFrame({
+        snapshots.customer_col: snapshots.customer_ids[keep],
+        'FromSegment': states[from_codes + 1],
+        'ToSegment': states[to_codes + 1],
+        'Movement': movement,
+        'SegmentChange': np.where(from_codes < 0, 0, change)
+    })
+
+
+def _positions(snapshots: RFMSnapshots, from_date, to_date):
+    """Snapshot positions for a date range, defaulting to the first and last snapshot"""
+    if len(snapshots) == 0:
+        raise ValueError("No snapshots to compare")
+    start = 0 if from_date is None else snapshots._date_position(from_date)
+    end = len(snapshots) - 1 if to_date is None else snapshots._date_position(to_date)
+    if start < 0 or end < 0:
+        raise ValueError(f"No snapshot on or before {from_date if start < 0 else to_date}")
+    if start > end:
+        raise ValueError(f"from_date ({from_date}) is after to_date ({to_date})")
+    return start, end
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    snapshots = RFMSnapshots.load(config['paths']['data']['rfm_snapshots'])
+    
+    logger.info(f"Segment migration, first to last snapshot:\n"
+                f"{segment_transition_matrix(snapshots, normalize=True).round(3)}")
+    movement = customer_segment_movement(snapshots, changed_only=True)
+    logger.info(f"Movement summary:\n{movement['Movement'].value_counts()}")
@@ -0,0 +1,310 @@
+"""
+Point-in-Time RFM Snapshots for E-Commerce Analysis
+Customer metrics, RFM scores and segments at many as-of dates in one sweep,
+with "segment as of date D" queries
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from loguru import logger
+from typing import Iterable, Optional
+
+try:
+    from .utils import ensure_datetime, LogSummary, load_data, save_data
+    from .feature_engineering import CUSTOMER_SEGMENTS, create_rfm_scores, create_customer_segments
+except ImportError:
+    from utils import ensure_datetime, LogSummary, load_data, save_data
+    from feature_engineering import CUSTOMER_SEGMENTS, create_rfm_scores, create_customer_segments
+
+NS_PER_DAY = 86_400 * 10 ** 9
+
+# Sentinels for "no purchase yet" in the int64 nanosecond first/last purchase state
+_NO_FIRST = np.iinfo(np.int64).max
+_NO_LAST = np.iinfo(np.int64).min
+
+
+def snapshot_dates(df: pd.DataFrame, freq: str = 'MS', date_col: str = 'InvoiceDate') -> pd.DatetimeIndex:
+    """
+    Regular as-of dates covering the data
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    freq : str
+        Pandas offset alias ('MS' = month starts, 'W-MON' = weekly)
+    date_col : str
+        Date column name
+    
+    Returns:
+    --------
+    pd.DatetimeIndex : Dates after the first transaction, up to the first
+                       date after the last one (which covers all data)
+    
+    Example:
+    --------
+    >>> snapshot_dates(df_clean, 'MS')   # 2009-12-01 data -> 2010-01-01 ... 2011-01-01
+    """
+    ensure_datetime(df, date_col)
+    first, last = df[date_col].min(), df[date_col].max()
+    offset = pd.tseries.frequencies.to_offset(freq)
+    return pd.date_range(first.floor('D') + offset, last.floor('D') + offset, freq=freq)
+
+
+def create_rfm_snapshots(df: pd.DataFrame, as_of_dates: Iterable, customer_col: str = 'CustomerID',
+                         date_col: str = 'InvoiceDate') -> 'RFMSnapshots':
+    """
+    Compute customer metrics, RFM scores and segments at each as-of date
+    
+    Transactions are sorted by date once and swept forward, folding each
+    window between consecutive as-of dates into per-customer running totals
+    (orders, revenue, items, lines, first and last purchase) with bincount.
+    Each snapshot equals create_customer_metrics() on the transactions
+    before the as-of date with analysis_date set to it, followed by
+    create_rfm_scores() and create_customer_segments().
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Cleaned transactions (TotalPrice, or Quantity and UnitPrice)
+    as_of_dates : iterable
+        Snapshot dates; each snapshot covers transactions strictly before it
+    customer_col : str
+        Customer ID column name
+    date_col : str
+        Date column name
+    
+    Returns:
+    --------
+    RFMSnapshots : All snapshots, queryable by date
+    
+    Example:
+    --------
+    >>> snapshots = create_rfm_snapshots(df_clean, snapshot_dates(df_clean, 'MS'))
+    >>> snapshots.segment_as_of(17850, '2010-06-15')
+    'Champions'
+    """
+    as_of_dates = pd.DatetimeIndex(sorted(set(pd.to_datetime(list(as_of_dates)))))
+    ensure_datetime(df, date_col)
+    logger.info(f"📊 Creating RFM snapshots at {len(as_of_dates)} dates...")
+    
+    data = df[df[customer_col].notna() & df[date_col].notna()]
+    dates = data[date_col].values.astype('datetime64[ns]').view(np.int64)
+    order = np.argsort(dates, kind='stable')
+    dates = dates[order]
+    
+    codes, customer_ids = pd.factorize(data[customer_col], sort=True)
+    codes = codes[order]
+    n_customers = len(customer_ids)
+    
+    revenue = (data['TotalPrice'] if 'TotalPrice' in data.columns
+               else data['Quantity'] * data['UnitPrice']).values[order].astype(float)
+    quantity = data['Quantity'].values[order]
+    
+    # A line opens a new order when it is the first (in time) for its customer and invoice
+    invoice_codes = pd.factorize(data['InvoiceNo'])[0][order]
+    pairs = codes.astype(np.int64) * (invoice_codes.max() + 1 if len(invoice_codes) else 1) + invoice_codes
+    new_order = np.zeros(len(pairs), dtype=bool)
+    new_order[np.unique(pairs, return_index=True)[1]] = True
+    
+    # Running per-customer state
+    orders = np.zeros(n_customers, dtype=np.int64)
+    lines = np.zeros(n_customers, dtype=np.int64)
+    total_revenue = np.zeros(n_customers)
+    total_items = np.zeros(n_customers)
+    first = np.full(n_customers, _NO_FIRST, dtype=np.int64)
+    last = np.full(n_customers, _NO_LAST, dtype=np.int64)
+    
+    cuts = np.searchsorted(dates, as_of_dates.values.astype('datetime64[ns]').view(np.int64), side='left')
+    frames = []
+    start = 0
+    
+    # Per-snapshot scoring logs are folded into one summary line
+    with LogSummary("RFM snapshots", silence=[create_rfm_scores.__module__]) as summary:
+        for as_of, cut in zip(as_of_dates, cuts):
+            window = codes[start:cut]
+            orders += np.bincount(window[new_order[start:cut]], minlength=n_customers)
+            lines += np.bincount(window, minlength=n_customers)
+            total_revenue += np.bincount(window, weights=revenue[start:cut], minlength=n_customers)
+            total_items += np.bincount(window, weights=quantity[start:cut], minlength=n_customers)
+            
+            # Dates are sorted: first line in the window for new customers, last line for all
+            seen, first_index = np.unique(window, return_index=True)
+            unseen = first[seen] == _NO_FIRST
+            first[seen[unseen]] = dates[start + first_index[unseen]]
+            seen, last_index = np.unique(window[::-1], return_index=True)
+            last[seen] = dates[cut - 1 - last_index]
+            start = cut
+            
+            active = np.flatnonzero(lines > 0)
+            if len(active) == 0:
+                continue
+            
+            frame = _snapshot_frame(as_of, customer_ids[active], orders[active], lines[active],
+                                    total_revenue[active], total_items[active], first[active],
+                                    last[active], customer_col, quantity.dtype)
+            frame = create_customer_segments(create_rfm_scores(frame))
+            frames.append(frame)
+            summary.add(customers=len(frame))
+    
+    snapshots = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['AsOfDate', customer_col])
+    return RFMSnapshots(snapshots, customer_col)
+
+
+def _snapshot_frame(as_of: pd.Timestamp, customer_ids, orders, lines, revenue, items,
+                    first, last, customer_col: str, quantity_dtype) -> pd.DataFrame:
+    """Customer metrics at one as-of date, with the columns of create_customer_metrics()"""
+    tenure_days = (last - first) // NS_PER_DAY
+    frame = pd.DataFrame({
+        'AsOfDate': as_of,
+        customer_col: customer_ids,
+        'TotalOrders': orders,
+        'CustomerLifetimeValue': revenue,
+        'AvgBasketValue': revenue / lines,
+        'TotalItemsPurchased': items.astype(quantity_dtype) if quantity_dtype.kind in 'iu' else items,
+        'FirstPurchase': first.view('datetime64[ns]'),
+        'LastPurchase': last.view('datetime64[ns]'),
+        'CustomerTenure_Days': tenure_days,
+        'Recency_Days': (as_of.value - last) // NS_PER_DAY,
+    })
+    frame['IsRepeatCustomer'] = (frame['TotalOrders'] > 1).astype(int)
+    frame['PurchaseFrequency'] = frame['TotalOrders'] / ((tenure_days + 1) / 30)
+    return frame
+
+
+class RFMSnapshots:
+    """
+    RFM snapshots at a sorted set of as-of dates
+    
+    Besides the long table of all snapshots, segments are kept as an int8
+    matrix (customers × dates, -1 before a customer's first purchase) for
+    point-in-time lookups and segment migration analysis.
+    
+    Example:
+    --------
+    >>> snapshots = RFMSnapshots.load('data/rfm_snapshots.csv')
+    >>> snapshots.segment_as_of(17850, '2010-06-15')
+    >>> june = snapshots.snapshot('2010-06-30')
+    """
+    
+    def __init__(self, snapshots: pd.DataFrame, customer_col: str = 'CustomerID'):
+        """
+        Initialize from a long table of snapshots
+        
+        Parameters:
+        -----------
+        snapshots : pd.DataFrame
+            One row per (AsOfDate, customer) with a CustomerSegment column
+        customer_col : str
+            Customer ID column name
+        """
+        self.snapshots = snapshots
+        self.customer_col = customer_col
+        
+        date_codes, as_of_dates = pd.factorize(pd.DatetimeIndex(snapshots['AsOfDate']), sort=True)
+        customer_codes, customer_ids = pd.factorize(snapshots[customer_col], sort=True)
+        self.as_of_dates = pd.DatetimeIndex(as_of_dates)
+        self.customer_ids = np.asarray(customer_ids)
+        
+        self.segment_codes = np.full((len(customer_ids), len(as_of_dates)), -1, dtype=np.int8)
+        if 'CustomerSegment' in snapshots.columns:
+            segments = pd.Categorical(snapshots['CustomerSegment'], categories=CUSTOMER_SEGMENTS).codes
+            self.segment_codes[customer_codes, date_codes] = segments
+    
+    def __len__(self) -> int:
+        return len(self.as_of_dates)
+    
+    def _date_position(self, as_of) -> int:
+        """Position of the latest snapshot on or before a date (-1 if none)"""
+        return int(np.searchsorted(self.as_of_dates.values, np.datetime64(pd.Timestamp(as_of)), side='right')) - 1
+    
+    def snapshot(self, as_of) -> pd.DataFrame:
+        """
+        The snapshot in effect at a date (the latest one on or before it)
+        
+        Parameters:
+        -----------
+        as_of : str or Timestamp
+            Query date
+        
+        Returns:
+        --------
+        pd.DataFrame : Customer metrics and segments (empty before the first snapshot)
+        """
+        position = self._date_position(as_of)
+        if position < 0:
+            return self.snapshots.iloc[0:0]
+        return self.snapshots[self.snapshots['AsOfDate'] == self.as_of_dates[position]]
+    
+    def segment_as_of(self, customer_id, as_of) -> Optional[str]:
+        """
+        A customer's segment at a date
+        
+        Parameters:
+        -----------
+        customer_id : int or float
+            Customer ID
+        as_of : str or Timestamp
+            Query date
+        
+        Returns:
+        --------
+        str : Segment, or None if the customer had not purchased yet or is unknown
+        """
+        position = self._date_position(as_of)
+        row = int(np.searchsorted(self.customer_ids, customer_id))
+        if position < 0 or row >= len(self.customer_ids) or self.customer_ids[row] != customer_id:
+            return None
+        code = self.segment_codes[row, position]
+        return CUSTOMER_SEGMENTS[code] if code >= 0 else None
+    
+    def segments_as_of(self, as_of) -> pd.Series:
+        """
+        Segment of every customer at a date
+        
+        Parameters:
+        -----------
+        as_of : str or Timestamp
+            Query date
+        
+        Returns:
+        --------
+        pd.Series : Segment per customer who had purchased by then, indexed by customer ID
+        """
+        position = self._date_position(as_of)
+        if position < 0:
+            return pd.Series(dtype=object, name='CustomerSegment')
+        codes = self.segment_codes[:, position]
+        known = codes >= 0
+        return pd.Series(np.array(CUSTOMER_SEGMENTS, dtype=object)[codes[known]],
+                         index=pd.Index(self.customer_ids[known], name=self.customer_col),
+                         name='CustomerSegment')
+    
+    def save(self, file_path: str) -> None:
+        """Save all snapshots as one CSV"""
+        save_data(self.snapshots, file_path)
+    
+    @classmethod
+    def load(cls, file_path: str, customer_col: str = 'CustomerID') -> 'RFMSnapshots':
+        """Load snapshots saved with save()"""
+        snapshots = load_data(file_path, parse_dates=['AsOfDate', 'FirstPurchase', 'LastPurchase'])
+        return cls(snapshots, customer_col)
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging
+    
+    setup_logging()
+    config = load_config()
+    
+    df_clean = load_data(config['paths']['data']['cleaned'], parse_dates=['InvoiceDate'])
+    freq = config['feature_params']['snapshots']['freq']
+    
+    snapshots = create_rfm_snapshots(df_clean, snapshot_dates(df_clean, freq))
+    snapshots.save(config['paths']['data']['rfm_snapshots'])
+    
+    logger.info(f"Segments on 2010-06-15:\n{snapshots.segments_as_of('2010-06-15').value_counts()}")
@@ -0,0 +1,277 @@
+"""
+Streaming Statistics for E-Commerce Data
+Mergeable quantile sketch and running moments for chunked or partitioned data
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from loguru import logger
+from typing import Iterable, Tuple, Union
+
+# Ratio between the capacities of consecutive KLL compactor levels
+KLL_CAPACITY_DECAY = 2 / 3
+
+
+class RunningMoments:
+    """
+    Running count, mean and variance (Welford), mergeable across chunks
+    
+    Each chunk is summarised with vectorized numpy and folded in with the
+    parallel update of Chan et al., which is numerically stable and gives the
+    same result whatever the chunking.
+    
+    Example:
+    --------
+    >>> moments = RunningMoments()
+    >>> for chunk in pd.read_csv(path, chunksize=100_000):
+    ...     moments.update(chunk['UnitPrice'])
+    >>> moments.mean, moments.std()
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+    
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        """Fold in the moments of another batch"""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+    
+    def update(self, values: Union[np.ndarray, pd.Series]) -> 'RunningMoments':
+        """
+        Add a batch of values (missing values are ignored)
+        
+        Parameters:
+        -----------
+        values : array-like
+            Numeric values
+        
+        Returns:
+        --------
+        RunningMoments : self, for chaining
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            mean = values.mean()
+            self._combine(len(values), mean, float(((values - mean) ** 2).sum()))
+        return self
+    
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """Merge moments computed on another partition into this one"""
+        self._combine(other.count, other.mean, other._m2)
+        return self
+    
+    def variance(self, ddof: int = 0) -> float:
+        """Variance with the given delta degrees of freedom"""
+        if self.count - ddof <= 0:
+            return np.nan
+        return self._m2 / (self.count - ddof)
+    
+    def std(self, ddof: int = 0) -> float:
+        """Standard deviation with the given delta degrees of freedom"""
+        return float(np.sqrt(self.variance(ddof)))
+
+
+class KLLSketch:
+    """
+    KLL quantile sketch, mergeable across chunks and partitions
+    
+    Values are held in a hierarchy of compactors; when a level overflows it
+    is sorted and every other item (random offset) is promoted to the next
+    level with double weight. Memory stays O(k) and the rank error of a
+    quantile is roughly 1.7 / k of the count (k=200 ≈ 1%). Until the first
+    compaction the sketch is exact.
+    
+    Example:
+    --------
+    >>> sketch = KLLSketch(k=400)
+    >>> for chunk in pd.read_csv(path, chunksize=100_000):
+    ...     sketch.update(chunk['Quantity'])
+    >>> q1, q3 = sketch.quantiles([0.25, 0.75])
+    """
+    
+    def __init__(self, k: int = 200, seed: int = None):
+        """
+        Initialize the sketch
+        
+        Parameters:
+        -----------
+        k : int
+            Accuracy knob: capacity of the top compactor (larger = more accurate)
+        seed : int
+            Random seed for compaction offsets (for reproducible results)
+        """
+        if k < 2:
+            raise ValueError(f"k must be at least 2, got {k}")
+        self.k = k
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._compactors = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+    
+    def _capacity(self, level: int) -> int:
+        """Capacity of a compactor level; lower levels hold fewer items"""
+        depth = len(self._compactors) - level - 1
+        return max(int(np.ceil(self.k * KLL_CAPACITY_DECAY ** depth)), 2)
+    
+    def _compress(self) -> None:
+        """Compact every level that is over capacity, bottom up"""
+        level = 0
+        while level < len(self._compactors):
+            items = self._compactors[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append(np.empty(0))
+                items = np.sort(items)
+                # With an odd count the largest item stays at this level
+                odd = len(items) % 2
+                promoted = items[self._rng.integers(2):len(items) - odd:2]
+                self._compactors[level] = items[len(items) - odd:]
+                self._compactors[level + 1] = np.concatenate([self._compactors[level + 1], promoted])
+            level += 1
+    
+    def update(self, values: Union[np.ndarray, pd.Series]) -> 'KLLSketch':
+        """
+        Add a batch of values (missing values are ignored)
+        
+        Parameters:
+        -----------
+        values : array-like
+            Numeric values
+        
+        Returns:
+        --------
+        KLLSketch : self, for chaining
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        
+        self.count += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compactors[0] = np.concatenate([self._compactors[0], values])
+        self._compress()
+        return self
+    
+    def merge(self, other: 'KLLSketch') -> 'KLLSketch':
+        """Merge a sketch built on another partition into this one"""
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append(np.empty(0))
+        for level, items in enumerate(other._compactors):
+            self._compactors[level] = np.concatenate([self._compactors[level], items])
+        
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+    
+    def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+        """
+        Approximate quantiles
+        
+        Parameters:
+        -----------
+        qs : iterable of float
+            Quantile levels between 0 and 1
+        
+        Returns:
+        --------
+        np.ndarray : Quantile estimates (NaN for an empty sketch)
+        """
+        qs = np.asarray(list(qs), dtype=float)
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        
+        items = np.concatenate(self._compactors)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level) for level, level_items in enumerate(self._compactors)
+        ])
+        order = np.argsort(items, kind='mergesort')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        
+        # Item whose cumulative weight first reaches the requested rank
+        positions = np.searchsorted(cumulative, qs * cumulative[-1], side='left')
+        estimates = items[np.clip(positions, 0, len(items) - 1)]
+        estimates[qs <= 0] = self.min
+        estimates[qs >= 1] = self.max
+        return estimates
+    
+    def quantile(self, q: float) -> float:
+        """Approximate quantile for a single level"""
+        return float(self.quantiles([q])[0])
+    
+    def __len__(self) -> int:
+        """Number of items retained (memory footprint)"""
+        return sum(len(items) for items in self._compactors)
+
+
+def compute_outlier_bounds(chunks: Iterable[Union[pd.DataFrame, pd.Series]], column: str = None,
+                           method: str = 'iqr', threshold: float = 1.5,
+                           k: int = 200, seed: int = None) -> Tuple[float, float]:
+    """
+    Compute outlier bounds in one streaming pass over chunks
+    
+    Parameters:
+    -----------
+    chunks : iterable of pd.DataFrame or pd.Series
+        Chunks of data, e.g. pd.read_csv(..., chunksize=100_000)
+    column : str
+        Column to check (ignored when chunks are Series)
+    method : str
+        'iqr' (KLL-sketched quartiles) or 'zscore' (running mean and std)
+    threshold : float
+        Threshold for outlier detection (1.5 for IQR, 3 for Z-score)
+    k : int
+        Sketch accuracy knob for 'iqr' (rank error ≈ 1.7 / k)
+    seed : int
+        Random seed for the sketch
+    
+    Returns:
+    --------
+    tuple : (lower bound, upper bound), to pass to handle_outliers(bounds=...)
+    
+    Example:
+    --------
+    >>> chunks = pd.read_csv(path, chunksize=100_000, encoding='latin1')
+    >>> bounds = compute_outlier_bounds(chunks, 'UnitPrice', method='iqr')
+    """
+    if method == 'iqr':
+        stats = KLLSketch(k=k, seed=seed)
+    elif method == 'zscore':
+        stats = RunningMoments()
+    else:
+        raise ValueError(f"Unknown outlier method: {method}")
+    
+    n_chunks = 0
+    for chunk in chunks:
+        values = chunk if isinstance(chunk, pd.Series) else chunk[column]
+        stats.update(values.values)
+        n_chunks += 1
+    
+    if method == 'iqr':
+        q1, q3 = stats.quantiles([0.25, 0.75])
+        iqr = q3 - q1
+        lower_bound, upper_bound = q1 - threshold * iqr, q3 + threshold * iqr
+    else:
+        std = stats.std()
+        lower_bound, upper_bound = stats.mean - threshold * std, stats.mean + threshold * std
+    
+    logger.info(f"📊 {method.upper()} bounds for {column or 'values'} from {n_chunks:,} chunks "
+                f"({stats.count:,} values): [{lower_bound:,.2f}, {upper_bound:,.2f}]")
+    
+    return float(lower_bound), float(upper_bound)
@@ -0,0 +1,189 @@
+"""
+Time-Indexed Transaction View for E-Commerce Data
+Date range slicing by binary search over transactions sorted by date
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import pandas as pd
+import numpy as np
+from loguru import logger
+from typing import Iterator, Tuple
+
+try:
+    from .utils import ensure_datetime
+except ImportError:
+    from utils import ensure_datetime
+
+
+def is_sorted_by(df: pd.DataFrame, date_col: str = 'InvoiceDate') -> bool:
+    """
+    Check whether a dataframe is sorted ascending by a date column
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Transaction dataframe
+    date_col : str
+        Date column name
+    
+    Returns:
+    --------
+    bool : True if rows are in ascending date order with no missing dates
+    """
+    # A single O(n) pass; NaT makes the column non-monotonic
+    return (pd.api.types.is_datetime64_any_dtype(df[date_col])
+            and df[date_col].is_monotonic_increasing)
+
+
+class TimeIndexedView:
+    """
+    Transactions sorted by date, answering range queries with searchsorted
+    
+    Slices are positional (iloc) views of the sorted frame, so no boolean
+    mask is built and no rows are copied. Copy a slice before modifying it.
+    
+    Example:
+    --------
+    >>> view = TimeIndexedView(df_clean)
+    >>> december = view.slice('2010-12-01', '2010-12-09')
+    """
+    
+    def __init__(self, df: pd.DataFrame, date_col: str = 'InvoiceDate', assume_sorted: bool = False):
+        """
+        Initialize the view
+        
+        Parameters:
+        -----------
+        df : pd.DataFrame
+            Transaction dataframe
+        date_col : str
+            Date column name
+        assume_sorted : bool
+            Skip sorting when the caller knows rows are already in date order
+        """
+        ensure_datetime(df, date_col)
+        
+        dates = df[date_col]
+        if assume_sorted or is_sorted_by(df, date_col):
+            # Sorted rows keep any NaT at the end, so the last value decides
+            # whether a count of missing dates is needed at all
+            n_valid = len(df) if len(df) == 0 or pd.notna(dates.iloc[-1]) else int(dates.notna().sum())
+        else:
+            # Stable sort keeps same-timestamp lines in file order; NaT goes last
+            df = df.sort_values(date_col, kind='mergesort', na_position='last')
+            logger.info(f"🔍 Sorted {len(df):,} rows by {date_col}")
+            dates = df[date_col]
+            n_valid = int(dates.notna().sum())
+        
+        self.df = df
+        self.date_col = date_col
+        
+        # Binary search runs over the int64 keys of the non-missing prefix;
+        # asarray reuses the column's buffer when it is already datetime64[ns]
+        self._n_valid = n_valid
+        self._keys = np.asarray(dates.values[:n_valid], dtype='datetime64[ns]').view(np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.df)
+    
+    @property
+    def date_range(self) -> Tuple[pd.Timestamp, pd.Timestamp]:
+        """First and last non-missing timestamp"""
+        if self._n_valid == 0:
+            return pd.NaT, pd.NaT
+        return pd.Timestamp(self._keys[0]), pd.Timestamp(self._keys[-1])
+    
+    def bounds(self, start_date=None, end_date=None) -> Tuple[int, int]:
+        """
+        Positional bounds of rows with start_date <= date <= end_date
+        
+        Parameters:
+        -----------
+        start_date : str or Timestamp
+            Inclusive lower bound (None = unbounded)
+        end_date : str or Timestamp
+            Inclusive upper bound (None = unbounded)
+        
+        Returns:
+        --------
+        tuple : (first row, one past last row)
+        """
+        lo = 0 if start_date is None else int(
+            np.searchsorted(self._keys, pd.Timestamp(start_date).value, side='left'))
+        hi = self._n_valid if end_date is None else int(
+            np.searchsorted(self._keys, pd.Timestamp(end_date).value, side='right'))
+        return lo, max(lo, hi)
+    
+    def slice(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Rows with start_date <= date <= end_date
+        
+        Parameters:
+        -----------
+        start_date : str or Timestamp
+            Inclusive lower bound (None = unbounded)
+        end_date : str or Timestamp
+            Inclusive upper bound (None = unbounded)
+        
+        Returns:
+        --------
+        pd.DataFrame : Positional view of the sorted frame
+        
+        Example:
+        --------
+        >>> q4 = view.slice('2010-10-01', '2010-12-31 23:59:59')
+        """
+        lo, hi = self.bounds(start_date, end_date)
+        return self.df.iloc[lo:hi]
+    
+    def count(self, start_date=None, end_date=None) -> int:
+        """Number of rows in the date range, without materializing them"""
+        lo, hi = self.bounds(start_date, end_date)
+        return hi - lo
+    
+    def windows(self, freq: str = 'MS') -> Iterator[Tuple[pd.Timestamp, pd.DataFrame]]:
+        """
+        Iterate over consecutive calendar windows
+        
+        Parameters:
+        -----------
+        freq : str
+            Pandas offset alias for window starts ('MS' = month start, 'W-MON' = weekly)
+        
+        Returns:
+        --------
+        iterator : (window start, rows in [start, next start)) pairs
+        
+        Example:
+        --------
+        >>> for month_start, month_df in view.windows('MS'):
+        ...     print(month_start, month_df['TotalPrice'].sum())
+        """
+        first, last = self.date_range
+        if pd.isna(first):
+            return
+        
+        # Roll back so the first window contains the first transaction
+        offset = pd.tseries.frequencies.to_offset(freq)
+        starts = pd.date_range(offset.rollback(first.floor('D')), last, freq=freq)
+        
+        edges = np.searchsorted(self._keys, starts.values.view(np.int64), side='left')
+        edges = np.append(edges, self._n_valid)
+        for start, lo, hi in zip(starts, edges[:-1], edges[1:]):
+            yield start, self.df.iloc[lo:hi]
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging, load_data
+    
+    setup_logging()
+    config = load_config()
+    
+    df_clean = load_data(config['paths']['data']['cleaned'])
+    view = TimeIndexedView(df_clean)
+    
+    for month_start, month_df in view.windows('MS'):
+        logger.info(f"{month_start:%Y-%m}: {len(month_df):,} rows")
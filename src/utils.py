@@ -6,13 +6,47 @@ Author: Hamza Khan
 Date: December 18, 2024
 """
 
-import pandas as pd
+from __future__ import annotations
+
+import os
+import shutil
+import time
 import yaml
 from pathlib import Path
-from loguru import logger
-from typing import Dict, Any, List, Union
+from typing import Dict, Any, List, Optional, Union
 import sys
 
+try:
+    from .lazy_imports import lazy_import
+except ImportError:
+    from lazy_imports import lazy_import
+
+# Loaded on first use, so reading the config does not pay for pandas or loguru
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+logger = lazy_import('loguru', 'logger')
+
+# Keys every pipeline configuration must define
+REQUIRED_CONFIG_KEYS = [
+    'paths.data.raw',
+    'paths.data.cleaned',
+    'data_params.business_rules',
+    'feature_params',
+]
+
+# Formats tried, in order, when detecting the layout of a date column
+DATETIME_FORMATS = [
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d %H:%M',
+    '%Y-%m-%d',
+    '%m/%d/%Y %H:%M',
+    '%m/%d/%Y %H:%M:%S',
+    '%d/%m/%Y %H:%M',
+    '%d/%m/%Y %H:%M:%S',
+    '%m/%d/%Y',
+    '%d/%m/%Y',
+]
+
 
 def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
     """
@@ -45,7 +79,42 @@ def load_config(config_path: str = "config/config.yaml") -> Dict[str, Any]:
         raise
 
 
-def setup_logging(log_file: str = "logs/analysis.log", level: str = "INFO") -> None:
+def check_config(config: Dict[str, Any], required_keys: List[str] = None) -> List[str]:
+    """
+    Check that a configuration defines the required (dotted) keys
+    
+    Only uses the parsed YAML, so it is cheap enough for --dry-run.
+    
+    Parameters:
+    -----------
+    config : dict
+        Configuration dictionary
+    required_keys : list
+        Dotted key paths (None = REQUIRED_CONFIG_KEYS)
+    
+    Returns:
+    --------
+    list : Missing keys (empty when the configuration is complete)
+    
+    Example:
+    --------
+    >>> check_config(load_config())
+    []
+    """
+    missing = []
+    for key in required_keys or REQUIRED_CONFIG_KEYS:
+        node = config
+        for part in key.split('.'):
+            if not isinstance(node, dict) or part not in node:
+                missing.append(key)
+                break
+            node = node[part]
+    
+    return missing
+
+
+def setup_logging(log_file: str = "logs/analysis.log", level: str = "INFO",
+                  enqueue: bool = False) -> None:
     """
     Configure logging for the project
     
@@ -55,6 +124,13 @@ def setup_logging(log_file: str = "logs/analysis.log", level: str = "INFO") -> N
         Path to log file
     level : str
         Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+    enqueue : bool
+        Hand records to a background writer thread instead of writing to
+        stdout and the log file on the calling thread
+    
+    Example:
+    --------
+    >>> setup_logging(level=config['logging']['level'], enqueue=config['logging']['enqueue'])
     """
     # Remove default logger
     logger.remove()
@@ -64,7 +140,8 @@ def setup_logging(log_file: str = "logs/analysis.log", level: str = "INFO") -> N
         sys.stdout,
         format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>",
         level=level,
-        colorize=True
+        colorize=True,
+        enqueue=enqueue
     )
     
     # Add file logger
@@ -74,10 +151,106 @@ def setup_logging(log_file: str = "logs/analysis.log", level: str = "INFO") -> N
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function} - {message}",
         level=level,
         rotation="10 MB",
-        retention="30 days"
+        retention="30 days",
+        enqueue=enqueue
     )
     
-    logger.info(f"✅ Logging configured: {log_file}")
+    logger.info("✅ Logging configured: {}{}", log_file, " (background writer)" if enqueue else "")
+
+
+class LogSummary:
+    """
+    Aggregate counts from a hot loop into one log line
+    
+    Inside the block, records from the silenced modules are dropped before
+    they are formatted, so per-chunk calls to functions that log every call
+    cost nothing; the summary is logged once on exit.
+    
+    Example:
+    --------
+    >>> with LogSummary("Cleaning chunks", silence=['src.data_cleaning']) as summary:
+    ...     for chunk in chunks:
+    ...         cleaned = remove_cancelled_orders(chunk)
+    ...         summary.add(rows=len(chunk), kept=len(cleaned))
+    """
+    
+    def __init__(self, title: str, silence: List[str] = None, level: str = "INFO"):
+        """
+        Initialize the summary
+        
+        Parameters:
+        -----------
+        title : str
+            Label for the summary line
+        silence : list
+            Logger names (modules or packages) to silence inside the block
+        level : str
+            Level of the summary line
+        """
+        self.title = title
+        self.silence = silence or []
+        self.level = level
+        self.batches = 0
+        self.totals = {}
+    
+    def add(self, **counts: float) -> None:
+        """Add the counts of one batch"""
+        self.batches += 1
+        for key, value in counts.items():
+            self.totals[key] = self.totals.get(key, 0) + value
+    
+    def __enter__(self) -> 'LogSummary':
+        for name in self.silence:
+            logger.disable(name)
+        self._start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self._start
+        for name in self.silence:
+            logger.enable(name)
+        
+        totals = ", ".join(f"{key}: {value:,}" for key, value in self.totals.items())
+        logger.log(self.level, "📊 {}: {:,} batches in {:.2f}s{}", self.title, self.batches,
+                   elapsed, f" ({totals})" if totals else "")
+
+
+def source_version(file_path: str) -> str:
+    """Cheap version of a file: its resolved path, size and modification time"""
+    stat = Path(file_path).stat()
+    return f"{Path(file_path).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def set_dataset_version(df: pd.DataFrame, version: str) -> pd.DataFrame:
+    """
+    Record the version of the data a dataframe holds, e.g. its source file's
+    
+    Query caches key the frame by this version instead of hashing its
+    values. The version belongs to this object only: copies and derived
+    frames, which pandas gives the same attrs, have no version, and a frame
+    changed in place must be given a new one.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataframe to tag
+    version : str
+        Version text, e.g. from source_version()
+    
+    Returns:
+    --------
+    pd.DataFrame : The same dataframe
+    """
+    df.attrs['dataset_version'] = (id(df), version)
+    return df
+
+
+def dataset_version(data) -> Optional[str]:
+    """Version recorded with set_dataset_version() for this object, or None"""
+    entry = data.attrs.get('dataset_version')
+    if entry is not None and entry[0] == id(data):
+        return entry[1]
+    return None
 
 
 def load_data(file_path: str, **kwargs) -> pd.DataFrame:
@@ -92,7 +265,8 @@ def load_data(file_path: str, **kwargs) -> pd.DataFrame:
     
     Returns:
     --------
-    pd.DataFrame : Loaded dataframe
+    pd.DataFrame : Loaded dataframe, versioned by the file's path, size and
+                   modification time (see set_dataset_version)
     
     Example:
     --------
@@ -100,6 +274,7 @@ def load_data(file_path: str, **kwargs) -> pd.DataFrame:
     """
     try:
         df = pd.read_csv(file_path, **kwargs)
+        set_dataset_version(df, f"{source_version(file_path)}|{sorted(kwargs.items())!r}")
         logger.info(f"✅ Data loaded: {file_path} ({df.shape[0]:,} rows × {df.shape[1]} columns)")
         return df
     except FileNotFoundError:
@@ -133,7 +308,122 @@ def save_data(df: pd.DataFrame, file_path: str, **kwargs) -> None:
         raise
 
 
-def print_dataframe_info(df: pd.DataFrame, name: str = "DataFrame") -> None:
+def replace_directory(temp_dir: Union[str, Path], directory: Union[str, Path]) -> None:
+    """
+    Move a fully written directory into place of an existing one
+    
+    The current directory is renamed aside to <name>.old before the new one
+    is renamed in, and deleted only afterwards, so a crash at any point
+    leaves a complete copy on disk (the old one under <name>.old if the
+    swap did not finish).
+    
+    Parameters:
+    -----------
+    temp_dir : str or Path
+        Completely written replacement, on the same filesystem
+    directory : str or Path
+        Final location (created if it does not exist)
+    
+    Example:
+    --------
+    >>> replace_directory('data/customer_index.tmp', 'data/customer_index')
+    """
+    directory = Path(directory)
+    old_dir = directory.with_name(directory.name + '.old')
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+    
+    if directory.exists():
+        os.replace(directory, old_dir)
+    os.replace(temp_dir, directory)
+    
+    if old_dir.exists():
+        shutil.rmtree(old_dir)
+
+
+def profile_dataframe(df: pd.DataFrame, sample_threshold: int = None,
+                      sample_size: int = 100000, random_state: int = 42) -> Dict[str, Any]:
+    """
+    Profile a dataframe: nulls, duplicates, memory, dtypes and per-column stats
+    
+    Each column is scanned once for its null count and memory and each
+    numeric column once for min/max/mean; duplicates are counted on 64-bit row
+    hashes instead of comparing all columns. Frames above sample_threshold
+    rows are profiled on a random sample, with counts scaled to the full frame
+    (duplicates are always counted on every row).
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataframe to profile
+    sample_threshold : int
+        Profile a sample when the frame has more rows than this (None = never)
+    sample_size : int
+        Rows in the sample
+    random_state : int
+        Seed for the sample
+    
+    Returns:
+    --------
+    dict : Frame-level metrics plus a 'columns' dataframe of per-column stats
+    
+    Example:
+    --------
+    >>> profile = profile_dataframe(df, sample_threshold=config['data_params']['quality']['profile_sample_threshold'])
+    >>> profile['columns']
+    """
+    n_rows = len(df)
+    sampled = sample_threshold is not None and n_rows > sample_threshold and n_rows > sample_size
+    data = df.sample(sample_size, random_state=random_state) if sampled else df
+    scale = n_rows / len(data) if len(data) else 0.0
+    
+    # One scan per column for nulls and memory
+    null_counts = data.isna().sum() * scale
+    memory_bytes = data.memory_usage(deep=True) * scale
+    index_bytes = memory_bytes.pop('Index')
+    
+    columns = pd.DataFrame({
+        'Column': df.columns,
+        'Dtype': df.dtypes.astype(str).values,
+        'Nulls': null_counts.round().astype(np.int64).values,
+        'NullPct': (null_counts / max(n_rows, 1) * 100).values,
+        'MemoryMB': (memory_bytes / 1024**2).values,
+    })
+    
+    numeric = data.select_dtypes(include=['number'])
+    if not numeric.columns.empty:
+        stats = numeric.agg(['min', 'max', 'mean']).T
+        columns = columns.merge(stats.rename(columns=str.title), left_on='Column',
+                                right_index=True, how='left')
+    
+    # Duplicates on row hashes over the full frame
+    duplicates = int(pd.util.hash_pandas_object(df, index=False).duplicated().sum()) if n_rows else 0
+    
+    missing_values = int(columns['Nulls'].sum())
+    cells = max(n_rows * len(df.columns), 1)
+    dtype_kinds = df.dtypes.map(lambda dtype: dtype.kind)
+    
+    return {
+        'total_rows': n_rows,
+        'total_columns': len(df.columns),
+        'memory_mb': float((memory_bytes.sum() + index_bytes) / 1024**2),
+        'missing_values': missing_values,
+        'missing_percentage': missing_values / cells * 100,
+        'completeness_score': 100 - missing_values / cells * 100,
+        'duplicates': duplicates,
+        'duplicate_percentage': duplicates / max(n_rows, 1) * 100,
+        'numeric_columns': int(dtype_kinds.isin(['i', 'u', 'f', 'c']).sum()),
+        'categorical_columns': int((dtype_kinds == 'O').sum()),
+        'datetime_columns': int((dtype_kinds == 'M').sum()),
+        'dtype_counts': df.dtypes.value_counts(),
+        'sampled': sampled,
+        'sample_rows': len(data),
+        'columns': columns,
+    }
+
+
+def print_dataframe_info(df: pd.DataFrame, name: str = "DataFrame",
+                         profile: Dict[str, Any] = None) -> None:
     """
     Print comprehensive dataframe information
     
@@ -143,21 +433,26 @@ def print_dataframe_info(df: pd.DataFrame, name: str = "DataFrame") -> None:
         Dataframe to analyze
     name : str
         Name of the dataframe for logging
+    profile : dict
+        Result of profile_dataframe(df), reused instead of profiling again (optional)
     """
+    profile = profile if profile is not None else profile_dataframe(df)
+    
     logger.info(f"\n{'='*80}")
     logger.info(f"{name.upper()} INFORMATION")
     logger.info(f"{'='*80}")
-    logger.info(f"Shape: {df.shape[0]:,} rows × {df.shape[1]} columns")
-    logger.info(f"Memory Usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
-    logger.info(f"\nData Types:\n{df.dtypes.value_counts()}")
+    logger.info(f"Shape: {profile['total_rows']:,} rows × {profile['total_columns']} columns")
+    logger.info(f"Memory Usage: {profile['memory_mb']:.2f} MB")
+    logger.info(f"\nData Types:\n{profile['dtype_counts']}")
     
     # Missing values
-    missing = df.isnull().sum()
-    if missing.sum() > 0:
+    columns = profile['columns']
+    missing = columns[columns['Nulls'] > 0]
+    if len(missing) > 0:
         missing_df = pd.DataFrame({
-            'Column': missing[missing > 0].index,
-            'Missing': missing[missing > 0].values,
-            'Percentage': (missing[missing > 0] / len(df) * 100).round(2)
+            'Column': missing['Column'].values,
+            'Missing': missing['Nulls'].values,
+            'Percentage': missing['NullPct'].round(2).values
         })
         logger.info(f"\n⚠️  Missing Values:\n{missing_df.to_string(index=False)}")
     else:
@@ -166,7 +461,8 @@ def print_dataframe_info(df: pd.DataFrame, name: str = "DataFrame") -> None:
     logger.info(f"{'='*80}\n")
 
 
-def get_data_quality_metrics(df: pd.DataFrame) -> Dict[str, Any]:
+def get_data_quality_metrics(df: pd.DataFrame, profile: Dict[str, Any] = None,
+                             sample_threshold: int = None) -> Dict[str, Any]:
     """
     Calculate comprehensive data quality metrics
     
@@ -174,25 +470,23 @@ def get_data_quality_metrics(df: pd.DataFrame) -> Dict[str, Any]:
     -----------
     df : pd.DataFrame
         Dataframe to analyze
+    profile : dict
+        Result of profile_dataframe(df), reused instead of profiling again (optional)
+    sample_threshold : int
+        Profile a sample when the frame has more rows than this (None = never)
     
     Returns:
     --------
     dict : Data quality metrics
     """
-    metrics = {
-        'total_rows': len(df),
-        'total_columns': len(df.columns),
-        'memory_mb': df.memory_usage(deep=True).sum() / 1024**2,
-        'missing_values': df.isnull().sum().sum(),
-        'missing_percentage': (df.isnull().sum().sum() / (len(df) * len(df.columns)) * 100),
-        'duplicates': df.duplicated().sum(),
-        'duplicate_percentage': (df.duplicated().sum() / len(df) * 100),
-        'numeric_columns': len(df.select_dtypes(include=['number']).columns),
-        'categorical_columns': len(df.select_dtypes(include=['object']).columns),
-        'datetime_columns': len(df.select_dtypes(include=['datetime']).columns),
-    }
+    profile = profile if profile is not None else profile_dataframe(df, sample_threshold)
     
-    return metrics
+    keys = [
+        'total_rows', 'total_columns', 'memory_mb', 'missing_values', 'missing_percentage',
+        'completeness_score', 'duplicates', 'duplicate_percentage', 'numeric_columns',
+        'categorical_columns', 'datetime_columns', 'sampled'
+    ]
+    return {key: profile[key] for key in keys}
 
 
 def format_currency(value: float, currency: str = "£") -> str:
@@ -241,6 +535,138 @@ def format_percentage(value: float, decimals: int = 1) -> str:
     return f"{value * 100:.{decimals}f}%"
 
 
+def detect_datetime_format(values: pd.Series, sample_size: int = 1000) -> Optional[str]:
+    """
+    Detect the strptime format of a date column from a sample of its values
+    
+    The sample is spread evenly over the column's distinct values, so data
+    sorted by time is checked across its whole span rather than its first
+    days (which are all valid as both day-first and month-first). If more
+    than one format still parses the sample, ValueError is raised instead of
+    guessing; pass the format explicitly in that case.
+    
+    Parameters:
+    -----------
+    values : pd.Series
+        Date strings
+    sample_size : int
+        Number of distinct non-null values to test
+    
+    Returns:
+    --------
+    str or None : The format in DATETIME_FORMATS that parses every sampled
+                  value (None if no format does)
+    
+    Example:
+    --------
+    >>> detect_datetime_format(pd.Series(['12/1/2009 7:45', '12/13/2009 17:05']))
+    '%m/%d/%Y %H:%M'
+    """
+    uniques = values.dropna().unique()
+    if len(uniques) > sample_size:
+        uniques = uniques[np.unique(np.linspace(0, len(uniques) - 1, sample_size).astype(np.int64))]
+    sample = pd.Series(uniques).astype(str)
+    if sample.empty:
+        return None
+    
+    matches = [fmt for fmt in DATETIME_FORMATS
+               if pd.to_datetime(sample, format=fmt, errors='coerce').notna().all()]
+    if len(matches) > 1:
+        raise ValueError(f"Ambiguous date format in {values.name}: sampled values parse as "
+                         f"{' and '.join(matches)}; pass the format explicitly")
+    
+    return matches[0] if matches else None
+
+
+def parse_datetime(values: pd.Series, fmt: Optional[str] = None) -> pd.Series:
+    """
+    Parse a date column once, using an explicit format
+    
+    Each distinct string is parsed only once and broadcast back to every
+    row, since many lines share the timestamp of their invoice. Values
+    that are already datetime are returned unchanged.
+    
+    Parameters:
+    -----------
+    values : pd.Series
+        Date strings
+    fmt : str
+        strptime format (None = detect from a sample)
+    
+    Returns:
+    --------
+    pd.Series : datetime64 series (unparseable values become NaT, with a
+                warning giving the number of rows)
+    
+    Example:
+    --------
+    >>> df['InvoiceDate'] = parse_datetime(df['InvoiceDate'])
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    
+    if fmt is None:
+        fmt = detect_datetime_format(values)
+    
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    if fmt is not None:
+        parsed = pd.to_datetime(uniques.astype(str), format=fmt, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    
+    # Values outside the detected format fall back to per-value inference
+    failed = parsed.isna()
+    if failed.any():
+        logger.warning(f"⚠️  {failed.sum():,} distinct values in {values.name} "
+                       f"do not match {fmt or 'a known format'}; inferring their format")
+        parsed[failed] = pd.to_datetime(uniques[failed], format='mixed', errors='coerce')
+        unparsed = (codes >= 0) & parsed.isna().values.take(codes, mode='clip')
+        if unparsed.any():
+            logger.warning(f"⚠️  {unparsed.sum():,} rows in {values.name} could not be parsed; "
+                           f"they are set to NaT")
+    
+    # Factorize marks missing values with -1
+    result = np.append(parsed.values, np.datetime64('NaT', 'ns')).take(codes)
+    
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+def ensure_datetime(df: pd.DataFrame, column: str, fmt: Optional[str] = None) -> pd.DataFrame:
+    """
+    Parse a date column in place unless it is already datetime
+    
+    The detected format is recorded in df.attrs['datetime_formats'] so the
+    parse can be reproduced for later batches.
+    
+    Parameters:
+    -----------
+    df : pd.DataFrame
+        Dataframe with date column
+    column : str
+        Name of date column
+    fmt : str
+        strptime format (None = detect from a sample)
+    
+    Returns:
+    --------
+    pd.DataFrame : The same dataframe, with the column parsed
+    
+    Example:
+    --------
+    >>> df = ensure_datetime(df, 'InvoiceDate')
+    """
+    if pd.api.types.is_datetime64_any_dtype(df[column]):
+        return df
+    
+    if fmt is None:
+        fmt = detect_datetime_format(df[column])
+    df[column] = parse_datetime(df[column], fmt)
+    df.attrs.setdefault('datetime_formats', {})[column] = fmt
+    
+    return df
+
+
 def validate_date_range(df: pd.DataFrame, date_column: str, 
                          start_date: str, end_date: str) -> bool:
     """
@@ -261,7 +687,7 @@ def validate_date_range(df: pd.DataFrame, date_column: str,
     --------
     bool : True if range matches
     """
-    df[date_column] = pd.to_datetime(df[date_column])
+    ensure_datetime(df, date_column)
     actual_start = df[date_column].min()
     actual_end = df[date_column].max()
     
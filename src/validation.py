@@ -0,0 +1,257 @@
+"""
+Data Validation for E-Commerce Data
+Compiles the quality thresholds and business rules in config.yaml into
+vectorized column checks evaluated chunk by chunk
+
+Author: Hamza Khan
+Date: December 18, 2024
+"""
+
+import time
+import pandas as pd
+import numpy as np
+from loguru import logger
+from typing import Callable, Dict, Any, List, Iterable, Union
+
+# Columns that must never be missing in cleaned data
+REQUIRED_COLUMNS = ['InvoiceNo', 'StockCode', 'Description', 'Quantity', 'InvoiceDate', 'UnitPrice']
+
+# Default patterns for identifier columns (overridable under data_params.validation.patterns)
+DEFAULT_PATTERNS = {
+    'InvoiceNo': r'^\d{6}$',
+    'StockCode': r'^[0-9A-Za-z_ ]{1,20}$',
+}
+
+
+class DataValidationError(ValueError):
+    """Raised when data fails one or more validation rules"""
+    
+    def __init__(self, message: str, failures: Dict[str, int]):
+        super().__init__(message)
+        self.failures = failures
+
+
+class ValidationRule:
+    """
+    A named row-level check on one column
+    
+    The check receives the column and returns a boolean array that is True
+    for rows that violate the rule.
+    """
+    
+    def __init__(self, name: str, column: str, check: Callable[[pd.Series], np.ndarray],
+                 description: str = ""):
+        self.name = name
+        self.column = column
+        self.check = check
+        self.description = description
+    
+    def __repr__(self) -> str:
+        return f"ValidationRule({self.name!r}: {self.description})"
+
+
+def _range_check(min_value: float = None, max_value: float = None) -> Callable[[pd.Series], np.ndarray]:
+    """Rows outside [min_value, max_value]; missing values are left to the null checks"""
+    def check(values: pd.Series) -> np.ndarray:
+        invalid = np.zeros(len(values), dtype=bool)
+        if min_value is not None:
+            invalid |= (values < min_value).values
+        if max_value is not None:
+            invalid |= (values > max_value).values
+        return invalid
+    return check
+
+
+def _pattern_check(pattern: str) -> Callable[[pd.Series], np.ndarray]:
+    """Rows whose value does not fully match the regex, tested once per distinct value"""
+    def check(values: pd.Series) -> np.ndarray:
+        codes, uniques = pd.factorize(values)
+        if len(uniques) == 0:
+            return np.zeros(len(values), dtype=bool)
+        bad = ~pd.Series(uniques).astype(str).str.fullmatch(pattern).values
+        # Factorize marks missing values with -1; append a slot that never fails
+        return np.append(bad, False)[codes]
+    return check
+
+
+def _null_check(values: pd.Series) -> np.ndarray:
+    """Rows with a missing value"""
+    return values.isna().values
+
+
+def compile_validation_rules(config: Dict[str, Any]) -> List[ValidationRule]:
+    """
+    Compile data_params from the configuration into validation rules
+    
+    Parameters:
+    -----------
+    config : dict
+        Configuration dictionary
+    
+    Returns:
+    --------
+    list : ValidationRule objects, each evaluated as one vectorized check
+    
+    Example:
+    --------
+    >>> rules = compile_validation_rules(load_config())
+    """
+    data_params = config.get('data_params', {})
+    business_rules = data_params.get('business_rules', {})
+    validation_params = data_params.get('validation', {})
+    
+    rules = [
+        ValidationRule(f'{column}_not_null', column, _null_check, f'{column} is not missing')
+        for column in validation_params.get('required_columns', REQUIRED_COLUMNS)
+    ]
+    
+    min_quantity = business_rules.get('min_quantity')
+    if min_quantity is not None:
+        rules.append(ValidationRule('Quantity_range', 'Quantity', _range_check(min_quantity),
+                                    f'Quantity >= {min_quantity}'))
+    
+    min_price = business_rules.get('min_unit_price')
+    max_price = business_rules.get('max_unit_price')
+    if min_price is not None or max_price is not None:
+        rules.append(ValidationRule('UnitPrice_range', 'UnitPrice', _range_check(min_price, max_price),
+                                    f'{min_price} <= UnitPrice <= {max_price}'))
+    
+    # End date covers the whole day
+    start_date = data_params.get('start_date')
+    end_date = data_params.get('end_date')
+    if start_date is not None or end_date is not None:
+        min_date = pd.Timestamp(start_date) if start_date is not None else None
+        max_date = (pd.Timestamp(end_date) + pd.Timedelta(days=1) - pd.Timedelta(1, 'ns')
+                    if end_date is not None else None)
+        rules.append(ValidationRule('InvoiceDate_range', 'InvoiceDate', _range_check(min_date, max_date),
+                                    f'{start_date} <= InvoiceDate <= {end_date}'))
+    
+    patterns = {**DEFAULT_PATTERNS, **validation_params.get('patterns', {})}
+    for column, pattern in patterns.items():
+        rules.append(ValidationRule(f'{column}_pattern', column, _pattern_check(pattern),
+                                    f'{column} matches {pattern}'))
+    
+    return rules
+
+
+def validate_data(data: Union[pd.DataFrame, Iterable[pd.DataFrame]], config: Dict[str, Any],
+                  rules: List[ValidationRule] = None, raw_rows: int = None,
+                  chunk_size: int = 250000, fail_fast: bool = True) -> Dict[str, Any]:
+    """
+    Validate data against the configured rules in one pass per chunk
+    
+    Row-level rules are evaluated on each chunk and stop at the first chunk
+    with violations when fail_fast is set. Frame-level thresholds
+    (data_params.quality) are checked once all chunks have been seen:
+    max_missing_rate per column and, when raw_rows is given, min_retention_rate.
+    After an early stop they are not evaluated, since partial counts would
+    report wrong rates.
+    
+    Parameters:
+    -----------
+    data : pd.DataFrame or iterable of pd.DataFrame
+        Cleaned data, whole or in chunks
+    config : dict
+        Configuration dictionary
+    rules : list
+        Precompiled rules (None = compile from config)
+    raw_rows : int
+        Row count before cleaning, for the retention check (optional)
+    chunk_size : int
+        Rows per chunk when a whole dataframe is given
+    fail_fast : bool
+        Raise at the first chunk with violations instead of after all chunks
+    
+    Returns:
+    --------
+    dict : Rows checked, whether every row was checked (complete), violation
+           counts per rule, missing rates and elapsed seconds
+           (DataValidationError is raised instead if any rule or threshold is violated)
+    
+    Example:
+    --------
+    >>> report = validate_data(df_clean, config, raw_rows=len(df_raw))
+    """
+    start_time = time.perf_counter()
+    rules = rules if rules is not None else compile_validation_rules(config)
+    quality = config.get('data_params', {}).get('quality', {})
+    
+    if isinstance(data, pd.DataFrame):
+        chunks = (data.iloc[start:start + chunk_size] for start in range(0, max(len(data), 1), chunk_size))
+    else:
+        chunks = data
+    
+    failures = {rule.name: 0 for rule in rules}
+    null_counts = None
+    rows_checked = 0
+    stopped_early = False
+    
+    for chunk in chunks:
+        # Null counts serve both the not-null rules and the missing-rate threshold
+        chunk_nulls = chunk.isna().sum()
+        for rule in rules:
+            if rule.column not in chunk.columns:
+                continue
+            if rule.check is _null_check:
+                failures[rule.name] += int(chunk_nulls[rule.column])
+            else:
+                failures[rule.name] += int(rule.check(chunk[rule.column]).sum())
+        
+        null_counts = chunk_nulls if null_counts is None else null_counts.add(chunk_nulls, fill_value=0)
+        rows_checked += len(chunk)
+        
+        if fail_fast and any(failures.values()):
+            # A stop on the last chunk of a dataframe still saw every row
+            stopped_early = not isinstance(data, pd.DataFrame) or rows_checked < len(data)
+            break
+    
+    # Frame-level thresholds need every row, so they are not evaluated after an early stop
+    missing_rates = pd.Series(dtype=float)
+    retention_rate = None
+    if not stopped_early:
+        if null_counts is not None:
+            missing_rates = null_counts / max(rows_checked, 1)
+        max_missing_rate = quality.get('max_missing_rate')
+        if max_missing_rate is not None:
+            for column, rate in missing_rates[missing_rates > max_missing_rate].items():
+                failures[f'{column}_missing_rate'] = int(null_counts[column])
+        
+        min_retention_rate = quality.get('min_retention_rate')
+        if raw_rows:
+            retention_rate = rows_checked / raw_rows
+            if min_retention_rate is not None and retention_rate < min_retention_rate:
+                failures['retention_rate'] = raw_rows - rows_checked
+    
+    elapsed = time.perf_counter() - start_time
+    violations = {name: count for name, count in failures.items() if count > 0}
+    
+    report = {
+        'rows_checked': rows_checked,
+        'complete': not stopped_early,
+        'rules_checked': len(rules),
+        'violations': violations,
+        'missing_rates': missing_rates.to_dict(),
+        'retention_rate': retention_rate,
+        'elapsed_seconds': elapsed,
+    }
+    
+    if violations:
+        details = ", ".join(f"{name}: {count:,}" for name, count in violations.items())
+        logger.error(f"❌ Validation failed after {rows_checked:,} rows: {details}"
+                     f"{' (stopped early; missing rates and retention not evaluated)' if stopped_early else ''}")
+        raise DataValidationError(f"Data validation failed ({details})", violations)
+    
+    logger.info(f"✅ Validation passed: {len(rules)} rules on {rows_checked:,} rows in {elapsed:.2f}s")
+    
+    return report
+
+
+if __name__ == "__main__":
+    # Example usage
+    from utils import load_config, setup_logging, load_data
+    
+    setup_logging()
+    config = load_config()
+    
+    df_clean = load_data(config['paths']['data']['cleaned'], parse_dates=['InvoiceDate'])
+    report = validate_data(df_clean, config)
@@ -0,0 +1,107 @@
+"""
+Unit Tests for Basket Analysis Module
+
+Tests the sparse co-occurrence functions in src/basket_analysis.py.
+
+Run tests with:
+    pytest tests/test_basket_analysis.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.basket_analysis import (
+    build_incidence_matrix,
+    create_product_pairs
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def sample_baskets():
+    """Create sample transactions spread over four invoices"""
+    data = {
+        'InvoiceNo': ['INV001', 'INV001', 'INV001', 'INV002', 'INV002',
+                      'INV003', 'INV003', 'INV004'],
+        'StockCode': ['A001', 'A002', 'A002', 'A001', 'A002',
+                      'A001', 'A003', 'A003'],
+        'Description': ['Product A', 'Product B', 'Product B', 'Product A', 'Product B',
+                        'Product A', 'Product C', 'Product C']
+    }
+    return pd.DataFrame(data)
+
+
+# ============================================================================
+# TESTS: build_incidence_matrix
+# ============================================================================
+
+def test_build_incidence_matrix_shape(sample_baskets):
+    """Test matrix dimensions match unique invoices and products"""
+    matrix, invoices, products = build_incidence_matrix(sample_baskets)
+    
+    assert matrix.shape == (4, 3)
+    assert list(products) == ['A001', 'A002', 'A003']
+
+
+def test_build_incidence_matrix_is_binary(sample_baskets):
+    """Test repeated lines of one product on an invoice count once"""
+    matrix, invoices, products = build_incidence_matrix(sample_baskets)
+    
+    # INV001 has A002 twice
+    assert matrix.max() == 1
+    assert matrix.sum() == 7
+
+
+# ============================================================================
+# TESTS: create_product_pairs
+# ============================================================================
+
+def test_create_product_pairs_metrics(sample_baskets):
+    """Test support, confidence and lift for a known pair"""
+    pairs = create_product_pairs(sample_baskets, min_count=1)
+    
+    pair = pairs[(pairs['Product_1'] == 'A001') & (pairs['Product_2'] == 'A002')].iloc[0]
+    
+    # A001 in 3 invoices, A002 in 2, together in 2 of 4
+    assert pair['CoOccurrenceCount'] == 2
+    assert pair['Support'] == pytest.approx(0.5)
+    assert pair['Confidence_1_to_2'] == pytest.approx(2 / 3)
+    assert pair['Confidence_2_to_1'] == pytest.approx(1.0)
+    assert pair['Lift'] == pytest.approx(0.5 / (0.75 * 0.5))
+    assert pair['Description_1'] == 'Product A'
+
+
+def test_create_product_pairs_min_count_pruning(sample_baskets):
+    """Test pairs below the minimum count are dropped"""
+    pairs = create_product_pairs(sample_baskets, min_count=2)
+    
+    assert len(pairs) == 1
+    assert (pairs['CoOccurrenceCount'] >= 2).all()
+
+
+def test_create_product_pairs_matches_self_join():
+    """Test counts match a brute-force self-join on invoice"""
+    np.random.seed(42)
+    df = pd.DataFrame({
+        'InvoiceNo': np.random.randint(0, 200, 2000).astype(str),
+        'StockCode': np.random.randint(0, 30, 2000).astype(str),
+    })
+    
+    pairs = create_product_pairs(df, min_count=5)
+    
+    baskets = df.drop_duplicates()
+    joined = baskets.merge(baskets, on='InvoiceNo')
+    joined = joined[joined['StockCode_x'] < joined['StockCode_y']]
+    expected = joined.groupby(['StockCode_x', 'StockCode_y']).size()
+    expected = expected[expected >= 5]
+    
+    result = pairs.set_index(['Product_1', 'Product_2'])['CoOccurrenceCount']
+    assert len(result) == len(expected)
+    assert (result.sort_index().values == expected.sort_index().values).all()
@@ -0,0 +1,183 @@
+"""
+Unit Tests for Query Result Cache
+
+Tests dataset fingerprints, LRU/TTL behaviour and disk persistence in
+src/cache.py.
+
+Run tests with:
+    pytest tests/test_cache.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.cache import (
+    dataset_fingerprint,
+    QueryCache,
+    top_n,
+    value_distribution
+)
+from src.utils import load_data, set_dataset_version
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def product_metrics():
+    """Create product metrics, versioned as if loaded from a file"""
+    data = {
+        'StockCode': ['85123A', '71053', '84406B', '22423', '47566'],
+        'TotalRevenue': [2550.0, 3390.0, 2750.0, 12750.0, 8100.0],
+        'Segment': ['A', 'B', 'A', 'A', 'B']
+    }
+    return set_dataset_version(pd.DataFrame(data), 'product_metrics.csv:v1')
+
+
+@pytest.fixture
+def counting_query():
+    """Query function that records how often it is evaluated"""
+    calls = []
+    
+    def query(df, column, n=2):
+        calls.append(column)
+        return df.nlargest(n, column)
+    
+    query.calls = calls
+    return query
+
+
+# ============================================================================
+# TESTS: dataset_fingerprint
+# ============================================================================
+
+def test_dataset_fingerprint_content_based(product_metrics):
+    """Test equal content gives equal fingerprints and any change differs"""
+    copy = product_metrics.copy()
+    changed = product_metrics.copy()
+    changed.loc[0, 'TotalRevenue'] += 0.01
+    
+    assert dataset_fingerprint(product_metrics) == dataset_fingerprint(copy)
+    assert dataset_fingerprint(product_metrics) != dataset_fingerprint(changed)
+    assert dataset_fingerprint(product_metrics) != dataset_fingerprint(product_metrics[['StockCode']])
+
+
+def test_dataset_fingerprint_tracks_in_place_changes(product_metrics):
+    """Test a frame modified in place after fingerprinting gets a new fingerprint"""
+    before = dataset_fingerprint(product_metrics)
+    product_metrics.loc[0, 'TotalRevenue'] += 0.01
+    
+    assert dataset_fingerprint(product_metrics) != before
+
+
+# ============================================================================
+# TESTS: QueryCache
+# ============================================================================
+
+def test_query_cache_keys_loaded_frames_by_file_version(tmp_path, counting_query, monkeypatch):
+    """Test hits on a loaded frame do not hash it and a rewritten file misses"""
+    file_path = tmp_path / 'product_metrics.csv'
+    pd.DataFrame({'StockCode': ['85123A', '71053'], 'TotalRevenue': [2550.0, 3390.0]}).to_csv(file_path, index=False)
+    cache = QueryCache()
+    
+    df = load_data(str(file_path))
+    cache.call(counting_query, df, 'TotalRevenue')
+    monkeypatch.setattr(pd.util, 'hash_pandas_object', None)
+    cache.call(counting_query, df, 'TotalRevenue')
+    
+    pd.DataFrame({'StockCode': ['22423'], 'TotalRevenue': [12750.0]}).to_csv(file_path, index=False)
+    result = cache.call(counting_query, load_data(str(file_path)), 'TotalRevenue')
+    
+    assert len(counting_query.calls) == 2
+    assert result['TotalRevenue'].tolist() == [12750.0]
+
+
+def test_query_cache_skips_unversioned_frames(product_metrics, counting_query):
+    """Test frames without a version are not hashed by default, just computed"""
+    cache = QueryCache()
+    derived = product_metrics[product_metrics['Segment'] == 'A']
+    
+    cache.call(counting_query, derived, 'TotalRevenue')
+    cache.call(counting_query, derived, 'TotalRevenue')
+    
+    assert len(counting_query.calls) == 2
+    assert len(cache) == 0
+
+
+def test_query_cache_hits_on_unchanged_data(product_metrics, counting_query):
+    """Test with content hashing, equal unversioned frames share results, returned as copies"""
+    cache = QueryCache(hash_content=True)
+    unversioned = product_metrics.copy()
+    
+    first = cache.call(counting_query, unversioned, 'TotalRevenue')
+    first.loc[:, 'TotalRevenue'] = 0
+    second = cache.call(counting_query, unversioned.copy(), 'TotalRevenue')
+    cache.call(counting_query, unversioned, 'TotalRevenue', n=3)
+    
+    assert counting_query.calls == ['TotalRevenue', 'TotalRevenue']
+    assert second['StockCode'].tolist() == ['22423', '47566']
+    assert second['TotalRevenue'].iloc[0] == 12750.0
+    assert cache.stats() == {'entries': 2, 'hits': 1, 'misses': 2, 'evictions': 0}
+
+
+def test_query_cache_lru_eviction(product_metrics, counting_query):
+    """Test the least recently used result is evicted first"""
+    cache = QueryCache(max_entries=2)
+    
+    cache.call(counting_query, product_metrics, 'TotalRevenue', n=1)
+    cache.call(counting_query, product_metrics, 'TotalRevenue', n=2)
+    cache.call(counting_query, product_metrics, 'TotalRevenue', n=1)
+    cache.call(counting_query, product_metrics, 'TotalRevenue', n=3)
+    cache.call(counting_query, product_metrics, 'TotalRevenue', n=1)
+    cache.call(counting_query, product_metrics, 'TotalRevenue', n=2)
+    
+    assert len(counting_query.calls) == 4
+    assert cache.evictions == 2
+    assert len(cache) == 2
+
+
+def test_query_cache_ttl_expiry(product_metrics, counting_query, monkeypatch):
+    """Test results are recomputed after the TTL"""
+    clock = [1000.0]
+    monkeypatch.setattr('src.cache.time.time', lambda: clock[0])
+    cache = QueryCache(ttl=60)
+    
+    cache.call(counting_query, product_metrics, 'TotalRevenue')
+    clock[0] += 59
+    cache.call(counting_query, product_metrics, 'TotalRevenue')
+    clock[0] += 2
+    cache.call(counting_query, product_metrics, 'TotalRevenue')
+    
+    assert len(counting_query.calls) == 2
+
+
+def test_query_cache_disk_persistence(tmp_path, product_metrics):
+    """Test a new cache over the same directory serves earlier results"""
+    QueryCache(cache_dir=str(tmp_path)).call(value_distribution, product_metrics, 'Segment')
+    
+    cache = QueryCache(cache_dir=str(tmp_path))
+    result = cache.call(value_distribution, product_metrics, 'Segment')
+    
+    assert cache.stats()['hits'] == 1
+    assert result.to_dict() == {'A': 3, 'B': 2}
+    
+    cache.clear()
+    assert list(tmp_path.glob('*.pkl')) == []
+
+
+def test_query_cache_memoize_shared_query(product_metrics):
+    """Test the decorator and shared queries go through the cache"""
+    cache = QueryCache()
+    cached_top_n = cache.memoize(top_n)
+    
+    result = cached_top_n(product_metrics, 'TotalRevenue', 3)
+    again = cached_top_n(product_metrics, 'TotalRevenue', 3)
+    
+    assert cached_top_n.__name__ == 'top_n'
+    assert result.equals(again)
+    assert cache.hits == 1
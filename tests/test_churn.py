@@ -0,0 +1,113 @@
+"""
+Unit Tests for Churn Scoring
+
+Tests the feature matrix, risk buckets and logistic model in src/churn.py.
+
+Run tests with:
+    pytest tests/test_churn.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.churn import (
+    build_feature_matrix,
+    churn_risk_codes,
+    ChurnModel,
+    churn_training_set,
+    score_churn
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def customer_metrics():
+    """Create customer metrics on both sides of each risk threshold"""
+    data = {
+        'CustomerID': [12346.0, 12347.0, 12348.0, 12349.0, 12350.0, 12352.0],
+        'Recency_Days': [10, 60, 61, 90, 150, 181],
+        'TotalOrders': [12, 8, 3, 2, 1, 1],
+        'CustomerLifetimeValue': [5400.0, 2100.0, 640.0, 300.0, 90.0, np.nan],
+        'AvgBasketValue': [22.5, 18.0, 15.2, 12.0, 9.0, 7.5],
+        'PurchaseFrequency': [1.5, 1.1, 0.6, 0.4, 30.0, 30.0]
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def transactions():
+    """Create a year of transactions where frequent buyers keep buying"""
+    np.random.seed(42)
+    rows = []
+    for customer in range(400):
+        # Roughly one customer in three orders every couple of weeks all year
+        regular = customer % 3 == 0
+        n_orders = 25 if regular else np.random.randint(1, 4)
+        days = np.random.randint(0, 365 if regular else 200, n_orders)
+        for order, day in enumerate(days):
+            rows.append((f"{customer}-{order}", 13000.0 + customer,
+                         pd.Timestamp('2010-01-01') + pd.Timedelta(days=int(day)), 4, 2.5))
+    return pd.DataFrame(rows, columns=['InvoiceNo', 'CustomerID', 'InvoiceDate', 'Quantity', 'UnitPrice'])
+
+
+# ============================================================================
+# TESTS: features and rule-based buckets
+# ============================================================================
+
+def test_build_feature_matrix(customer_metrics):
+    """Test the matrix is contiguous float32 with missing values zeroed"""
+    X = build_feature_matrix(customer_metrics)
+    
+    assert X.dtype == np.float32
+    assert X.flags['C_CONTIGUOUS']
+    assert X.shape == (6, 5)
+    assert X[5, 2] == 0.0
+    with pytest.raises(KeyError):
+        build_feature_matrix(customer_metrics, ['Missing'])
+
+
+def test_churn_risk_codes_match_query_thresholds(customer_metrics):
+    """Test buckets use strict > comparisons as in query 5.1"""
+    scores = score_churn(customer_metrics)
+    
+    assert churn_risk_codes(customer_metrics['Recency_Days'].values).tolist() == [0, 0, 1, 1, 2, 3]
+    assert scores['ChurnRisk'].tolist() == ['Active', 'Active', 'Low Risk', 'Low Risk',
+                                            'Medium Risk', 'High Risk']
+    assert 'ChurnProbability' not in scores.columns
+
+
+# ============================================================================
+# TESTS: ChurnModel
+# ============================================================================
+
+def test_churn_model_learns_recency(transactions):
+    """Test the fitted model ranks recent frequent buyers as less likely to churn"""
+    X, y = churn_training_set(transactions, '2010-09-01', horizon_days=90)
+    model = ChurnModel().fit(X, y)
+    
+    probabilities = model.predict_proba(X, batch_size=50)
+    
+    assert probabilities.dtype == np.float32
+    assert ((probabilities >= 0.5) == y).mean() > 0.9
+    assert model.coef[0] > 0
+
+
+def test_churn_model_save_and_load(tmp_path, transactions, customer_metrics):
+    """Test a saved model reloads with the same scores"""
+    X, y = churn_training_set(transactions, '2010-09-01', horizon_days=90)
+    model = ChurnModel().fit(X, y)
+    model.save(str(tmp_path / 'churn_model.npz'))
+    
+    loaded = ChurnModel.load(str(tmp_path / 'churn_model.npz'))
+    
+    np.testing.assert_allclose(score_churn(customer_metrics, loaded)['ChurnProbability'],
+                               score_churn(customer_metrics, model)['ChurnProbability'])
+    with pytest.raises(ValueError):
+        ChurnModel().predict_proba(X)
@@ -0,0 +1,105 @@
+"""
+Startup Tests for Command Line Scripts
+
+Checks that --help, --dry-run and importing src.utils do not load heavy
+libraries, using the interpreter's -X importtime report.
+
+Run tests with:
+    pytest tests/test_cli_startup.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Libraries that must only load once data is actually processed
+HEAVY_MODULES = {'pandas', 'numpy', 'scipy', 'loguru', 'tqdm', 'openpyxl'}
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def run_with_importtime(*args):
+    """Run python -X importtime from the project root; return (result, {module: cumulative µs})"""
+    env = {**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', *args],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, self_us, cumulative_us, name = [part.strip() for part in line.replace('import time:', '|').split('|')]
+        imports[name] = int(cumulative_us)
+    
+    return result, imports
+
+
+def loaded_heavy_modules(imports):
+    """Top-level heavy packages that appear in an import-time report"""
+    return {name.split('.')[0] for name in imports} & HEAVY_MODULES
+
+
+# ============================================================================
+# TESTS: startup imports
+# ============================================================================
+
+@pytest.mark.parametrize('script', ['scripts/run_pipeline.py', 'scripts/export_results.py'])
+def test_script_help_skips_heavy_imports(script):
+    """Test --help does not import pandas, loguru, tqdm or openpyxl"""
+    result, imports = run_with_importtime(script, '--help')
+    
+    assert result.returncode == 0
+    assert 'usage' in result.stdout
+    assert loaded_heavy_modules(imports) == set()
+
+
+def test_dry_run_validates_config_without_heavy_imports():
+    """Test --dry-run checks the config using YAML only"""
+    result, imports = run_with_importtime('scripts/run_pipeline.py', '--dry-run', '--steps', 'load,clean')
+    
+    assert result.returncode == 0
+    assert 'Configuration validated successfully' in result.stdout
+    assert loaded_heavy_modules(imports) == set()
+
+
+def test_dry_run_reports_missing_config(tmp_path):
+    """Test --dry-run fails on a config without required keys"""
+    config_file = tmp_path / 'config.yaml'
+    config_file.write_text('paths:\n  data:\n    raw: data/raw_data.csv\n')
+    
+    result, _ = run_with_importtime('scripts/run_pipeline.py', '--dry-run', '--config', str(config_file))
+    
+    assert result.returncode == 1
+    assert 'paths.data.cleaned' in result.stdout
+
+
+def test_utils_import_time_benchmark():
+    """Test importing src.utils costs a fraction of importing pandas"""
+    _, utils_imports = run_with_importtime('-c', 'import src.utils')
+    _, pandas_imports = run_with_importtime('-c', 'import pandas')
+    
+    assert loaded_heavy_modules(utils_imports) == set()
+    assert utils_imports['src.utils'] < pandas_imports['pandas'] / 2
+
+
+def test_star_import_and_dir_list_submodules():
+    """Test `from src import *` binds every submodule and dir(src) lists them"""
+    code = ("import src; from src import *; "
+            "assert all(name in dir(src) for name in src.__all__); "
+            "print(utils.__name__, seasonality.__name__)")
+    result, _ = run_with_importtime('-c', code)
+    
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ['src.utils', 'src.seasonality']
@@ -0,0 +1,108 @@
+"""
+Unit Tests for CLV Forecasting
+
+Tests fitting, scoring and persistence of the CLV model in src/clv.py.
+
+Run tests with:
+    pytest tests/test_clv.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import time
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.clv import (
+    CLVModel,
+    clv_training_set,
+    score_clv
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def customer_metrics():
+    """Create customer metrics with a known linear future revenue"""
+    np.random.seed(42)
+    n = 500
+    data = {
+        'CustomerID': np.arange(12000, 12000 + n).astype(float),
+        'TotalOrders': np.random.randint(1, 30, n),
+        'AvgBasketValue': np.random.uniform(5, 50, n),
+        'CustomerTenure_Days': np.random.randint(0, 365, n),
+        'CustomerLifetimeValue': np.random.uniform(10, 5000, n)
+    }
+    df = pd.DataFrame(data)
+    df['FutureRevenue'] = 20 + 12 * df['TotalOrders'] + 3 * df['AvgBasketValue'] + 0.5 * df['CustomerTenure_Days']
+    return df
+
+
+# ============================================================================
+# TESTS: CLVModel
+# ============================================================================
+
+def test_clv_model_recovers_coefficients(customer_metrics):
+    """Test least squares recovers an exact linear relationship"""
+    X = customer_metrics[['TotalOrders', 'AvgBasketValue', 'CustomerTenure_Days']].values.astype(np.float32)
+    
+    model = CLVModel().fit(X, customer_metrics['FutureRevenue'].values)
+    
+    np.testing.assert_allclose(model.coef, [12, 3, 0.5], rtol=1e-3)
+    assert model.intercept == pytest.approx(20, rel=1e-2)
+    assert model.r_squared == pytest.approx(1.0)
+
+
+def test_score_clv_save_and_load(tmp_path, customer_metrics):
+    """Test scores are non-negative and a saved model reloads with the same scores"""
+    X = customer_metrics[['TotalOrders', 'AvgBasketValue', 'CustomerTenure_Days']].values.astype(np.float32)
+    model = CLVModel(horizon_days=30).fit(X, -customer_metrics['FutureRevenue'].values)
+    model.save(str(tmp_path / 'clv_model.npz'))
+    
+    loaded = CLVModel.load(str(tmp_path / 'clv_model.npz'))
+    scores = score_clv(customer_metrics, loaded)
+    
+    assert loaded.horizon_days == 30
+    assert (scores['PredictedRevenue'] == 0).all()
+    pd.testing.assert_frame_equal(scores, score_clv(customer_metrics, model))
+    with pytest.raises(ValueError):
+        CLVModel().predict(X)
+
+
+def test_clv_training_set():
+    """Test the target is each customer's revenue in the horizon after the cutoff"""
+    df = pd.DataFrame({
+        'InvoiceNo': ['1', '2', '3', '4', '5'],
+        'CustomerID': [1.0, 1.0, 2.0, 1.0, 3.0],
+        'InvoiceDate': pd.to_datetime(['2010-01-05', '2010-02-10', '2010-02-20', '2010-03-15', '2010-03-20']),
+        'Quantity': [2, 1, 4, 3, 1],
+        'UnitPrice': [5.0, 10.0, 2.5, 10.0, 8.0]
+    })
+    
+    X, y = clv_training_set(df, '2010-03-01', horizon_days=30)
+    
+    assert X.shape == (2, 3)
+    assert y.tolist() == [30.0, 0.0]
+
+
+@pytest.mark.slow
+def test_clv_scoring_benchmark():
+    """Test scoring two million customers is a single fast matrix multiply"""
+    np.random.seed(42)
+    X = np.random.uniform(0, 100, (2_000_000, 3)).astype(np.float32)
+    model = CLVModel().fit(X[:100_000], X[:100_000] @ np.array([12.0, 3.0, 0.5]))
+    
+    start_time = time.time()
+    predicted = model.predict(X)
+    execution_time = time.time() - start_time
+    
+    assert predicted.dtype == np.float32
+    assert len(predicted) == 2_000_000
+    # Should complete in well under a second
+    assert execution_time < 1.0
@@ -0,0 +1,92 @@
+"""
+Unit Tests for Columnar Cache
+
+Tests writing, memory-mapped loading and freshness checks of the columnar
+cache in src/columnar_cache.py.
+
+Run tests with:
+    pytest tests/test_columnar_cache.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.columnar_cache import (
+    save_columnar,
+    load_columnar,
+    is_cache_fresh,
+    load_cleaned_data
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def cleaned_data():
+    """Create cleaned transactions with missing values in each column type"""
+    data = {
+        'InvoiceNo': ['536365', '536366', '536367', '536368'],
+        'Description': ['WHITE HANGING HEART', None, 'KNITTED UNION FLAG', 'WHITE HANGING HEART'],
+        'Quantity': [6, 8, 2, 32],
+        'UnitPrice': [2.55, 3.39, 7.65, 1.25],
+        'CustomerID': [17850.0, np.nan, 13047.0, 13047.0],
+        'InvoiceDate': pd.to_datetime(['2010-12-01 08:26', '2010-12-01 08:28', None, '2010-12-02 09:00']),
+        'Returned': [False, False, True, False],
+        'Segment': pd.Categorical(['Low', 'High', 'Low', 'Mid'], categories=['Low', 'Mid', 'High'],
+                                  ordered=True)
+    }
+    return pd.DataFrame(data)
+
+
+# ============================================================================
+# TESTS: save_columnar / load_columnar
+# ============================================================================
+
+def test_columnar_roundtrip(tmp_path, cleaned_data):
+    """Test every column type reloads with the same values and dtype"""
+    save_columnar(cleaned_data, str(tmp_path / 'cache'))
+    
+    loaded = load_columnar(str(tmp_path / 'cache'))
+    
+    pd.testing.assert_frame_equal(loaded, cleaned_data)
+
+
+def test_columnar_memory_mapped_and_selective(tmp_path, cleaned_data):
+    """Test numeric columns are file views and unrequested columns are skipped"""
+    save_columnar(cleaned_data, str(tmp_path / 'cache'))
+    
+    loaded = load_columnar(str(tmp_path / 'cache'), columns=['UnitPrice', 'InvoiceNo'], categorical=True)
+    
+    assert list(loaded.columns) == ['UnitPrice', 'InvoiceNo']
+    assert isinstance(loaded['UnitPrice'].values, np.memmap)
+    assert isinstance(loaded['InvoiceNo'].dtype, pd.CategoricalDtype)
+    with pytest.raises(KeyError):
+        load_columnar(str(tmp_path / 'cache'), columns=['Missing'])
+
+
+# ============================================================================
+# TESTS: load_cleaned_data
+# ============================================================================
+
+def test_load_cleaned_data_refreshes_stale_cache(tmp_path, cleaned_data):
+    """Test the cache is written from the CSV and rebuilt when the CSV changes"""
+    csv_path = str(tmp_path / 'cleaned_data.csv')
+    cache_dir = str(tmp_path / 'cleaned_columnar')
+    cleaned_data.to_csv(csv_path, index=False)
+    
+    first = load_cleaned_data(csv_path, cache_dir)
+    assert is_cache_fresh(cache_dir, csv_path)
+    
+    second = load_cleaned_data(csv_path, cache_dir)
+    pd.testing.assert_frame_equal(second, first)
+    assert isinstance(second['Quantity'].values, np.memmap)
+    
+    cleaned_data.iloc[:2].to_csv(csv_path, index=False)
+    assert not is_cache_fresh(cache_dir, csv_path)
+    assert len(load_cleaned_data(csv_path, cache_dir)) == 2
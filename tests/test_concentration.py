@@ -0,0 +1,123 @@
+"""
+Unit Tests for Revenue Concentration Module
+
+Tests Lorenz curve, Gini coefficient and top-share functions in
+src/concentration.py.
+
+Run tests with:
+    pytest tests/test_concentration.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.concentration import (
+    lorenz_curve,
+    gini_coefficient,
+    top_shares,
+    concentration_metrics,
+    create_revenue_concentration
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def skewed_revenue():
+    """Create a heavy-tailed revenue distribution"""
+    np.random.seed(42)
+    return np.random.pareto(1.5, 5000) * 100
+
+
+# ============================================================================
+# TESTS: lorenz_curve
+# ============================================================================
+
+def test_lorenz_curve_endpoints():
+    """Test curve starts at (0, 0) and ends at (1, 1)"""
+    curve = lorenz_curve([4, 1, 3, 2])
+    
+    assert len(curve) == 5
+    assert curve['RevenueShare'].iloc[0] == 0.0
+    assert curve['RevenueShare'].iloc[-1] == pytest.approx(1.0)
+    
+    # Poorest entity (1 of 10 total) first
+    assert curve['RevenueShare'].iloc[1] == pytest.approx(0.1)
+
+
+def test_lorenz_curve_resampled(skewed_revenue):
+    """Test resampling to a fixed number of points"""
+    curve = lorenz_curve(skewed_revenue, points=101)
+    
+    assert len(curve) == 101
+    assert curve['RevenueShare'].is_monotonic_increasing
+
+
+# ============================================================================
+# TESTS: gini_coefficient
+# ============================================================================
+
+def test_gini_coefficient_equal_distribution():
+    """Test Gini is zero when all entities earn the same"""
+    assert gini_coefficient([5, 5, 5, 5]) == pytest.approx(0.0)
+
+
+def test_gini_coefficient_single_earner():
+    """Test Gini for all revenue in one of n entities is (n-1)/n"""
+    assert gini_coefficient([0, 0, 0, 10]) == pytest.approx(0.75)
+
+
+# ============================================================================
+# TESTS: top_shares
+# ============================================================================
+
+def test_top_shares_fast_path_matches_full_sort(skewed_revenue):
+    """Test argpartition fast path agrees with the full-sort path"""
+    few = top_shares(skewed_revenue, [0.01, 0.2])
+    many = top_shares(skewed_revenue, [0.01, 0.02, 0.05, 0.1, 0.2])
+    
+    assert few[0.01] == pytest.approx(many[0.01])
+    assert few[0.2] == pytest.approx(many[0.2])
+    
+    # Compare against a direct computation
+    sorted_desc = np.sort(skewed_revenue)[::-1]
+    expected = sorted_desc[:1000].sum() / sorted_desc.sum()
+    assert few[0.2] == pytest.approx(expected)
+
+
+def test_top_shares_empty():
+    """Test empty input returns zero shares"""
+    assert top_shares([], [0.2]) == {0.2: 0.0}
+
+
+# ============================================================================
+# TESTS: concentration_metrics / create_revenue_concentration
+# ============================================================================
+
+def test_concentration_metrics_pareto_point():
+    """Test share of entities needed to reach 80% of revenue"""
+    # Top 2 of 10 entities hold 80% of revenue
+    values = [40, 40] + [2.5] * 8
+    
+    metrics = concentration_metrics(values)
+    
+    assert metrics['TopShare_20Pct'] == pytest.approx(0.8)
+    assert metrics['EntityShareFor80PctRevenue'] == pytest.approx(0.2)
+
+
+def test_create_revenue_concentration_rows():
+    """Test one summary row per entity type"""
+    customer_metrics = pd.DataFrame({'CustomerLifetimeValue': [100.0, 50.0, 10.0]})
+    product_metrics = pd.DataFrame({'TotalRevenue': [80.0, 60.0, 15.0, 5.0]})
+    
+    result = create_revenue_concentration(customer_metrics, product_metrics)
+    
+    assert list(result['Entity']) == ['Customers', 'Products']
+    assert list(result['EntityCount']) == [3, 4]
+    assert (result['GiniCoefficient'].between(0, 1)).all()
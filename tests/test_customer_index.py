@@ -0,0 +1,114 @@
+"""
+Unit Tests for Customer 360 Index
+
+Tests building, querying and memory-mapped loading of the customer index in
+src/customer_index.py.
+
+Run tests with:
+    pytest tests/test_customer_index.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.customer_index import (
+    CustomerIndex,
+    customer_360
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def invoice_metrics():
+    """Create invoices with a guest invoice and float IDs, as read back from CSV"""
+    data = {
+        'InvoiceNo': ['536365', '536366', '536367', '536368', '536369', '536370'],
+        'InvoiceValue': [139.12, 22.20, 278.73, 70.05, 17.85, 855.86],
+        'CustomerID': [17850.0, 17850.0, 13047.0, np.nan, 13047.0, 17850.0]
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def customer_metrics():
+    """Create customer metrics, including a customer without invoices"""
+    data = {
+        'CustomerID': [13047.0, 17850.0, 12583.0],
+        'TotalOrders': [2, 3, 0]
+    }
+    return pd.DataFrame(data)
+
+
+# ============================================================================
+# TESTS: CustomerIndex
+# ============================================================================
+
+def test_customer_index_invoices(invoice_metrics, customer_metrics):
+    """Test each customer's invoices are found in file order"""
+    index = CustomerIndex.build(invoice_metrics, customer_metrics)
+    
+    assert index.customer_ids.tolist() == [12583, 13047, 17850]
+    assert index.invoices_for(17850, invoice_metrics)['InvoiceNo'].tolist() == ['536365', '536366', '536370']
+    assert index.invoices_for('13047.0', invoice_metrics)['InvoiceNo'].tolist() == ['536367', '536369']
+    assert index.invoices_for(12583, invoice_metrics).empty
+    assert index.invoices_for(99999, invoice_metrics).empty
+    assert index.invoice_counts().to_dict() == {12583: 0, 13047: 2, 17850: 3}
+
+
+def test_customer_index_profile(invoice_metrics, customer_metrics):
+    """Test the metrics row lookup, including customers without one"""
+    index = CustomerIndex.build(invoice_metrics, customer_metrics.iloc[:2])
+    
+    view = customer_360(17850, index, customer_metrics, invoice_metrics)
+    
+    assert view['profile']['TotalOrders'] == 3
+    assert len(view['invoices']) == 3
+    assert index.profile(99999, customer_metrics) is None
+
+
+def test_customer_index_matches_groupby():
+    """Test the CSR layout against a groupby over random invoices"""
+    np.random.seed(42)
+    invoices = pd.DataFrame({'CustomerID': np.random.randint(12000, 12500, 5000).astype(float)})
+    invoices.loc[invoices.sample(frac=0.1, random_state=1).index, 'CustomerID'] = np.nan
+    
+    index = CustomerIndex.build(invoices)
+    expected = invoices.groupby('CustomerID').indices
+    
+    assert len(index) == len(expected)
+    for customer_id, positions in expected.items():
+        assert index.invoice_positions(customer_id).tolist() == positions.tolist()
+
+
+def test_customer_index_save_and_mmap_load(tmp_path, invoice_metrics, customer_metrics):
+    """Test a saved index loads memory-mapped and detects stale tables"""
+    CustomerIndex.build(invoice_metrics, customer_metrics).save(str(tmp_path / 'customer_index'))
+    
+    index = CustomerIndex.load(str(tmp_path / 'customer_index'))
+    
+    assert isinstance(index.invoice_rows, np.memmap)
+    assert index.invoices_for(17850, invoice_metrics)['InvoiceNo'].tolist() == ['536365', '536366', '536370']
+    index.check_source(invoice_metrics, customer_metrics)
+    with pytest.raises(ValueError):
+        index.check_source(invoice_metrics.iloc[:3])
+
+
+def test_customer_index_save_replaces_whole_directory(tmp_path, invoice_metrics, customer_metrics):
+    """Test saving over an existing index swaps in a complete new directory"""
+    directory = tmp_path / 'customer_index'
+    CustomerIndex.build(invoice_metrics, customer_metrics).save(str(directory))
+    (directory / 'leftover.npy').write_bytes(b'')
+    
+    CustomerIndex.build(invoice_metrics.iloc[:3]).save(str(directory))
+    index = CustomerIndex.load(str(directory), mmap=False)
+    
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['customer_index']
+    assert not (directory / 'leftover.npy').exists()
+    assert index.source_rows == {'invoice_metrics': 3, 'customer_metrics': 0}
@@ -26,7 +26,8 @@ from src.data_cleaning import (
     convert_data_types,
     filter_by_date_range,
     handle_outliers,
-    clean_ecommerce_data
+    clean_ecommerce_data,
+    load_quarantine
 )
 
 
@@ -326,6 +327,20 @@ def test_convert_data_types_handles_errors():
     assert result['B'].isna().sum() > 0
 
 
+def test_convert_data_types_string_dates():
+    """Test string dates are parsed with the detected format"""
+    df = pd.DataFrame({
+        'InvoiceDate': ['12/1/2009 7:45', '12/13/2009 17:05', '12/1/2009 7:45', None]
+    })
+    
+    result = convert_data_types(df, {'InvoiceDate': 'datetime64'})
+    
+    assert result.attrs['datetime_formats']['InvoiceDate'] == '%m/%d/%Y %H:%M'
+    assert result['InvoiceDate'].iloc[1] == pd.Timestamp('2009-12-13 17:05')
+    assert result['InvoiceDate'].iloc[0] == result['InvoiceDate'].iloc[2]
+    assert pd.isna(result['InvoiceDate'].iloc[3])
+
+
 # ============================================================================
 # TESTS: filter_by_date_range
 # ============================================================================
@@ -459,6 +474,27 @@ def test_handle_outliers_keep():
     pd.testing.assert_frame_equal(result, df)
 
 
+def test_handle_outliers_zscore_with_missing_values():
+    """Test z-score removal keeps rows aligned when the column has NaN"""
+    np.random.seed(42)
+    values = list(np.random.normal(0, 1, 100)) + [np.nan, 10]
+    df = pd.DataFrame({'Value': values})
+    
+    result = handle_outliers(df, 'Value', method='zscore', threshold=3, action='remove')
+    
+    assert result['Value'].max() < 10
+    assert len(result) == 100
+
+
+def test_handle_outliers_precomputed_bounds():
+    """Test bounds from a streaming pass are applied as given"""
+    df = pd.DataFrame({'Quantity': [1, 5, 10, 50, 500]})
+    
+    result = handle_outliers(df, 'Quantity', action='cap', bounds=(2, 100))
+    
+    assert list(result['Quantity']) == [2, 5, 10, 50, 100]
+
+
 # ============================================================================
 # TESTS: clean_ecommerce_data (Integration Test)
 # ============================================================================
@@ -541,6 +577,82 @@ def test_clean_ecommerce_data_empty_result():
     assert len(result) == 0
 
 
+def test_clean_ecommerce_data_quarantine(tmp_path):
+    """Test every rejected row is quarantined with all the rules it failed"""
+    df = pd.DataFrame({
+        'InvoiceNo': ['536365', 'C536366', '536367', '536368', '536365'],
+        'StockCode': ['85123A', '71053', '84406B', '84029G', '85123A'],
+        'Description': ['Item 1', 'Item 2', None, 'Item 4', 'Item 1'],
+        'Quantity': [5, -1, 0, 2, 5],
+        'InvoiceDate': ['2010-12-01 08:26'] * 5,
+        'UnitPrice': [2.55, 3.39, 1.00, 0.0, 2.55],
+        'CustomerID': [17850.0, 17850.0, 13047.0, 13047.0, 17850.0],
+        'Country': ['United Kingdom'] * 5
+    })
+    quarantine_path = tmp_path / 'quarantine.npz'
+    
+    result = clean_ecommerce_data(df, quarantine_path=str(quarantine_path))
+    quarantine = load_quarantine(quarantine_path)
+    
+    assert len(result) == 1
+    assert list(quarantine['RowIndex']) == [1, 2, 3, 4]
+    assert quarantine['Cancelled'].tolist() == [True, False, False, False]
+    assert quarantine['InvalidQuantity'].tolist() == [True, True, False, False]
+    assert quarantine.loc[1, 'MissingDescription']
+    assert quarantine.loc[2, 'InvalidPrice']
+    assert quarantine['Duplicate'].tolist() == [False, False, False, True]
+
+
+def test_clean_ecommerce_data_rejects_invalid_dates(tmp_path):
+    """Test rows whose date cannot be parsed are quarantined instead of kept as NaT"""
+    df = pd.DataFrame({
+        'InvoiceNo': ['536365', '536366', '536367'],
+        'StockCode': ['85123A', '71053', '84406B'],
+        'Description': ['Item 1', 'Item 2', 'Item 3'],
+        'Quantity': [5, 3, 2],
+        'InvoiceDate': ['2010-12-01 08:26', 'not a date', '2010-12-01 09:00'],
+        'UnitPrice': [2.55, 3.39, 1.00],
+        'CustomerID': [17850.0, 17850.0, 13047.0],
+        'Country': ['United Kingdom'] * 3
+    })
+    quarantine_path = tmp_path / 'quarantine.npz'
+    
+    result = clean_ecommerce_data(df, quarantine_path=str(quarantine_path))
+    quarantine = load_quarantine(quarantine_path)
+    
+    assert result['InvoiceNo'].tolist() == ['536365', '536367']
+    assert pd.api.types.is_datetime64_any_dtype(result['InvoiceDate'])
+    assert result['InvoiceDate'].notna().all()
+    assert list(quarantine['RowIndex']) == [1]
+    assert quarantine['InvalidDate'].tolist() == [True]
+
+
+def test_clean_ecommerce_data_incremental_loads(tmp_path):
+    """Test with incremental deduplication a second load keeps only rows not loaded before"""
+    df = pd.DataFrame({
+        'InvoiceNo': ['536365', '536366'],
+        'StockCode': ['85123A', '71053'],
+        'Description': ['Item 1', 'Item 2'],
+        'Quantity': [5, 3],
+        'InvoiceDate': ['2010-12-01 08:26', '2010-12-01 09:00'],
+        'UnitPrice': [2.55, 3.39],
+        'CustomerID': [17850.0, 13047.0],
+        'Country': ['United Kingdom'] * 2
+    })
+    config = {
+        'paths': {'data': {'fingerprints': str(tmp_path / 'fingerprints.npy')}},
+        'data_params': {'deduplication': {'incremental': True}}
+    }
+    next_load = pd.concat([df.iloc[[1]], df.iloc[[0]].assign(InvoiceNo='536367')], ignore_index=True)
+    
+    first = clean_ecommerce_data(df, config=config)
+    second = clean_ecommerce_data(next_load, config=config, quarantine_path=str(tmp_path / 'quarantine.npz'))
+    
+    assert len(first) == 2
+    assert second['InvoiceNo'].tolist() == ['536367']
+    assert load_quarantine(tmp_path / 'quarantine.npz')['Duplicate'].tolist() == [True]
+
+
 # ============================================================================
 # EDGE CASES & ERROR HANDLING
 # ============================================================================
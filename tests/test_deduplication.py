@@ -0,0 +1,142 @@
+"""
+Unit Tests for Deduplication Module
+
+Tests the row fingerprints and persistent fingerprint store in
+src/deduplication.py.
+
+Run tests with:
+    pytest tests/test_deduplication.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.deduplication import (
+    row_fingerprints,
+    FingerprintStore,
+    deduplicate_chunks
+)
+from src.data_cleaning import remove_duplicates
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def transactions_with_duplicates():
+    """Create transactions where about a third of rows are repeats"""
+    np.random.seed(42)
+    df = pd.DataFrame({
+        'InvoiceNo': np.random.randint(536000, 536300, 3000).astype(str),
+        'StockCode': np.random.randint(0, 10, 3000).astype(str),
+        'Quantity': np.random.randint(1, 3, 3000)
+    })
+    return df
+
+
+# ============================================================================
+# TESTS: row_fingerprints
+# ============================================================================
+
+def test_row_fingerprints_key_columns():
+    """Test rows equal on the key columns share a fingerprint"""
+    df = pd.DataFrame({
+        'InvoiceNo': ['536365', '536365', '536366'],
+        'StockCode': ['85123A', '85123A', '85123A'],
+        'Country': ['United Kingdom', 'France', 'United Kingdom']
+    })
+    
+    all_columns = row_fingerprints(df)
+    key_columns = row_fingerprints(df, ['InvoiceNo', 'StockCode'])
+    
+    assert all_columns.dtype == np.uint64
+    assert all_columns[0] != all_columns[1]
+    assert key_columns[0] == key_columns[1]
+    assert key_columns[0] != key_columns[2]
+
+
+def test_row_fingerprints_ignore_inferred_dtypes():
+    """Test a row hashes the same whether CustomerID was read as float64 or int64"""
+    float_chunk = pd.DataFrame({'InvoiceNo': ['536365', '536366'], 'CustomerID': [17850.0, np.nan]})
+    int_chunk = pd.DataFrame({'InvoiceNo': ['536365'], 'CustomerID': [17850]})
+    
+    assert row_fingerprints(float_chunk)[0] == row_fingerprints(int_chunk)[0]
+    assert row_fingerprints(float_chunk)[1] != row_fingerprints(int_chunk)[0]
+
+
+def test_row_fingerprints_match_numbers_read_as_text():
+    """Test numeric keys hash the same whether a chunk read them as numbers or text"""
+    numeric_chunk = pd.DataFrame({'InvoiceNo': [536365], 'StockCode': [85123], 'UnitPrice': [2.55]})
+    text_chunk = pd.DataFrame({'InvoiceNo': ['536365'], 'StockCode': ['85123'], 'UnitPrice': ['2.55']})
+    
+    assert row_fingerprints(numeric_chunk)[0] == row_fingerprints(text_chunk)[0]
+
+
+# ============================================================================
+# TESTS: FingerprintStore / deduplicate_chunks
+# ============================================================================
+
+def test_deduplicate_chunks_matches_drop_duplicates(transactions_with_duplicates):
+    """Test chunked deduplication keeps the same rows as drop_duplicates"""
+    df = transactions_with_duplicates
+    chunks = (df.iloc[start:start + 250] for start in range(0, len(df), 250))
+    
+    result = pd.concat(deduplicate_chunks(chunks))
+    
+    pd.testing.assert_frame_equal(result, df.drop_duplicates())
+
+
+def test_deduplicate_chunks_across_dtype_changes():
+    """Test the same row is dropped when a later chunk reads CustomerID as int64"""
+    chunks = [
+        pd.DataFrame({'InvoiceNo': ['536365', '536366'], 'CustomerID': [17850.0, np.nan]}),
+        pd.DataFrame({'InvoiceNo': ['536365', '536367'], 'CustomerID': [17850, 13047]})
+    ]
+    
+    kept = [len(chunk) for chunk in deduplicate_chunks(chunks)]
+    
+    assert kept == [2, 1]
+
+
+def test_fingerprint_store_persists_across_runs(tmp_path, transactions_with_duplicates):
+    """Test rows loaded in an earlier run are dropped from a later load"""
+    df = transactions_with_duplicates.drop_duplicates()
+    store_path = tmp_path / 'fingerprints.npy'
+    
+    first_run = FingerprintStore(store_path)
+    first_run.filter(df.iloc[:500])
+    first_run.save()
+    
+    second_run = FingerprintStore(store_path)
+    new_rows = second_run.filter(df.iloc[400:600])
+    
+    assert len(second_run) == 600
+    assert list(new_rows.index) == list(df.index[500:600])
+
+
+def test_fingerprint_store_many_runs_compact():
+    """Test lookups stay correct after pending runs are merged"""
+    store = FingerprintStore()
+    fingerprints = np.arange(0, 2000, dtype=np.uint64) * np.uint64(7919)
+    for chunk in np.array_split(fingerprints, 20):
+        store.add(chunk)
+    
+    assert len(store) == 2000
+    assert store.contains(fingerprints).all()
+    assert not store.contains(fingerprints + np.uint64(1)).any()
+
+
+def test_remove_duplicates_with_store(transactions_with_duplicates):
+    """Test remove_duplicates drops rows from an earlier load"""
+    df = transactions_with_duplicates
+    store = FingerprintStore()
+    
+    first_load = remove_duplicates(df.iloc[:1500], store=store)
+    second_load = remove_duplicates(df.iloc[1500:], store=store)
+    
+    pd.testing.assert_frame_equal(pd.concat([first_load, second_load]), df.drop_duplicates())
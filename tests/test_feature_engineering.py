@@ -20,6 +20,7 @@ from datetime import datetime, timedelta
 from src.feature_engineering import (
     create_total_price,
     extract_date_features,
+    compute_date_parts,
     create_customer_metrics,
     create_rfm_scores,
     create_customer_segments,
@@ -27,6 +28,10 @@ from src.feature_engineering import (
     create_monthly_revenue,
     create_country_metrics,
     create_invoice_metrics,
+    create_cohort_retention,
+    create_daily_revenue,
+    update_daily_revenue,
+    create_temporal_patterns,
     engineer_all_features
 )
 
@@ -170,6 +175,50 @@ def test_extract_date_features_year_month_format():
     assert result['YearMonth'].iloc[2] == '2011-06'
 
 
+def test_extract_date_features_compact_year_month():
+    """Test YearMonth is categorical and MonthIndex is a compact integer"""
+    df = pd.DataFrame({
+        'Date': pd.to_datetime(['2009-12-31 23:59', '2010-01-01 00:00'])
+    })
+    
+    result = extract_date_features(df, date_col='Date')
+    
+    assert isinstance(result['YearMonth'].dtype, pd.CategoricalDtype)
+    assert list(result['YearMonth'].cat.categories) == ['2009-12', '2010-01']
+    assert result['MonthIndex'].dtype == np.int32
+    assert result['MonthIndex'].iloc[1] - result['MonthIndex'].iloc[0] == 1
+    assert list(result['Quarter']) == [4, 1]
+
+
+def test_compute_date_parts_matches_pandas():
+    """Test integer kernel agrees with pandas .dt accessors"""
+    np.random.seed(42)
+    nanos = np.random.randint(
+        pd.Timestamp('1900-01-01').value, pd.Timestamp('2100-12-31').value, 10000, dtype=np.int64
+    )
+    dates = pd.Series(pd.to_datetime(nanos))
+    
+    parts = compute_date_parts(dates)
+    
+    np.testing.assert_array_equal(parts['year'], dates.dt.year.values)
+    np.testing.assert_array_equal(parts['month'], dates.dt.month.values)
+    np.testing.assert_array_equal(parts['day'], dates.dt.day.values)
+    np.testing.assert_array_equal(parts['dayofweek'], dates.dt.dayofweek.values)
+    np.testing.assert_array_equal(parts['hour'], dates.dt.hour.values)
+    np.testing.assert_array_equal(parts['quarter'], dates.dt.quarter.values)
+
+
+def test_compute_date_parts_missing_dates():
+    """Test missing timestamps give NaN components"""
+    dates = pd.Series(pd.to_datetime(['2010-02-28 13:00', None]))
+    
+    parts = compute_date_parts(dates)
+    
+    assert parts['day'][0] == 28
+    assert parts['hour'][0] == 13
+    assert np.isnan(parts['month_index'][1])
+
+
 # ============================================================================
 # TESTS: create_customer_metrics
 # ============================================================================
@@ -518,6 +567,60 @@ def test_create_monthly_revenue_mom_growth():
     assert abs(feb_growth - 50.0) < 0.01
 
 
+# ============================================================================
+# TESTS: create_daily_revenue
+# ============================================================================
+
+def test_create_daily_revenue_basic(sample_ecommerce_data):
+    """Test daily revenue and order counts"""
+    df = sample_ecommerce_data.copy()
+    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
+    
+    result = create_daily_revenue(df)
+    
+    # One row per trading day (INV001 spans two lines on 2010-12-01)
+    assert len(result) == 5
+    assert result['DailyRevenue'].iloc[0] == 40.0
+    assert result['DailyOrders'].iloc[0] == 1
+
+
+def test_create_daily_revenue_moving_average():
+    """Test moving averages match pandas rolling means"""
+    np.random.seed(42)
+    dates = pd.date_range('2010-01-01', periods=60, freq='D')
+    df = pd.DataFrame({
+        'InvoiceNo': [f'INV{i:03d}' for i in range(60)],
+        'InvoiceDate': dates,
+        'TotalPrice': np.random.uniform(100, 1000, 60)
+    })
+    
+    result = create_daily_revenue(df)
+    
+    expected_7 = df['TotalPrice'].rolling(7, min_periods=1).mean()
+    expected_30 = df['TotalPrice'].rolling(30, min_periods=1).mean()
+    np.testing.assert_array_almost_equal(result['MovingAvg_7Day'].values, expected_7.values)
+    np.testing.assert_array_almost_equal(result['MovingAvg_30Day'].values, expected_30.values)
+
+
+def test_update_daily_revenue_matches_full_rebuild():
+    """Test incremental update gives the same series as a full rebuild"""
+    np.random.seed(42)
+    df = pd.DataFrame({
+        'InvoiceNo': [f'INV{i:03d}' for i in range(200)],
+        'InvoiceDate': pd.Timestamp('2010-01-01') + pd.to_timedelta(np.sort(np.random.randint(0, 90 * 24, 200)), unit='h'),
+        'TotalPrice': np.random.uniform(10, 100, 200)
+    })
+    cutoff = df['InvoiceDate'].iloc[120]
+    
+    full = create_daily_revenue(df)
+    partial = create_daily_revenue(df[df['InvoiceDate'] < cutoff])
+    updated = update_daily_revenue(partial, df[df['InvoiceDate'] >= cutoff])
+    
+    assert len(updated) == len(full)
+    np.testing.assert_array_almost_equal(updated['DailyRevenue'].values, full['DailyRevenue'].values)
+    np.testing.assert_array_almost_equal(updated['MovingAvg_30Day'].values, full['MovingAvg_30Day'].values)
+
+
 # ============================================================================
 # TESTS: create_country_metrics
 # ============================================================================
@@ -613,6 +716,92 @@ def test_create_invoice_metrics_calculations(sample_ecommerce_data):
     assert inv001['InvoiceValue'] == 40.0  # 20 + 20
 
 
+# ============================================================================
+# TESTS: create_temporal_patterns
+# ============================================================================
+
+def test_create_temporal_patterns_full_grid(sample_ecommerce_data):
+    """Test one row per weekday × hour cell"""
+    df = sample_ecommerce_data.copy()
+    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
+    
+    result = create_temporal_patterns(df)
+    
+    assert len(result) == 7 * 24
+    assert result['Transactions'].sum() == len(df)
+    assert result['Revenue'].sum() == pytest.approx(df['TotalPrice'].sum())
+
+
+def test_create_temporal_patterns_distinct_counts(sample_ecommerce_data):
+    """Test orders and customers are counted once per cell"""
+    df = sample_ecommerce_data.copy()
+    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
+    
+    result = create_temporal_patterns(df)
+    
+    # INV001 (two lines) on Wednesday 2010-12-01 at 10:00
+    cell = result[(result['DayName'] == 'Wednesday') & (result['Hour'] == 10)].iloc[0]
+    assert cell['Transactions'] == 2
+    assert cell['Orders'] == 1
+    assert cell['Customers'] == 1
+    assert cell['Revenue'] == 40.0
+
+
+# ============================================================================
+# TESTS: create_cohort_retention
+# ============================================================================
+
+def test_create_cohort_retention_across_year_boundary():
+    """Test month offsets stay correct when a cohort spans two years"""
+    df = pd.DataFrame({
+        'CustomerID': [1001, 1001, 1001, 1002, 1002],
+        'InvoiceDate': pd.to_datetime([
+            '2009-12-05', '2010-01-03', '2010-12-01',
+            '2010-01-10', '2010-02-01'
+        ])
+    })
+    
+    result = create_cohort_retention(df, as_rate=False)
+    
+    # Dec 2009 cohort returns in month 1 (Jan 2010) and month 12 (Dec 2010)
+    dec_cohort = result[result['CohortMonth'] == '2009-12'].iloc[0]
+    assert dec_cohort['CohortSize'] == 1
+    assert dec_cohort['Month_1'] == 1
+    assert dec_cohort['Month_12'] == 1
+    assert dec_cohort['Month_2'] == 0
+
+
+def test_create_cohort_retention_rates():
+    """Test retention rates are fractions of cohort size"""
+    df = pd.DataFrame({
+        'CustomerID': [1001, 1002, 1001, 1001],
+        'InvoiceDate': pd.to_datetime([
+            '2010-01-05', '2010-01-20', '2010-02-03', '2010-02-10'
+        ])
+    })
+    
+    result = create_cohort_retention(df)
+    
+    # One row per cohort; customer counted once per month
+    assert len(result) == 1
+    assert result['CohortSize'].iloc[0] == 2
+    assert result['Month_0'].iloc[0] == 1.0
+    assert result['Month_1'].iloc[0] == 0.5
+
+
+def test_create_cohort_retention_unobserved_months():
+    """Test offsets beyond the data window are NaN, not zero"""
+    df = pd.DataFrame({
+        'CustomerID': [1001, 1001, 1002],
+        'InvoiceDate': pd.to_datetime(['2010-01-05', '2010-03-01', '2010-03-02'])
+    })
+    
+    result = create_cohort_retention(df).set_index('CohortMonth')
+    
+    assert result.loc['2010-01', 'Month_2'] == 1.0
+    assert np.isnan(result.loc['2010-03', 'Month_1'])
+
+
 # ============================================================================
 # TESTS: engineer_all_features (Integration Test)
 # ============================================================================
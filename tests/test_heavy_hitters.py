@@ -0,0 +1,111 @@
+"""
+Unit Tests for Heavy Hitters
+
+Tests the mergeable Space-Saving summary and chunked top-seller tracking
+in src/heavy_hitters.py.
+
+Run tests with:
+    pytest tests/test_heavy_hitters.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.heavy_hitters import (
+    HeavyHitters,
+    track_top_sellers
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def transactions():
+    """Create transactions with Zipf-distributed products, like real sales"""
+    rng = np.random.default_rng(42)
+    n = 200000
+    return pd.DataFrame({
+        'StockCode': np.minimum(rng.zipf(1.3, n), 20000).astype(str),
+        'CustomerID': rng.integers(12000, 16000, n).astype(float),
+        'Quantity': rng.integers(1, 24, n),
+        'UnitPrice': rng.uniform(0.5, 10, n).round(2)
+    })
+
+
+def chunked(df, size):
+    """Split a dataframe into consecutive chunks"""
+    return [df.iloc[start:start + size] for start in range(0, len(df), size)]
+
+
+# ============================================================================
+# TESTS: HeavyHitters
+# ============================================================================
+
+def test_heavy_hitters_bounds_hold(transactions):
+    """Test every monitored key's true total lies within [estimate - error, estimate]"""
+    revenue = transactions['Quantity'] * transactions['UnitPrice']
+    exact = revenue.groupby(transactions['StockCode']).sum()
+    summary = HeavyHitters(capacity=200)
+    for chunk, chunk_revenue in zip(chunked(transactions, 10000), chunked(revenue, 10000)):
+        summary.update(chunk['StockCode'], chunk_revenue)
+    
+    true = exact[summary.estimates.index]
+    
+    assert len(summary) == 200
+    assert (true <= summary.estimates + 1e-6).all()
+    assert (true >= summary.estimates - summary.errors - 1e-6).all()
+    assert exact.drop(summary.estimates.index).max() <= summary.floor + 1e-6
+    assert summary.error_bound() <= summary.total_weight / 200 * 20
+    assert summary.total_weight == pytest.approx(revenue.sum())
+
+
+def test_heavy_hitters_top_matches_exact(transactions):
+    """Test the guaranteed top products equal the exact top products"""
+    exact = transactions.groupby('StockCode')['Quantity'].sum().nlargest(20)
+    summary = HeavyHitters(capacity=500)
+    for chunk in chunked(transactions, 25000):
+        summary.update(chunk['StockCode'], chunk['Quantity'])
+    
+    top = summary.top(20)
+    
+    assert top['Guaranteed'].all()
+    assert set(top['Key']) == set(exact.index)
+    np.testing.assert_allclose(top.set_index('Key')['Estimate'][exact.index], exact.values)
+
+
+def test_heavy_hitters_merge_partitions(transactions):
+    """Test summaries of separate partitions merge to the same top keys"""
+    left, right = HeavyHitters(300), HeavyHitters(300)
+    for chunk in chunked(transactions.iloc[:100000], 20000):
+        left.update(chunk['StockCode'])
+    for chunk in chunked(transactions.iloc[100000:], 20000):
+        right.update(chunk['StockCode'])
+    
+    merged = left.merge(right).top(10)
+    exact = transactions['StockCode'].value_counts().iloc[:10]
+    
+    assert list(merged['Key']) == list(exact.index)
+    assert (merged['LowerBound'] <= exact.values).all()
+    with pytest.raises(ValueError):
+        HeavyHitters(capacity=0)
+
+
+# ============================================================================
+# TESTS: track_top_sellers
+# ============================================================================
+
+def test_track_top_sellers(transactions):
+    """Test products and customers are tracked together, deriving TotalPrice"""
+    summaries = track_top_sellers(chunked(transactions, 50000), capacity=100)
+    exact = (transactions['Quantity'] * transactions['UnitPrice']).groupby(transactions['StockCode']).sum()
+    
+    assert set(summaries) == {'products_by_revenue', 'products_by_units',
+                              'customers_by_revenue', 'customers_by_units'}
+    assert summaries['products_by_revenue'].top(1)['Key'].iloc[0] == exact.idxmax()
+    assert len(summaries['customers_by_units']) == 100
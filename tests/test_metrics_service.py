@@ -0,0 +1,161 @@
+"""
+Unit Tests for Metrics Query Service
+
+Tests the dataset indexes, hot reload and HTTP routes in
+src/metrics_service.py.
+
+Run tests with:
+    pytest tests/test_metrics_service.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import asyncio
+import json
+import os
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.metrics_service import (
+    DatasetIndex,
+    MetricsStore,
+    MetricsService
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def customer_metrics():
+    """Create customer metrics with float IDs, as read back from CSV"""
+    data = {
+        'CustomerID': [17850.0, 13047.0, 12583.0, 13748.0],
+        'TotalOrders': [35, 18, 17, 5],
+        'CustomerLifetimeValue': [5391.21, 3237.54, np.nan, 948.25]
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def metric_files(tmp_path, customer_metrics):
+    """Write customer and monthly metrics to CSV and return their paths"""
+    paths = {
+        'customer_metrics': str(tmp_path / 'customer_metrics.csv'),
+        'monthly_revenue': str(tmp_path / 'monthly_revenue.csv')
+    }
+    customer_metrics.to_csv(paths['customer_metrics'], index=False)
+    pd.DataFrame({
+        'YearMonth': ['2010-01', '2010-02', '2010-03'],
+        'MonthlyRevenue': [560000.0, 498000.0, 683000.0]
+    }).to_csv(paths['monthly_revenue'], index=False)
+    return paths
+
+
+async def _get(port, path):
+    """Send one GET request and return (status, JSON body)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(body)
+
+
+# ============================================================================
+# TESTS: DatasetIndex
+# ============================================================================
+
+def test_dataset_index_lookup(customer_metrics):
+    """Test point lookups accept integer and float spellings of an ID"""
+    index = DatasetIndex('customer_metrics', customer_metrics, 'CustomerID')
+    
+    assert index.lookup('17850')[0]['TotalOrders'] == 35
+    assert index.lookup('13047.0')[0]['TotalOrders'] == 18
+    assert index.lookup('99999') == []
+    assert index.lookup('12583')[0]['CustomerLifetimeValue'] is None
+
+
+def test_dataset_index_top_and_range(customer_metrics):
+    """Test top-N skips missing values and range bounds are inclusive"""
+    index = DatasetIndex('customer_metrics', customer_metrics, 'CustomerID')
+    
+    top = index.top('CustomerLifetimeValue', n=2)
+    assert [row['TotalOrders'] for row in top] == [35, 18]
+    assert len(index.top('CustomerLifetimeValue', n=10)) == 3
+    assert index.top('TotalOrders', n=1, ascending=True)[0]['TotalOrders'] == 5
+    
+    total, rows = index.range('TotalOrders', min_value='17', max_value='35', limit=2)
+    assert total == 3
+    assert [row['TotalOrders'] for row in rows] == [17, 18]
+    
+    with pytest.raises(KeyError):
+        index.top('Missing')
+
+
+# ============================================================================
+# TESTS: MetricsService
+# ============================================================================
+
+def test_metrics_service_http_routes(metric_files):
+    """Test lookup, top-N, range and error routes over HTTP"""
+    service = MetricsService(lambda: MetricsStore(metric_files), reload_interval=0)
+    
+    async def scenario():
+        server = await service.start('127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [
+                await _get(port, '/customer_metrics/17850'),
+                await _get(port, '/customer_metrics/top?by=TotalOrders&n=2'),
+                await _get(port, '/monthly_revenue/range?column=YearMonth&min=2010-02'),
+                await _get(port, '/customer_metrics/1'),
+                await _get(port, '/customer_metrics/top?by=Missing'),
+                await _get(port, '/unknown/1'),
+            ]
+    
+    lookup, top, month_range, not_found, bad_column, unknown = asyncio.run(scenario())
+    
+    assert lookup == (200, {'rows': [{'CustomerID': 17850.0, 'TotalOrders': 35,
+                                      'CustomerLifetimeValue': 5391.21}]})
+    assert [row['TotalOrders'] for row in top[1]['rows']] == [35, 18]
+    assert month_range[1]['total'] == 2
+    assert [row['YearMonth'] for row in month_range[1]['rows']] == ['2010-02', '2010-03']
+    assert not_found[0] == 404
+    assert bad_column[0] == 400
+    assert unknown[0] == 404
+
+
+def test_metrics_service_rejects_negative_counts(metric_files):
+    """Test negative n or limit is a 400, not a way around max_results"""
+    service = MetricsService(lambda: MetricsStore(metric_files), reload_interval=0, max_results=1)
+    
+    assert service.handle_query('/customer_metrics/top?by=TotalOrders&n=-1')[0] == 400
+    assert service.handle_query('/monthly_revenue/range?column=YearMonth&limit=-1')[0] == 400
+    status, body = service.handle_query('/customer_metrics/top?by=TotalOrders&n=5')
+    assert status == 200 and len(body['rows']) == 1
+
+
+def test_metrics_service_hot_reload(metric_files):
+    """Test new outputs are loaded once the files stop changing"""
+    service = MetricsService(lambda: MetricsStore(metric_files), reload_interval=0)
+    
+    pd.DataFrame({'CustomerID': [99999.0], 'TotalOrders': [1], 'CustomerLifetimeValue': [10.0]}).to_csv(
+        metric_files['customer_metrics'], index=False)
+    os.utime(metric_files['customer_metrics'], ns=(0, 10 ** 18))
+    
+    async def scenario():
+        pending = await service.check_reload()
+        before = service.store['customer_metrics'].lookup('99999')
+        await service.check_reload(pending)
+        return before
+    
+    before = asyncio.run(scenario())
+    
+    assert before == []
+    assert service.reloads == 1
+    assert service.store['customer_metrics'].lookup('99999')[0]['TotalOrders'] == 1
@@ -0,0 +1,99 @@
+"""
+End-to-End Tests for the Pipeline Script
+
+Runs scripts/run_pipeline.py on a small synthetic extract and checks the
+model outputs line up with the customer metrics they were scored from.
+
+Run tests with:
+    pytest tests/test_pipeline.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import pandas as pd
+import numpy as np
+import yaml
+
+from src.customer_index import CustomerIndex
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture(scope='module')
+def pipeline_run(tmp_path_factory):
+    """Run the full pipeline on a year of synthetic transactions; return its working directory"""
+    workdir = tmp_path_factory.mktemp('pipeline')
+    (workdir / 'data').mkdir()
+    
+    np.random.seed(42)
+    n_invoices = 1500
+    invoices = pd.DataFrame({
+        'InvoiceNo': np.arange(536365, 536365 + n_invoices).astype(str),
+        'CustomerID': np.random.randint(12000, 12300, n_invoices).astype(float),
+        'InvoiceDate': pd.Timestamp('2009-12-01') + pd.to_timedelta(
+            np.sort(np.random.randint(0, 370 * 24 * 60, n_invoices)), unit='min'),
+        'Country': np.random.choice(['United Kingdom', 'France', 'Germany'], n_invoices)
+    })
+    lines = invoices.loc[np.repeat(np.arange(n_invoices), 5)].reset_index(drop=True)
+    stock_codes = np.random.randint(20000, 20200, len(lines)).astype(str)
+    lines['StockCode'] = stock_codes
+    lines['Description'] = [f'PRODUCT {code}' for code in stock_codes]
+    lines['Quantity'] = np.random.randint(1, 24, len(lines))
+    lines['UnitPrice'] = np.random.choice([0.85, 1.25, 2.55, 4.95], len(lines))
+    lines['InvoiceDate'] = lines['InvoiceDate'].dt.strftime('%m/%d/%Y %H:%M')
+    lines.to_csv(workdir / 'data' / 'raw_data.csv', index=False)
+    
+    with open(PROJECT_ROOT / 'config' / 'config.yaml', 'r') as file:
+        config = yaml.safe_load(file)
+    config['file_paths'] = {'raw_data': 'data/raw_data.csv', 'processed_dir': 'data/processed'}
+    with open(workdir / 'config.yaml', 'w') as file:
+        yaml.safe_dump(config, file)
+    
+    env = {**os.environ, 'PYTHONPATH': str(PROJECT_ROOT)}
+    result = subprocess.run(
+        [sys.executable, str(PROJECT_ROOT / 'scripts' / 'run_pipeline.py'), '--config', 'config.yaml'],
+        cwd=workdir, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    
+    return workdir
+
+
+# ============================================================================
+# TESTS: run_pipeline.py
+# ============================================================================
+
+def test_pipeline_scores_every_customer(pipeline_run):
+    """Test churn and CLV scores are computed from the customer metrics, one row per customer"""
+    processed = pipeline_run / 'data' / 'processed'
+    customer_metrics = pd.read_csv(processed / 'customer_metrics.csv')
+    churn_scores = pd.read_csv(processed / 'churn_scores.csv')
+    clv_scores = pd.read_csv(processed / 'clv_scores.csv')
+    
+    assert 'Recency_Days' in customer_metrics.columns
+    assert churn_scores['CustomerID'].tolist() == customer_metrics['CustomerID'].tolist()
+    assert clv_scores['CustomerID'].tolist() == customer_metrics['CustomerID'].tolist()
+    assert (clv_scores['PredictedRevenue'] >= 0).all()
+    assert (pipeline_run / 'models' / 'clv_model.npz').exists()
+
+
+def test_pipeline_customer_index_points_at_customer_metrics(pipeline_run):
+    """Test the saved index maps each customer to its row in customer_metrics.csv"""
+    customer_metrics = pd.read_csv(pipeline_run / 'data' / 'processed' / 'customer_metrics.csv')
+    index = CustomerIndex.load(str(pipeline_run / 'data' / 'customer_index'), mmap=False)
+    
+    rows = index.metrics_rows[np.searchsorted(index.customer_ids, customer_metrics['CustomerID'].astype(np.int64))]
+    
+    assert rows.tolist() == list(range(len(customer_metrics)))
+    assert index.source_rows['customer_metrics'] == len(customer_metrics)
@@ -0,0 +1,126 @@
+"""
+Unit Tests for Product Seasonality
+
+Tests the product × month matrices and seasonality indices in
+src/seasonality.py.
+
+Run tests with:
+    pytest tests/test_seasonality.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.seasonality import (
+    build_product_month_matrix,
+    create_product_seasonality
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def transactions():
+    """Create a year of random transactions over a few hundred products"""
+    np.random.seed(42)
+    n = 20000
+    return pd.DataFrame({
+        'StockCode': np.random.randint(10000, 10300, n).astype(str),
+        'Quantity': np.random.randint(1, 20, n),
+        'UnitPrice': np.random.uniform(0.5, 20, n).round(2),
+        'InvoiceDate': pd.Timestamp('2010-01-01') + pd.to_timedelta(np.random.randint(0, 365 * 24, n), unit='h')
+    })
+
+
+@pytest.fixture
+def christmas_product():
+    """Create one steady product and one that sells mostly in December"""
+    dates = pd.to_datetime([f'2010-{month:02d}-15' for month in range(1, 13)] * 2)
+    return pd.DataFrame({
+        'StockCode': ['STEADY'] * 12 + ['XMAS'] * 12,
+        'Quantity': [10] * 12 + [1] * 11 + [89],
+        'UnitPrice': [1.0] * 24,
+        'InvoiceDate': dates
+    })
+
+
+# ============================================================================
+# TESTS: build_product_month_matrix
+# ============================================================================
+
+def test_matrix_matches_groupby(transactions):
+    """Test scatter-added cells equal a groupby over product and month"""
+    matrix = build_product_month_matrix(transactions)
+    revenue = transactions['Quantity'] * transactions['UnitPrice']
+    month = transactions['InvoiceDate'].dt.strftime('%Y-%m')
+    expected = revenue.groupby([transactions['StockCode'], month]).sum().unstack(fill_value=0)
+    
+    assert matrix.revenue.dtype == np.float32
+    assert matrix.shape == (300, 12)
+    np.testing.assert_allclose(matrix.to_frame('revenue').values, expected.values, rtol=1e-5)
+    np.testing.assert_allclose(matrix.units.sum(), transactions['Quantity'].sum())
+
+
+def test_sparse_matrix_matches_dense(transactions):
+    """Test the sparse build gives the same values and seasonality indices"""
+    dense = build_product_month_matrix(transactions)
+    sparse = build_product_month_matrix(transactions.iloc[::50], sparse=True)
+    dense_subset = build_product_month_matrix(transactions.iloc[::50])
+    
+    assert sparse.is_sparse and not dense.is_sparse
+    np.testing.assert_allclose(sparse.revenue.toarray(), dense_subset.revenue)
+    pd.testing.assert_frame_equal(sparse.seasonality_indices('units'), dense_subset.seasonality_indices('units'))
+    with pytest.raises(ValueError):
+        dense.to_frame('margin')
+
+
+# ============================================================================
+# TESTS: seasonality indices
+# ============================================================================
+
+def test_seasonality_indices(christmas_product):
+    """Test a December-heavy product peaks in December and a steady one is flat"""
+    seasonality = create_product_seasonality(christmas_product).set_index('StockCode')
+    
+    assert seasonality.loc['XMAS', 'PeakMonth'] == 'Dec'
+    assert seasonality.loc['XMAS', 'Dec'] == pytest.approx(89 / (100 / 12))
+    assert seasonality.loc['XMAS', 'SeasonalityCV'] > 2
+    assert seasonality.loc['STEADY', 'SeasonalityCV'] == pytest.approx(0)
+    assert (seasonality.loc['STEADY', 'Jan':'Dec'] == 1).all()
+
+
+def test_seasonality_partial_year_and_descriptions(christmas_product):
+    """Test months absent from the data have no index and descriptions are attached"""
+    partial = christmas_product[christmas_product['InvoiceDate'].dt.month <= 6]
+    product_metrics = pd.DataFrame({'StockCode': ['XMAS', 'STEADY'],
+                                    'Description': ['PAPER CHAIN KIT', 'WHITE HANGING HEART']})
+    
+    seasonality = create_product_seasonality(partial, product_metrics)
+    
+    assert seasonality.loc[:, 'Jul':'Dec'].isna().all().all()
+    assert seasonality.set_index('StockCode').loc['XMAS', 'Description'] == 'PAPER CHAIN KIT'
+
+
+@pytest.mark.parametrize('sparse', [False, True])
+def test_seasonality_zero_total_has_no_peak(christmas_product, sparse):
+    """Test a product whose sales net to zero has no peak month or indices"""
+    returned = pd.DataFrame({
+        'StockCode': ['RETURNED', 'RETURNED'],
+        'Quantity': [3, -3],
+        'UnitPrice': [2.0, 2.0],
+        'InvoiceDate': pd.to_datetime(['2010-01-15', '2010-02-15'])
+    })
+    df = pd.concat([christmas_product, returned], ignore_index=True)
+    
+    seasonality = create_product_seasonality(df, sparse=sparse).set_index('StockCode')
+    
+    assert seasonality.loc['RETURNED', 'PeakMonth'] is None
+    assert np.isnan(seasonality.loc['RETURNED', 'PeakIndex'])
+    assert seasonality.loc['RETURNED', 'Jan':'Dec'].isna().all()
+    assert seasonality.loc['XMAS', 'PeakMonth'] == 'Dec'
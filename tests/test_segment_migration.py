@@ -0,0 +1,99 @@
+"""
+Unit Tests for Segment Migration
+
+Tests transition matrices and per-customer movement in
+src/segment_migration.py.
+
+Run tests with:
+    pytest tests/test_segment_migration.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.snapshots import RFMSnapshots
+from src.segment_migration import (
+    NO_SEGMENT,
+    transition_counts,
+    segment_transition_matrix,
+    create_segment_transitions,
+    customer_segment_movement
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def snapshots():
+    """Create three snapshots: one upgrade, one downgrade, one new and one steady customer"""
+    data = {
+        'AsOfDate': pd.to_datetime(['2011-01-01'] * 3 + ['2011-02-01'] * 4 + ['2011-03-01'] * 4),
+        'CustomerID': [1.0, 2.0, 3.0, 1.0, 2.0, 3.0, 4.0, 1.0, 2.0, 3.0, 4.0],
+        'CustomerSegment': ['At Risk', 'Champions', 'Loyal Customers',
+                            'Champions', 'Lost Customers', 'Loyal Customers', 'Potential Loyalists',
+                            'Champions', 'Lost Customers', 'Loyal Customers', 'Potential Loyalists']
+    }
+    return RFMSnapshots(pd.DataFrame(data))
+
+
+# ============================================================================
+# TESTS: transition matrices
+# ============================================================================
+
+def test_transition_counts_match_crosstab():
+    """Test packed-pair bincount against a crosstab over random codes"""
+    np.random.seed(42)
+    from_codes = np.random.randint(-1, 5, 10000).astype(np.int8)
+    to_codes = np.random.randint(0, 5, 10000).astype(np.int8)
+    
+    counts = transition_counts(from_codes, to_codes)
+    expected = pd.crosstab(from_codes, to_codes).reindex(index=range(-1, 5), columns=range(-1, 5), fill_value=0)
+    
+    np.testing.assert_array_equal(counts, expected.values)
+
+
+def test_segment_transition_matrix(snapshots):
+    """Test counts and row shares between the first and last snapshot"""
+    counts = segment_transition_matrix(snapshots)
+    shares = segment_transition_matrix(snapshots, '2011-01-15', '2011-03-01', normalize=True)
+    
+    assert counts.values.sum() == 4
+    assert counts.loc['At Risk', 'Champions'] == 1
+    assert counts.loc['Champions', 'Lost Customers'] == 1
+    assert counts.loc[NO_SEGMENT, 'Potential Loyalists'] == 1
+    assert shares.loc['Champions', 'Lost Customers'] == 1.0
+    with pytest.raises(ValueError):
+        segment_transition_matrix(snapshots, '2011-03-01', '2011-01-01')
+
+
+def test_create_segment_transitions(snapshots):
+    """Test the long table of consecutive-period transitions"""
+    transitions = create_segment_transitions(snapshots)
+    
+    assert transitions['Customers'].sum() == 2 * 4
+    second = transitions[transitions['FromDate'] == '2011-02-01']
+    assert (second['FromSegment'] == second['ToSegment']).all()
+    assert transitions.groupby(['FromDate', 'FromSegment'])['Share'].sum().eq(1.0).all()
+
+
+# ============================================================================
+# TESTS: customer_segment_movement
+# ============================================================================
+
+def test_customer_segment_movement(snapshots):
+    """Test movement direction and step count per customer"""
+    movement = customer_segment_movement(snapshots).set_index('CustomerID')
+    changed = customer_segment_movement(snapshots, changed_only=True)
+    
+    assert movement.loc[1.0, 'Movement'] == 'Upgraded'
+    assert movement.loc[1.0, 'SegmentChange'] == 3
+    assert movement.loc[2.0, 'Movement'] == 'Downgraded'
+    assert movement.loc[3.0, 'Movement'] == 'Unchanged'
+    assert movement.loc[4.0, 'Movement'] == 'New'
+    assert sorted(changed['CustomerID']) == [1.0, 2.0, 4.0]
@@ -0,0 +1,104 @@
+"""
+Unit Tests for RFM Snapshots
+
+Tests the snapshot sweep and point-in-time queries in src/snapshots.py.
+
+Run tests with:
+    pytest tests/test_snapshots.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.snapshots import (
+    snapshot_dates,
+    create_rfm_snapshots,
+    RFMSnapshots
+)
+from src.feature_engineering import (
+    create_customer_metrics,
+    create_rfm_scores,
+    create_customer_segments
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def transactions():
+    """Create six months of random transactions, with some guest lines"""
+    np.random.seed(42)
+    n = 3000
+    df = pd.DataFrame({
+        'InvoiceNo': np.random.randint(536000, 537200, n).astype(str),
+        'Quantity': np.random.randint(1, 20, n),
+        'UnitPrice': np.random.uniform(0.5, 20, n).round(2),
+        'CustomerID': np.random.randint(12000, 12300, n).astype(float)
+    })
+    # All lines of an invoice share the invoice's customer and timestamp
+    invoice_dates = pd.Series(
+        pd.Timestamp('2010-01-01') + pd.to_timedelta(np.random.randint(0, 181 * 24, 1200), unit='h'),
+        index=np.arange(536000, 537200).astype(str)
+    )
+    invoice_customers = df.groupby('InvoiceNo')['CustomerID'].first()
+    df['InvoiceDate'] = df['InvoiceNo'].map(invoice_dates)
+    df['CustomerID'] = df['InvoiceNo'].map(invoice_customers)
+    df.loc[df.sample(frac=0.05, random_state=1).index, 'CustomerID'] = np.nan
+    df['TotalPrice'] = df['Quantity'] * df['UnitPrice']
+    return df
+
+
+# ============================================================================
+# TESTS: create_rfm_snapshots
+# ============================================================================
+
+def test_snapshot_dates_cover_data(transactions):
+    """Test month-start dates run from after the first to after the last transaction"""
+    dates = snapshot_dates(transactions, 'MS')
+    
+    assert dates[0] == pd.Timestamp('2010-02-01')
+    assert dates[-1] == pd.Timestamp('2010-07-01')
+
+
+def test_snapshots_match_single_date_metrics(transactions):
+    """Test each snapshot equals the single-date computation on earlier transactions"""
+    dates = snapshot_dates(transactions, 'MS')
+    snapshots = create_rfm_snapshots(transactions, dates)
+    
+    for as_of in dates[[0, 3, -1]]:
+        expected = create_customer_segments(create_rfm_scores(create_customer_metrics(
+            transactions[transactions['InvoiceDate'] < as_of], analysis_date=str(as_of)
+        )))
+        snapshot = snapshots.snapshot(as_of).drop(columns='AsOfDate').reset_index(drop=True)
+        
+        pd.testing.assert_frame_equal(snapshot, expected[snapshot.columns].reset_index(drop=True),
+                                      check_dtype=False)
+
+
+def test_snapshots_segment_as_of(transactions):
+    """Test point-in-time segment lookups use the latest snapshot on or before the date"""
+    snapshots = create_rfm_snapshots(transactions, snapshot_dates(transactions, 'MS'))
+    may = snapshots.snapshot('2010-05-01').set_index('CustomerID')['CustomerSegment']
+    customer_id = may.index[0]
+    
+    assert snapshots.segment_as_of(customer_id, '2010-05-20') == may.loc[customer_id]
+    assert snapshots.segment_as_of(customer_id, '2010-01-15') is None
+    assert snapshots.segment_as_of(99999.0, '2010-05-20') is None
+    assert snapshots.segments_as_of('2010-05-20').equals(may.rename_axis('CustomerID'))
+
+
+def test_snapshots_save_and_load(tmp_path, transactions):
+    """Test snapshots reload from CSV with the same segments"""
+    snapshots = create_rfm_snapshots(transactions, ['2010-03-01', '2010-06-01'])
+    snapshots.save(str(tmp_path / 'rfm_snapshots.csv'))
+    
+    loaded = RFMSnapshots.load(str(tmp_path / 'rfm_snapshots.csv'))
+    
+    assert len(loaded) == 2
+    np.testing.assert_array_equal(loaded.segment_codes, snapshots.segment_codes)
@@ -0,0 +1,125 @@
+"""
+Unit Tests for Streaming Statistics Module
+
+Tests the quantile sketch, running moments and chunked outlier bounds
+in src/streaming_stats.py.
+
+Run tests with:
+    pytest tests/test_streaming_stats.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.streaming_stats import (
+    RunningMoments,
+    KLLSketch,
+    compute_outlier_bounds
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def skewed_values():
+    """Create right-skewed values like unit prices"""
+    rng = np.random.default_rng(42)
+    return rng.lognormal(1, 1, 200000)
+
+
+# ============================================================================
+# TESTS: RunningMoments
+# ============================================================================
+
+def test_running_moments_chunked_matches_numpy(skewed_values):
+    """Test chunked mean and std match a single numpy pass"""
+    moments = RunningMoments()
+    for chunk in np.array_split(skewed_values, 13):
+        moments.update(chunk)
+    
+    assert moments.count == len(skewed_values)
+    assert moments.mean == pytest.approx(skewed_values.mean())
+    assert moments.std() == pytest.approx(skewed_values.std())
+    assert moments.std(ddof=1) == pytest.approx(skewed_values.std(ddof=1))
+
+
+def test_running_moments_merge_and_missing():
+    """Test merging partitions and ignoring NaN"""
+    left = RunningMoments().update([1.0, 2.0, np.nan])
+    right = RunningMoments().update([3.0, 4.0])
+    
+    left.merge(right)
+    
+    assert left.count == 4
+    assert left.mean == pytest.approx(2.5)
+    assert left.variance(ddof=1) == pytest.approx(np.var([1, 2, 3, 4], ddof=1))
+
+
+# ============================================================================
+# TESTS: KLLSketch
+# ============================================================================
+
+def test_kll_sketch_exact_when_small():
+    """Test the sketch is exact before any compaction"""
+    sketch = KLLSketch(k=200).update(np.arange(1, 101))
+    
+    assert sketch.quantile(0.5) == 50
+    assert sketch.quantile(0) == 1
+    assert sketch.quantile(1) == 100
+
+
+def test_kll_sketch_rank_error_and_memory(skewed_values):
+    """Test quantile rank error and retained items stay bounded"""
+    sketch = KLLSketch(k=200, seed=0)
+    for chunk in np.array_split(skewed_values, 20):
+        sketch.update(chunk)
+    
+    qs = np.array([0.05, 0.25, 0.5, 0.75, 0.95])
+    ranks = np.searchsorted(np.sort(skewed_values), sketch.quantiles(qs)) / len(skewed_values)
+    
+    assert np.abs(ranks - qs).max() < 0.02
+    assert len(sketch) < 4 * sketch.k
+
+
+def test_kll_sketch_merge(skewed_values):
+    """Test sketches built on partitions merge into one"""
+    half = len(skewed_values) // 2
+    left = KLLSketch(k=200, seed=1).update(skewed_values[:half])
+    right = KLLSketch(k=200, seed=2).update(skewed_values[half:])
+    
+    merged = left.merge(right)
+    rank = np.searchsorted(np.sort(skewed_values), merged.quantile(0.75)) / len(skewed_values)
+    
+    assert merged.count == len(skewed_values)
+    assert abs(rank - 0.75) < 0.02
+
+
+# ============================================================================
+# TESTS: compute_outlier_bounds
+# ============================================================================
+
+def test_compute_outlier_bounds_iqr_close_to_exact(skewed_values):
+    """Test streamed IQR bounds are close to exact bounds"""
+    chunks = (pd.DataFrame({'UnitPrice': chunk}) for chunk in np.array_split(skewed_values, 10))
+    
+    lower, upper = compute_outlier_bounds(chunks, 'UnitPrice', method='iqr', k=400, seed=0)
+    
+    q1, q3 = np.quantile(skewed_values, [0.25, 0.75])
+    assert upper == pytest.approx(q3 + 1.5 * (q3 - q1), rel=0.05)
+    assert lower == pytest.approx(q1 - 1.5 * (q3 - q1), rel=0.05)
+
+
+def test_compute_outlier_bounds_zscore_exact(skewed_values):
+    """Test streamed z-score bounds equal in-memory bounds"""
+    chunks = (pd.Series(chunk) for chunk in np.array_split(skewed_values, 10))
+    
+    lower, upper = compute_outlier_bounds(chunks, method='zscore', threshold=3)
+    
+    assert upper == pytest.approx(skewed_values.mean() + 3 * skewed_values.std())
+    assert lower == pytest.approx(skewed_values.mean() - 3 * skewed_values.std())
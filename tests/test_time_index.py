@@ -0,0 +1,123 @@
+"""
+Unit Tests for Time Index Module
+
+Tests the sorted date range view in src/time_index.py.
+
+Run tests with:
+    pytest tests/test_time_index.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.time_index import (
+    is_sorted_by,
+    TimeIndexedView
+)
+from src.data_cleaning import filter_by_date_range
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def shuffled_transactions():
+    """Create transactions over three months in random order"""
+    np.random.seed(42)
+    dates = pd.date_range('2010-01-01', '2010-03-31 23:00', freq='7H')
+    df = pd.DataFrame({
+        'InvoiceDate': dates,
+        'TotalPrice': np.random.uniform(1, 100, len(dates))
+    })
+    return df.sample(frac=1, random_state=42)
+
+
+# ============================================================================
+# TESTS: TimeIndexedView
+# ============================================================================
+
+def test_view_sorts_unsorted_frame(shuffled_transactions):
+    """Test the view sorts rows by date"""
+    assert not is_sorted_by(shuffled_transactions)
+    
+    view = TimeIndexedView(shuffled_transactions)
+    
+    assert is_sorted_by(view.df)
+    assert len(view) == len(shuffled_transactions)
+
+
+def test_view_slice_matches_mask(shuffled_transactions):
+    """Test slices match boolean mask filtering with inclusive bounds"""
+    view = TimeIndexedView(shuffled_transactions)
+    dates = shuffled_transactions['InvoiceDate']
+    
+    for start, end in [('2010-01-15', '2010-02-01'), ('2010-02-03 07:00', '2010-02-03 21:00'),
+                       ('2009-01-01', '2011-01-01'), ('2010-05-01', '2010-06-01')]:
+        expected = shuffled_transactions[(dates >= start) & (dates <= end)]
+        result = view.slice(start, end)
+        
+        assert len(result) == len(expected) == view.count(start, end)
+        assert set(result.index) == set(expected.index)
+
+
+def test_view_missing_dates_excluded():
+    """Test rows with missing dates never fall in a range"""
+    df = pd.DataFrame({
+        'InvoiceDate': pd.to_datetime(['2010-01-02', None, '2010-01-01'])
+    })
+    
+    view = TimeIndexedView(df)
+    
+    assert view.count() == 2
+    assert view.date_range == (pd.Timestamp('2010-01-01'), pd.Timestamp('2010-01-02'))
+
+
+def test_view_monthly_windows(shuffled_transactions):
+    """Test calendar windows partition every row"""
+    view = TimeIndexedView(shuffled_transactions)
+    
+    windows = list(view.windows('MS'))
+    
+    assert [start.month for start, _ in windows] == [1, 2, 3]
+    assert sum(len(rows) for _, rows in windows) == len(shuffled_transactions)
+    assert (windows[1][1]['InvoiceDate'].dt.month == 2).all()
+
+
+# ============================================================================
+# TESTS: filter_by_date_range (sorted path)
+# ============================================================================
+
+def test_filter_by_date_range_sorted_returns_copy(shuffled_transactions):
+    """Test the binary search path returns an independent copy"""
+    df = TimeIndexedView(shuffled_transactions).df
+    
+    result = filter_by_date_range(df, 'InvoiceDate', '2010-02-01', '2010-02-28 23:59:59')
+    result['TotalPrice'] = 0
+    
+    assert len(result) == (df['InvoiceDate'].dt.month == 2).sum()
+    assert (df['TotalPrice'] > 0).all()
+
+
+def test_filter_by_date_range_reuses_view(shuffled_transactions):
+    """Test a prebuilt view gives the same rows as the unsorted mask path"""
+    view = TimeIndexedView(shuffled_transactions)
+    
+    result = filter_by_date_range(view.df, 'InvoiceDate', '2010-01-15', '2010-02-01', view=view)
+    expected = filter_by_date_range(shuffled_transactions, 'InvoiceDate', '2010-01-15', '2010-02-01')
+    result['TotalPrice'] = 0
+    
+    assert set(result.index) == set(expected.index)
+    assert (view.df['TotalPrice'] > 0).all()
+
+
+def test_filter_by_date_range_rejects_foreign_view(shuffled_transactions):
+    """Test a view built on another column or frame is refused"""
+    view = TimeIndexedView(shuffled_transactions.head(10))
+    
+    with pytest.raises(ValueError):
+        filter_by_date_range(shuffled_transactions, 'InvoiceDate', '2010-01-15', '2010-02-01', view=view)
@@ -0,0 +1,209 @@
+"""
+Unit Tests for Utility Functions
+
+Tests the data profiler, quality metrics and logging helpers in src/utils.py.
+
+Run tests with:
+    pytest tests/test_utils.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import os
+import sys
+import pytest
+from pathlib import Path
+import pandas as pd
+import numpy as np
+
+from loguru import logger
+
+from src.utils import (
+    profile_dataframe,
+    get_data_quality_metrics,
+    setup_logging,
+    detect_datetime_format,
+    replace_directory,
+    parse_datetime,
+    LogSummary
+)
+from src.data_cleaning import remove_cancelled_orders
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def sample_data():
+    """Create sample data with missing values and one duplicate row"""
+    data = {
+        'InvoiceNo': ['536365', '536366', '536367', '536368', '536365'],
+        'Quantity': [6, 8, 2, 32, 6],
+        'UnitPrice': [2.55, 3.39, np.nan, 1.25, 2.55],
+        'CustomerID': [17850.0, np.nan, np.nan, 13047.0, 17850.0],
+        'InvoiceDate': pd.to_datetime(['2010-12-01'] * 5)
+    }
+    return pd.DataFrame(data)
+
+
+@pytest.fixture
+def log_messages():
+    """Capture log messages in a list"""
+    messages = []
+    sink_id = logger.add(messages.append, format="{message}", level="INFO")
+    yield messages
+    logger.remove(sink_id)
+
+
+# ============================================================================
+# TESTS: get_data_quality_metrics
+# ============================================================================
+
+def test_get_data_quality_metrics_matches_pandas(sample_data):
+    """Test metrics agree with direct pandas computations"""
+    metrics = get_data_quality_metrics(sample_data)
+    
+    assert metrics['total_rows'] == 5
+    assert metrics['missing_values'] == sample_data.isnull().sum().sum() == 3
+    assert metrics['duplicates'] == sample_data.duplicated().sum() == 1
+    assert metrics['memory_mb'] == pytest.approx(sample_data.memory_usage(deep=True).sum() / 1024**2)
+    assert metrics['numeric_columns'] == 3
+    assert metrics['categorical_columns'] == 1
+    assert metrics['datetime_columns'] == 1
+
+
+def test_get_data_quality_metrics_completeness_score(sample_data):
+    """Test completeness score is the share of non-missing cells"""
+    metrics = get_data_quality_metrics(sample_data)
+    
+    assert metrics['completeness_score'] == pytest.approx(100 - 3 / 25 * 100)
+
+
+# ============================================================================
+# TESTS: profile_dataframe
+# ============================================================================
+
+def test_profile_dataframe_column_stats(sample_data):
+    """Test per-column nulls and numeric stats"""
+    columns = profile_dataframe(sample_data)['columns'].set_index('Column')
+    
+    assert columns.loc['CustomerID', 'Nulls'] == 2
+    assert columns.loc['Quantity', 'Max'] == 32
+    assert columns.loc['UnitPrice', 'Mean'] == pytest.approx(sample_data['UnitPrice'].mean())
+
+
+def test_profile_dataframe_sampled_mode():
+    """Test large frames are profiled on a sample with scaled counts"""
+    np.random.seed(42)
+    df = pd.DataFrame({'Value': np.random.normal(0, 1, 50000)})
+    df.loc[df.sample(frac=0.2, random_state=1).index, 'Value'] = np.nan
+    
+    profile = profile_dataframe(df, sample_threshold=10000, sample_size=5000)
+    
+    assert profile['sampled']
+    assert profile['sample_rows'] == 5000
+    assert profile['total_rows'] == 50000
+    assert profile['missing_percentage'] == pytest.approx(20, abs=2)
+
+
+# ============================================================================
+# TESTS: detect_datetime_format / parse_datetime
+# ============================================================================
+
+def test_detect_datetime_format_samples_whole_column():
+    """Test day-first data sorted by time is not mistaken for month-first"""
+    dates = pd.date_range('2011-01-01', periods=4464, freq='10min')
+    values = pd.Series(dates.strftime('%d/%m/%Y %H:%M'), name='InvoiceDate')
+    
+    assert detect_datetime_format(values) == '%d/%m/%Y %H:%M'
+    assert (parse_datetime(values).values == dates.values).all()
+
+
+def test_detect_datetime_format_rejects_ambiguous_sample():
+    """Test a sample valid as both day-first and month-first raises instead of guessing"""
+    values = pd.Series(['01/02/2011 08:00', '12/01/2011 09:30'], name='InvoiceDate')
+    
+    with pytest.raises(ValueError, match='Ambiguous'):
+        detect_datetime_format(values)
+    assert parse_datetime(values, '%d/%m/%Y %H:%M').dt.month.tolist() == [2, 1]
+
+
+def test_parse_datetime_warns_on_unparseable_rows(log_messages):
+    """Test rows that cannot be parsed become NaT and are counted in a warning"""
+    values = pd.Series(['12/1/2010 8:26', 'not a date', '12/2/2010 9:00', 'not a date', None],
+                       name='InvoiceDate')
+    
+    parsed = parse_datetime(values, '%m/%d/%Y %H:%M')
+    
+    assert parsed.isna().tolist() == [False, True, False, True, True]
+    assert any("2 rows in InvoiceDate could not be parsed" in message for message in log_messages)
+
+
+# ============================================================================
+# TESTS: LogSummary / setup_logging
+# ============================================================================
+
+def test_log_summary_aggregates_and_silences(log_messages):
+    """Test per-batch logs are dropped and one summary line is written"""
+    chunk = pd.DataFrame({'InvoiceNo': ['536365', 'C536379', '536366']})
+    
+    with LogSummary("Chunks", silence=['src.data_cleaning']) as summary:
+        for _ in range(3):
+            cleaned = remove_cancelled_orders(chunk)
+            summary.add(rows=len(chunk), kept=len(cleaned))
+    
+    assert summary.batches == 3
+    assert summary.totals == {'rows': 9, 'kept': 6}
+    assert len(log_messages) == 1
+    assert "Chunks: 3 batches" in log_messages[0]
+    assert "rows: 9, kept: 6" in log_messages[0]
+    
+    # Silenced modules log again after the block
+    remove_cancelled_orders(chunk)
+    assert len(log_messages) > 1
+
+
+def test_setup_logging_enqueue(tmp_path):
+    """Test the background writer flushes records to the log file"""
+    log_file = tmp_path / "analysis.log"
+    setup_logging(log_file=str(log_file), enqueue=True)
+    logger.info("queued record")
+    logger.complete()
+    
+    assert "queued record" in log_file.read_text(encoding='utf-8')
+    
+    # Restore loguru's default sink for the other tests
+    logger.remove()
+    logger.add(sys.stderr)
+
+
+# ============================================================================
+# TESTS: replace_directory
+# ============================================================================
+
+def test_replace_directory_keeps_old_copy_until_swapped(tmp_path, monkeypatch):
+    """Test a failed swap leaves the old directory intact and a retry completes it"""
+    directory, temp_dir = tmp_path / 'index', tmp_path / 'index.tmp'
+    directory.mkdir()
+    (directory / 'manifest.json').write_text('old')
+    temp_dir.mkdir()
+    (temp_dir / 'manifest.json').write_text('new')
+    
+    real_replace = os.replace
+    
+    def crash_on_swap_in(src, dst):
+        if Path(src) == temp_dir:
+            raise OSError("simulated crash")
+        real_replace(src, dst)
+    
+    monkeypatch.setattr(os, 'replace', crash_on_swap_in)
+    with pytest.raises(OSError):
+        replace_directory(temp_dir, directory)
+    assert (tmp_path / 'index.old' / 'manifest.json').read_text() == 'old'
+    
+    monkeypatch.setattr(os, 'replace', real_replace)
+    replace_directory(temp_dir, directory)
+    assert (directory / 'manifest.json').read_text() == 'new'
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['index']
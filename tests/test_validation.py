@@ -0,0 +1,138 @@
+"""
+Unit Tests for Validation Module
+
+Tests the config-compiled validation rules in src/validation.py.
+
+Run tests with:
+    pytest tests/test_validation.py -v
+
+Author: Data Analytics Team
+Version: 1.0.0
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from src.validation import (
+    compile_validation_rules,
+    validate_data,
+    DataValidationError
+)
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+@pytest.fixture
+def config():
+    """Create a minimal configuration with quality thresholds and business rules"""
+    return {
+        'data_params': {
+            'start_date': '2009-12-01',
+            'end_date': '2010-12-09',
+            'quality': {
+                'min_retention_rate': 0.90,
+                'max_missing_rate': 0.25
+            },
+            'business_rules': {
+                'min_quantity': 1,
+                'min_unit_price': 0.01,
+                'max_unit_price': 100000
+            }
+        }
+    }
+
+
+@pytest.fixture
+def clean_data():
+    """Create cleaned transactions that satisfy every rule"""
+    n = 1000
+    return pd.DataFrame({
+        'InvoiceNo': (536365 + np.arange(n) // 4).astype(str),
+        'StockCode': np.where(np.arange(n) % 2, '85123A', 'POST'),
+        'Description': 'ITEM',
+        'Quantity': np.arange(n) % 12 + 1,
+        'InvoiceDate': pd.date_range('2009-12-01 08:00', '2010-12-09 20:00', periods=n),
+        'UnitPrice': 2.55,
+        'CustomerID': np.where(np.arange(n) % 10 == 0, np.nan, 17850.0)
+    })
+
+
+# ============================================================================
+# TESTS: compile_validation_rules
+# ============================================================================
+
+def test_compile_validation_rules_from_config(config):
+    """Test config sections compile to named rules"""
+    names = [rule.name for rule in compile_validation_rules(config)]
+    
+    assert 'Quantity_range' in names
+    assert 'UnitPrice_range' in names
+    assert 'InvoiceDate_range' in names
+    assert 'InvoiceNo_pattern' in names
+    assert 'Description_not_null' in names
+
+
+# ============================================================================
+# TESTS: validate_data
+# ============================================================================
+
+def test_validate_data_passes(config, clean_data):
+    """Test valid data passes with a report including its cost"""
+    report = validate_data(clean_data, config, raw_rows=1050, chunk_size=300)
+    
+    assert report['rows_checked'] == 1000
+    assert report['complete']
+    assert report['violations'] == {}
+    assert report['elapsed_seconds'] >= 0
+    assert report['missing_rates']['CustomerID'] == pytest.approx(0.1)
+
+
+def test_validate_data_counts_violations(config, clean_data):
+    """Test violations are counted per rule"""
+    df = clean_data.copy()
+    df.loc[:2, 'Quantity'] = 0
+    df.loc[5, 'InvoiceNo'] = 'C536365'
+    df.loc[7, 'InvoiceDate'] = pd.Timestamp('2011-01-01')
+    
+    with pytest.raises(DataValidationError) as error:
+        validate_data(df, config, fail_fast=False)
+    
+    assert error.value.failures == {'Quantity_range': 3, 'InvoiceNo_pattern': 1, 'InvoiceDate_range': 1}
+
+
+def test_validate_data_fails_fast(config, clean_data):
+    """Test validation stops at the first chunk with violations"""
+    df = clean_data.copy()
+    df.loc[0, 'UnitPrice'] = -1
+    df.loc[999, 'UnitPrice'] = -1
+    
+    with pytest.raises(DataValidationError) as error:
+        validate_data(df, config, chunk_size=100)
+    
+    assert error.value.failures == {'UnitPrice_range': 1}
+
+
+def test_validate_data_early_stop_skips_frame_thresholds(config, clean_data):
+    """Test an early stop does not report retention or missing rates from the partial scan"""
+    df = clean_data.copy()
+    df.loc[0, 'UnitPrice'] = -1
+    df.loc[:99, 'CustomerID'] = np.nan
+    
+    with pytest.raises(DataValidationError) as error:
+        validate_data(df, config, raw_rows=1050, chunk_size=100)
+    
+    assert error.value.failures == {'UnitPrice_range': 1}
+
+
+def test_validate_data_frame_thresholds(config, clean_data):
+    """Test missing-rate and retention thresholds"""
+    df = clean_data.copy()
+    df.loc[:299, 'CustomerID'] = np.nan
+    
+    with pytest.raises(DataValidationError) as error:
+        validate_data(df, config, raw_rows=2000)
+    
+    assert set(error.value.failures) == {'CustomerID_missing_rate', 'retention_rate'}